@@ -0,0 +1,1742 @@
+#!/usr/bin/env python3
+"""
+BL520 Charger Board V1.0 - KiCad Python Script
+Robot Vacuum Charging Station
+
+This script generates a KiCad schematic using the KiCad Python API (pcbnew/eeschema).
+
+Usage:
+    Method 1: Run in KiCad Scripting Console
+        - Open KiCad -> Tools -> Scripting Console
+        - Execute: import sys; sys.path.insert(0, '/path/to/KiCad_Python')
+                   import kicad_generator; kicad_generator.main([])
+    
+    Method 2: Run standalone (generates .kicad_sch file directly)
+        - python BL520_kicad_generator.py   (command line entry point for this module)
+
+Requirements:
+    - KiCad 6.0+ with Python scripting support
+    - Or standalone execution for file generation
+
+Author: Reverse Engineered
+Date: 2024
+Rev: 1.2
+"""
+
+import os
+import sys
+import math
+import re
+import time
+import argparse
+from functools import lru_cache
+from collections import namedtuple
+
+# json (board/price files, build manifest), hashlib and uuid (content hashes,
+# symbol UUIDs), csv (price tables / CSV BOM), concurrent.futures (multi-board
+# builds) and openpyxl (XLSX BOM) are imported where they are used to keep
+# startup fast.
+
+GENERATOR_VERSION = "1.1"
+
+# Namespace for deterministic (uuid5) schematic/symbol UUIDs, set by stable_uuid()
+UUID_NAMESPACE = None
+
+def stable_uuid(name):
+    """Deterministic uuid5 of name in UUID_NAMESPACE"""
+    import uuid
+    global UUID_NAMESPACE
+    if UUID_NAMESPACE is None:
+        UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "BL520_kicad_generator.py")
+    return uuid.uuid5(UUID_NAMESPACE, name)
+
+def content_hash(*fields):
+    """Short stable hash of the given fields (used for UUIDs and change detection)"""
+    import hashlib
+    h = hashlib.sha1()
+    for field in fields:
+        h.update(str(field).encode('utf-8'))
+        h.update(b'\x1f')
+    return h.hexdigest()
+
+#==============================================================================
+# Component Definitions
+#==============================================================================
+
+class Component:
+    """Represents a schematic component"""
+    def __init__(self, ref, value, footprint, lib_id, x, y, rotation=0):
+        self.ref = ref
+        self.value = value
+        self.footprint = footprint
+        self.lib_id = lib_id
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+        self._uuid = None
+
+    @property
+    def uuid(self):
+        """Derived from ref + part identity (not placement), so moving a symbol
+        keeps its link to the PCB footprint; computed on first use"""
+        if self._uuid is None:
+            self._uuid = str(stable_uuid(content_hash(self.ref, self.value, self.footprint, self.lib_id)))
+        return self._uuid
+
+    def content_hash(self):
+        """Hash of everything that ends up in the generated outputs"""
+        return content_hash(self.ref, self.value, self.footprint, self.lib_id,
+                            self.x, self.y, self.rotation)
+
+# Define all components for BL520 Charger Board
+COMPONENTS = [
+    # DC Input Section
+    Component("DC1", "DC_JACK", "Connector_BarrelJack:BarrelJack", "Connector:Barrel_Jack", 25.4, 50.8),
+    Component("D1", "SS34", "Diode_SMD:D_SMA", "Device:D_Schottky", 50.8, 48.26),
+    Component("D2", "SS34", "Diode_SMD:D_SMA", "Device:D_Schottky", 50.8, 53.34),
+    Component("L1", "10uH", "Inductor_SMD:L_1206_3216Metric", "Device:L", 68.58, 48.26, 90),
+    Component("L2", "10uH", "Inductor_SMD:L_1206_3216Metric", "Device:L", 68.58, 53.34, 90),
+    Component("L3", "CMC", "Inductor_THT:L_Toroid_Horizontal", "Device:L", 25.4, 68.58),
+    Component("R9", "10K", "Resistor_SMD:R_1206_3216Metric", "Device:R", 38.1, 68.58),
+    Component("R10", "10K", "Resistor_SMD:R_1206_3216Metric", "Device:R", 45.72, 68.58),
+    
+    # Filter Capacitors
+    Component("C2", "100uF/35V", "Capacitor_THT:CP_Radial_D6.3mm_P2.50mm", "Device:CP", 86.36, 55.88),
+    Component("C3", "10uF/35V", "Capacitor_THT:CP_Radial_D5.0mm_P2.00mm", "Device:CP", 93.98, 55.88),
+    Component("C5", "100uF/35V", "Capacitor_THT:CP_Radial_D6.3mm_P2.50mm", "Device:CP", 101.6, 55.88),
+    
+    # 5V Regulator Section
+    Component("U1", "AMS1117-5.0", "Package_TO_SOT_SMD:SOT-223-3_TabPin2", "Regulator_Linear:AMS1117-5.0", 121.92, 50.8),
+    Component("C4", "10uF/16V", "Capacitor_THT:CP_Radial_D5.0mm_P2.00mm", "Device:CP", 109.22, 55.88),
+    Component("C6", "10uF/16V", "Capacitor_THT:CP_Radial_D5.0mm_P2.00mm", "Device:CP", 134.62, 55.88),
+    Component("C7", "100nF", "Capacitor_SMD:C_0805_2012Metric", "Device:C", 142.24, 55.88),
+    
+    # IR Transceiver Section
+    Component("LED1", "IR_RX", "LED_THT:LED_D5.0mm", "Device:LED", 50.8, 88.9, 270),
+    Component("LED2", "IR_TX_940nm", "LED_THT:LED_D5.0mm", "Device:LED", 63.5, 88.9, 270),
+    Component("LED3", "IR_RX", "LED_THT:LED_D5.0mm", "Device:LED", 76.2, 88.9, 270),
+    Component("LED4", "IR_TX_940nm", "LED_THT:LED_D5.0mm", "Device:LED", 88.9, 88.9, 270),
+    Component("LED5", "GREEN_2C_MILKY", "LED_THT:LED_D5.0mm-3", "Device:LED_Dual_CAC", 104.14, 88.9),
+    
+    # Transistors - SOT-89 (High Current for IR LED)
+    Component("Q1", "NPN_SOT89", "Package_TO_SOT_SMD:SOT-89-3", "Transistor_BJT:BCX56", 50.8, 109.22),
+    Component("Q3", "NPN_SOT89", "Package_TO_SOT_SMD:SOT-89-3", "Transistor_BJT:BCX56", 63.5, 109.22),
+    Component("Q5", "NPN_SOT89", "Package_TO_SOT_SMD:SOT-89-3", "Transistor_BJT:BCX56", 76.2, 109.22),
+    Component("Q7", "NPN_SOT89", "Package_TO_SOT_SMD:SOT-89-3", "Transistor_BJT:BCX56", 88.9, 109.22),
+    Component("Q9", "NPN_SOT89", "Package_TO_SOT_SMD:SOT-89-3", "Transistor_BJT:BCX56", 101.6, 109.22),
+    
+    # Transistors - SOT-23-3 (Signal Control)
+    Component("Q2", "NPN_SOT23", "Package_TO_SOT_SMD:SOT-23", "Transistor_BJT:BC817", 50.8, 127),
+    Component("Q4", "NPN_SOT23", "Package_TO_SOT_SMD:SOT-23", "Transistor_BJT:BC817", 63.5, 127),
+    Component("Q6", "NPN_SOT23", "Package_TO_SOT_SMD:SOT-23", "Transistor_BJT:BC817", 76.2, 127),
+    Component("Q8", "NPN_SOT23", "Package_TO_SOT_SMD:SOT-23", "Transistor_BJT:BC817", 88.9, 127),
+    Component("Q10", "NPN_SOT23", "Package_TO_SOT_SMD:SOT-23", "Transistor_BJT:BC817", 101.6, 127),
+    Component("Q11", "NPN_SOT23", "Package_TO_SOT_SMD:SOT-23", "Transistor_BJT:BC817", 114.3, 127),
+    
+    # Base Resistors
+    Component("R11", "1K", "Resistor_SMD:R_0603_1608Metric", "Device:R", 50.8, 119.38, 90),
+    Component("R12", "1K", "Resistor_SMD:R_0603_1608Metric", "Device:R", 63.5, 119.38, 90),
+    Component("R13", "1K", "Resistor_SMD:R_0603_1608Metric", "Device:R", 76.2, 119.38, 90),
+    Component("R14", "1K", "Resistor_SMD:R_0603_1608Metric", "Device:R", 88.9, 119.38, 90),
+    Component("R15", "1K", "Resistor_SMD:R_0603_1608Metric", "Device:R", 101.6, 119.38, 90),
+    
+    # Output Connectors
+    Component("J1", "FPC_3PIN", "Connector_PinHeader_2.54mm:PinHeader_1x03_P2.54mm_Vertical", "Connector:Conn_01x03_Pin", 152.4, 50.8),
+    Component("CHARGE", "2PIN", "Connector_PinHeader_2.54mm:PinHeader_1x02_P2.54mm_Vertical", "Connector:Conn_01x02_Pin", 165.1, 50.8),
+]
+
+# Net definitions
+NETS = {
+    "VIN": ["DC1.1", "D1.1"],
+    "GND": ["DC1.2", "D2.1", "C2.2", "C3.2", "C5.2", "C4.2", "C6.2", "C7.2", "U1.GND", 
+            "Q1.E", "Q2.E", "Q3.E", "Q4.E", "Q5.E", "Q6.E", "Q7.E", "Q8.E", "Q9.E", "Q10.E", "Q11.E",
+            "J1.2", "CHARGE.2"],
+    "VIN_FILT": ["D1.2", "D2.2", "L1.1", "L2.1"],
+    "VIN_FILT2": ["L1.2", "L2.2", "C2.1", "C3.1", "C5.1", "C4.1", "U1.VI"],
+    "+5V": ["U1.VO", "C6.1", "C7.1", "LED1.A", "LED2.A", "LED3.A", "LED4.A", "LED5.A", "J1.1"],
+    "IR_TX1_OUT": ["LED2.K", "Q1.C"],
+    "IR_TX2_OUT": ["LED4.K", "Q3.C"],
+    "Q1_BASE": ["R11.2", "Q1.B"],
+    "Q3_BASE": ["R12.2", "Q3.B"],
+    "Q5_BASE": ["R13.2", "Q5.B"],
+    "Q7_BASE": ["R14.2", "Q7.B"],
+    "Q9_BASE": ["R15.2", "Q9.B"],
+    "V_CHARGE": ["CHARGE.1"],
+    "FPC_SIG": ["J1.3"],
+}
+
+#==============================================================================
+# Board Definitions
+#==============================================================================
+
+class Board:
+    """A board description: parts, nets and the title-block/note text"""
+    
+    def __init__(self, name, components, nets, title=None, rev="1.0", company="",
+                 comments=(), notes=(), bom_notes=(), file_prefix=None, paper="A3", date=""):
+        self.name = name                    # KiCad project name
+        self.components = list(components)
+        self.nets = dict(nets)
+        self.title = title or name
+        self.rev = rev
+        self.company = company
+        self.comments = list(comments)      # title block comment 1..n
+        self.notes = [tuple(n) for n in notes]  # (text, x, y, size) schematic text notes
+        self.bom_notes = list(bom_notes)
+        self.file_prefix = file_prefix or name
+        self.paper = paper
+        self.date = date                    # title block / output header date (fixed, not the build time)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a board from a parsed JSON/TOML description"""
+        components = []
+        for entry in data['components']:
+            if isinstance(entry, dict):
+                # x/y may be omitted for boards placed with --auto-place
+                entry = dict({'x': 0, 'y': 0}, **entry)
+                components.append(Component(**entry))
+            else:
+                components.append(Component(*entry))
+        notes = []
+        for note in data.get('notes', ()):
+            if isinstance(note, dict):
+                note = (note['text'], note['x'], note['y'], note.get('size', 1.524))
+            notes.append(note)
+        return cls(data['name'], components, data.get('nets', {}),
+                   title=data.get('title'), rev=data.get('rev', "1.0"),
+                   company=data.get('company', ""), comments=data.get('comments', ()),
+                   notes=notes, bom_notes=data.get('bom_notes', ()),
+                   file_prefix=data.get('file_prefix'), paper=data.get('paper', "A3"),
+                   date=data.get('date', ""))
+    
+    def metadata_hash(self):
+        """Hash of the non-component text that ends up in the schematic header"""
+        return content_hash(self.name, self.title, self.rev, self.company, self.paper, self.date,
+                            *self.comments, *self.notes)
+
+def _load_data_file(filepath):
+    """Parse a JSON or TOML file"""
+    if filepath.lower().endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError as exc:
+                raise ImportError("TOML board files need Python 3.11+ or tomli: pip install tomli") from exc
+        with open(filepath, 'rb') as f:
+            return tomllib.load(f)
+    import json
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_board(filepath):
+    """Load a board description (JSON or TOML).
+
+    Keys: name, components (list of dicts or [ref, value, footprint, lib_id,
+    x, y, rotation]; x/y optional in dicts), nets ({net: ["REF.PIN", ...]}), and optionally title,
+    rev, company, comments, notes, bom_notes, file_prefix, paper.
+    """
+    return Board.from_dict(_load_data_file(filepath))
+
+def load_library(filepath):
+    """Load symbol pin tables {lib_id: [[number, name(, x, y)], ...]}.
+
+    JSON/TOML give the tables directly (x, y: pin connection point in library
+    coordinates, needed for net labels). A KiCad .kicad_sym file is read for
+    its pins, with lib_ids "<file name>:<symbol>".
+    """
+    if filepath.lower().endswith('.kicad_sym'):
+        return load_kicad_symbol_library(filepath)
+    return {lib_id: tuple(tuple(pin) for pin in pins)
+            for lib_id, pins in _load_data_file(filepath).items()}
+
+_SEXPR_TOKEN = re.compile(r'\(|\)|"(?:\\.|[^"\\])*"|[^\s()"]+')
+
+def _parse_sexpr(text):
+    """Nested lists of atoms from KiCad s-expression text (strings unquoted)"""
+    stack = [[]]
+    for token in _SEXPR_TOKEN.findall(text):
+        if token == '(':
+            stack.append([])
+        elif token == ')':
+            node = stack.pop()
+            stack[-1].append(node)
+        elif token.startswith('"'):
+            stack[-1].append(token[1:-1].replace('\\"', '"').replace('\\\\', '\\'))
+        else:
+            stack[-1].append(token)
+    return stack[0]
+
+def load_kicad_symbol_library(filepath):
+    """Pins (number, name, x, y) of every symbol in a .kicad_sym file"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        tree = _parse_sexpr(f.read())
+    nickname = os.path.splitext(os.path.basename(filepath))[0]
+    
+    def collect(node, pins):
+        for child in node[1:]:
+            if not isinstance(child, list) or not child:
+                continue
+            if child[0] == 'symbol':
+                collect(child, pins)    # unit / body-style sub-symbols
+            elif child[0] == 'pin':
+                fields = {item[0]: item[1:] for item in child[1:] if isinstance(item, list) and item}
+                number = fields['number'][0]
+                if number not in pins:
+                    x, y = fields['at'][:2]
+                    pins[number] = (number, fields['name'][0], float(x), float(y))
+        return pins
+    
+    symbols, parents = {}, {}
+    for root in tree:
+        for node in root[1:] if root and root[0] == 'kicad_symbol_lib' else ():
+            if isinstance(node, list) and node and node[0] == 'symbol':
+                symbols[node[1]] = tuple(collect(node, {}).values())
+                parents[node[1]] = next((item[1] for item in node[2:] if isinstance(item, list)
+                                         and item and item[0] == 'extends'), None)
+    library = {}
+    for name, pins in symbols.items():
+        parent, seen = name, {name}
+        # Derived symbols ((extends "Parent")) reuse the parent's pins
+        while not pins and parents.get(parent) in symbols and parents[parent] not in seen:
+            parent = parents[parent]
+            seen.add(parent)
+            pins = symbols[parent]
+        library[f"{nickname}:{name}"] = pins
+    return library
+
+BOM_NOTES = [
+    "**LED5**: Green 2-Color LED with milky diffused lens (5mm, 3-pin)",
+    "**Q1,Q3,Q5,Q7,Q9**: SOT-89 package for high current IR LED driving (~500mA)",
+    "**Q2,Q4,Q6,Q8,Q10,Q11**: SOT-23-3 package for signal control",
+]
+
+BL520_BOARD = Board(
+    "BL520_Charger", COMPONENTS, NETS,
+    title="BL520 Charger Board V1.0",
+    rev="1.2",
+    date="2019-03-16",
+    company="Robot Vacuum Charging Station",
+    comments=[
+        "Reverse Engineered Schematic",
+        "TR: SOT-89 (High Current) / SOT-23-3 (Signal)",
+        "LED5: Green 2-Color Milky",
+    ],
+    notes=[
+        ("BL520 Charger Board V1.0\\n"
+         "Robot Vacuum Charging Station\\n"
+         "Reverse Engineered\\n\\n"
+         "Transistors:\\n"
+         "- Q1,3,5,7,9: SOT-89 (High Current)\\n"
+         "- Q2,4,6,8,10,11: SOT-23-3 (Signal)\\n\\n"
+         "LED5: Green 2-Color, Milky Lens",
+         25.4, 20.32, 1.524),
+        ("===== DC INPUT =====", 25.4, 40.64, 1.524),
+        ("===== 5V REGULATOR =====", 106.68, 40.64, 1.524),
+        ("===== IR TRANSCEIVER =====", 50.8, 78.74, 1.524),
+        ("===== SOT-89 DRIVERS =====", 50.8, 101.6, 1.524),
+        ("===== SOT-23 SIGNAL =====", 50.8, 121.92, 1.524),
+        ("===== CONNECTORS =====", 147.32, 40.64, 1.524),
+    ],
+    bom_notes=BOM_NOTES,
+    file_prefix="BL520",
+)
+
+#==============================================================================
+# Netlist Graph
+#==============================================================================
+
+class NetlistGraph:
+    """Indexed view of COMPONENTS/NETS for constant-time pin/net queries.
+
+    Refs, pins and nets are interned to integer IDs. A pin listed in more
+    than one net shorts those nets together; union-find over net IDs keeps
+    track of the resulting electrical connectivity.
+    """
+
+    def __init__(self, components, nets):
+        self.refs = []              # ref id -> ref
+        self.ref_ids = {}           # ref -> ref id
+        self.pin_names = []         # pin id -> "REF.PIN"
+        self.pin_ids = {}           # "REF.PIN" -> pin id
+        self.pin_ref = []           # pin id -> ref id
+        self.pin_net = []           # pin id -> net id (first net listing the pin)
+        self.net_names = []         # net id -> net name
+        self.net_ids = {}           # net name -> net id
+        self.net_pins = []          # net id -> [pin id, ...]
+        self.component_pins = []    # ref id -> [pin id, ...]
+        self.component_nets = []    # ref id -> [net id, ...] (no duplicates)
+        self.duplicate_pins = []    # (pin id, net id) for repeated listings
+        self._parent = []           # union-find over net ids
+
+        self.components = {}
+        for comp in components:
+            self.components[comp.ref] = comp
+            self._intern_ref(comp.ref)
+        self.num_components = len(self.refs)
+
+        for net_name, pins in nets.items():
+            net_id = len(self.net_names)
+            self.net_names.append(sys.intern(net_name))
+            self.net_ids[net_name] = net_id
+            self.net_pins.append([])
+            self._parent.append(net_id)
+            for pin in pins:
+                self._add_pin(net_id, pin)
+
+    def _intern_ref(self, ref):
+        ref_id = self.ref_ids.get(ref)
+        if ref_id is None:
+            ref_id = len(self.refs)
+            self.refs.append(sys.intern(ref))
+            self.ref_ids[ref] = ref_id
+            self.component_pins.append([])
+            self.component_nets.append([])
+        return ref_id
+
+    def _add_pin(self, net_id, pin):
+        pin_id = self.pin_ids.get(pin)
+        if pin_id is not None:
+            # Same pin listed again: in another net this shorts the two nets
+            self.duplicate_pins.append((pin_id, net_id))
+            self._union(self.pin_net[pin_id], net_id)
+            if pin_id not in self.net_pins[net_id]:
+                self.net_pins[net_id].append(pin_id)
+            ref_id = self.pin_ref[pin_id]
+        else:
+            ref, _, _ = pin.partition('.')
+            ref_id = self._intern_ref(ref)
+            pin_id = len(self.pin_names)
+            self.pin_names.append(sys.intern(pin))
+            self.pin_ids[pin] = pin_id
+            self.pin_ref.append(ref_id)
+            self.pin_net.append(net_id)
+            self.net_pins[net_id].append(pin_id)
+            self.component_pins[ref_id].append(pin_id)
+        nets = self.component_nets[ref_id]
+        if net_id not in nets:
+            nets.append(net_id)
+
+    def _find(self, net_id):
+        parent = self._parent
+        while parent[net_id] != net_id:
+            parent[net_id] = parent[parent[net_id]]
+            net_id = parent[net_id]
+        return net_id
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            self._parent[max(ra, rb)] = min(ra, rb)
+
+    def net_of(self, pin):
+        """Net name a "REF.PIN" belongs to, or None if unconnected"""
+        pin_id = self.pin_ids.get(pin)
+        return None if pin_id is None else self.net_names[self.pin_net[pin_id]]
+
+    def pins_of(self, net_name):
+        """"REF.PIN" strings on a net (empty for an unknown net)"""
+        net_id = self.net_ids.get(net_name)
+        if net_id is None:
+            return []
+        return [self.pin_names[p] for p in self.net_pins[net_id]]
+
+    def nets_of(self, ref):
+        """Net names touching a component"""
+        ref_id = self.ref_ids.get(ref)
+        if ref_id is None:
+            return []
+        return [self.net_names[n] for n in self.component_nets[ref_id]]
+
+    def pins_of_component(self, ref):
+        """Connected pin names ("REF.PIN") of a component"""
+        ref_id = self.ref_ids.get(ref)
+        if ref_id is None:
+            return []
+        return [self.pin_names[p] for p in self.component_pins[ref_id]]
+
+    def connected(self, pin_a, pin_b):
+        """True if two pins are on the same electrical net (including shorts)"""
+        a = self.pin_ids.get(pin_a)
+        b = self.pin_ids.get(pin_b)
+        if a is None or b is None:
+            return False
+        return self._find(self.pin_net[a]) == self._find(self.pin_net[b])
+
+    def merged_nets(self):
+        """Groups of net names shorted together by shared pins"""
+        groups = {}
+        for net_id in range(len(self.net_names)):
+            groups.setdefault(self._find(net_id), []).append(self.net_names[net_id])
+        return [names for names in groups.values() if len(names) > 1]
+
+#==============================================================================
+# Electrical Rule Check
+#==============================================================================
+
+# Symbol pins per lib_id as in the stock KiCad libraries: (number, name, x, y),
+# where (x, y) is the pin's connection point -- its (at x y angle) in the
+# .kicad_sym -- in library coordinates (mm, Y up, rotation 0)
+LIB_SYMBOLS = {
+    "Connector:Barrel_Jack": (("1", "1", 5.08, 2.54), ("2", "2", 5.08, -2.54)),
+    "Connector:Conn_01x02_Pin": (("1", "Pin_1", 5.08, 0), ("2", "Pin_2", 5.08, -2.54)),
+    "Connector:Conn_01x03_Pin": (("1", "Pin_1", 5.08, 2.54), ("2", "Pin_2", 5.08, 0),
+                                 ("3", "Pin_3", 5.08, -2.54)),
+    "Device:C": (("1", "1", 0, 3.81), ("2", "2", 0, -3.81)),
+    "Device:CP": (("1", "+", 0, 3.81), ("2", "-", 0, -3.81)),
+    "Device:D_Schottky": (("1", "K", -3.81, 0), ("2", "A", 3.81, 0)),
+    "Device:L": (("1", "1", 0, 3.81), ("2", "2", 0, -3.81)),
+    "Device:LED": (("1", "K", -3.81, 0), ("2", "A", 3.81, 0)),
+    # LED5 is the 3-pin common-anode part: K1 / A / K2 on pads 1-3 of LED_D5.0mm-3
+    "Device:LED_Dual_CAC": (("1", "K1", -5.08, 2.54), ("2", "A", 5.08, 0), ("3", "K2", -5.08, -2.54)),
+    "Device:R": (("1", "1", 0, 3.81), ("2", "2", 0, -3.81)),
+    "Regulator_Linear:AMS1117-5.0": (("1", "GND", 0, -7.62), ("2", "VO", 7.62, 0), ("3", "VI", -7.62, 0)),
+    "Transistor_BJT:BC817": (("1", "B", -5.08, 0), ("2", "E", 2.54, -5.08), ("3", "C", 2.54, 5.08)),
+    "Transistor_BJT:BCX56": (("1", "B", -5.08, 0), ("2", "C", 2.54, 5.08), ("3", "E", 2.54, -5.08)),
+}
+
+# Symbol pins per lib_id: (number, name). NETS may use either.
+LIB_PINS = {}
+
+# Pin connection points per lib_id, keyed by pin number (see LIB_SYMBOLS)
+LIB_PIN_OFFSETS = {}
+
+_PIN_LOOKUP_CACHE = {}
+_PIN_OFFSET_CACHE = {}
+
+def register_library(library):
+    """Install symbol pin tables {lib_id: ((number, name[, x, y]), ...)}.
+
+    Pins with coordinates also define the label geometry; a symbol given
+    without them keeps ERC checks but gets no net labels. Clears the
+    per-lib_id lookup caches.
+    """
+    for lib_id, pins in library.items():
+        LIB_PINS[lib_id] = tuple((str(pin[0]), str(pin[1])) for pin in pins)
+        if pins and all(len(pin) >= 4 for pin in pins):
+            LIB_PIN_OFFSETS[lib_id] = {str(pin[0]): (float(pin[2]), float(pin[3])) for pin in pins}
+        else:
+            LIB_PIN_OFFSETS.pop(lib_id, None)
+    _PIN_LOOKUP_CACHE.clear()
+    _PIN_OFFSET_CACHE.clear()
+
+register_library(LIB_SYMBOLS)
+
+def lib_pin_lookup(lib_id):
+    """Pin number/name -> pin number for a lib_id (None if unknown), cached"""
+    lookup = _PIN_LOOKUP_CACHE.get(lib_id)
+    if lookup is None and lib_id in LIB_PINS:
+        lookup = {}
+        for number, name in LIB_PINS[lib_id]:
+            lookup[number] = number
+            lookup[name] = number
+        _PIN_LOOKUP_CACHE[lib_id] = lookup
+    return lookup
+
+ERCViolation = namedtuple('ERCViolation', ['severity', 'code', 'subject', 'message'])
+
+def run_erc(components, nets, graph=None):
+    """Electrical rule check over COMPONENTS/NETS.
+
+    Checks duplicate pins, empty/single-pin/floating nets, pins on refs that
+    are not components, pin names not in the symbol's pin table, and
+    components with no or partial connections. One pass over pins, nets and
+    components of a NetlistGraph.
+    """
+    if graph is None:
+        graph = NetlistGraph(components, nets)
+    violations = []
+
+    for pin_id, net_id in graph.duplicate_pins:
+        first = graph.net_names[graph.pin_net[pin_id]]
+        other = graph.net_names[net_id]
+        pin = graph.pin_names[pin_id]
+        if first == other:
+            violations.append(ERCViolation('warning', 'duplicate_pin', pin,
+                                           f"{pin} listed twice in net {first}"))
+        else:
+            violations.append(ERCViolation('error', 'pin_in_multiple_nets', pin,
+                                           f"{pin} is in nets {first} and {other} (shorted)"))
+
+    # Pin name consistency; track which symbol pins are connected
+    connected = [set() for _ in range(graph.num_components)]
+    for pin_id, ref_id in enumerate(graph.pin_ref):
+        pin = graph.pin_names[pin_id]
+        if ref_id >= graph.num_components:
+            violations.append(ERCViolation('error', 'unknown_ref', pin,
+                                           f"{pin}: {graph.refs[ref_id]} is not a component"))
+            continue
+        lookup = lib_pin_lookup(graph.components[graph.refs[ref_id]].lib_id)
+        if lookup is None:
+            continue
+        number = lookup.get(pin.partition('.')[2])
+        if number is None:
+            violations.append(ERCViolation('error', 'unknown_pin', pin,
+                                           f"{pin}: no such pin on {graph.components[graph.refs[ref_id]].lib_id}"))
+        else:
+            connected[ref_id].add(number)
+
+    for net_id, pins in enumerate(graph.net_pins):
+        name = graph.net_names[net_id]
+        if not pins:
+            violations.append(ERCViolation('warning', 'empty_net', name, f"net {name} has no pins"))
+        elif len(pins) == 1:
+            violations.append(ERCViolation('warning', 'single_pin_net', name,
+                                           f"net {name} only connects {graph.pin_names[pins[0]]}"))
+        else:
+            first_ref = graph.pin_ref[pins[0]]
+            if all(graph.pin_ref[p] == first_ref for p in pins):
+                violations.append(ERCViolation('warning', 'floating_net', name,
+                                               f"net {name} only connects pins of {graph.refs[first_ref]}"))
+
+    for ref_id in range(graph.num_components):
+        ref = graph.refs[ref_id]
+        comp = graph.components[ref]
+        if not graph.component_pins[ref_id]:
+            violations.append(ERCViolation('warning', 'unconnected_component', ref,
+                                           f"{ref} ({comp.value}) is not in any net"))
+            continue
+        if comp.lib_id not in LIB_PINS:
+            violations.append(ERCViolation('info', 'no_pin_table', ref,
+                                           f"{ref}: no pin table for {comp.lib_id}, pins not checked"))
+            continue
+        missing = [f"{number}/{name}" for number, name in LIB_PINS[comp.lib_id]
+                   if number not in connected[ref_id]]
+        if missing:
+            violations.append(ERCViolation('warning', 'unconnected_pins', ref,
+                                           f"{ref} ({comp.value}) unconnected pins: {', '.join(missing)}"))
+
+    return violations
+
+def print_erc_report(violations):
+    """Print ERC violations grouped by severity"""
+    counts = {}
+    for v in violations:
+        counts[v.severity] = counts.get(v.severity, 0) + 1
+    print("ERC: " + (", ".join(f"{n} {sev}(s)" for sev, n in counts.items()) or "no violations"))
+    for v in violations:
+        if v.severity != 'info':
+            print(f"  [{v.severity.upper():7}] {v.code:22} {v.message}")
+
+#==============================================================================
+# Symbol Pin Geometry
+#==============================================================================
+
+# Exact (cos, sin) for right angles; other angles use math.cos/sin
+_ROTATIONS = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+def _rotation(rotation):
+    """(cos, sin) of a symbol rotation in degrees (any angle, any sign)"""
+    angle = float(rotation) % 360
+    if angle in _ROTATIONS:
+        return _ROTATIONS[angle]
+    return math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+def lib_pin_offsets(lib_id, rotation=0):
+    """Pin number/name -> (dx, dy) schematic offset (Y down) for a placed symbol.
+
+    Computed once per (lib_id, rotation); None if the symbol has no geometry.
+    """
+    key = (lib_id, rotation)
+    if key in _PIN_OFFSET_CACHE:
+        return _PIN_OFFSET_CACHE[key]
+    offsets = LIB_PIN_OFFSETS.get(lib_id)
+    if offsets is None:
+        _PIN_OFFSET_CACHE[key] = None
+        return None
+    cos, sin = _rotation(rotation)
+    table = {}
+    for number, (px, py) in offsets.items():
+        # Rotate counter-clockwise in library space, then flip Y for the sheet
+        dx = round(px * cos - py * sin, 4)
+        dy = round(-(px * sin + py * cos), 4)
+        table[number] = (dx, dy)
+    for number, name in LIB_PINS.get(lib_id, ()):
+        if number in table:
+            table[name] = table[number]
+    _PIN_OFFSET_CACHE[key] = table
+    return table
+
+def pin_position(comp, pin):
+    """Sheet coordinates of a component pin (number or name), or None"""
+    table = lib_pin_offsets(comp.lib_id, comp.rotation)
+    if table is None or pin not in table:
+        return None
+    dx, dy = table[pin]
+    return round(comp.x + dx, 4), round(comp.y + dy, 4)
+
+# Nets drawn with global labels; everything else gets local labels
+GLOBAL_NET_PREFIXES = ('+', '-', 'GND', 'VIN', 'V_')
+
+def is_global_net(net_name):
+    return net_name.startswith(GLOBAL_NET_PREFIXES)
+
+#==============================================================================
+# Auto Placement
+#==============================================================================
+
+GRID = 2.54
+
+class SpatialHash:
+    """Occupied grid cells for O(1) rectangle collision checks"""
+    
+    def __init__(self):
+        self.cells = set()
+    
+    def is_free(self, ix, iy, half_w, half_h):
+        cells = self.cells
+        if (ix, iy) in cells:
+            return False
+        for cx in range(ix - half_w, ix + half_w + 1):
+            for cy in range(iy - half_h, iy + half_h + 1):
+                if (cx, cy) in cells:
+                    return False
+        return True
+    
+    def occupy(self, ix, iy, half_w, half_h):
+        for cx in range(ix - half_w, ix + half_w + 1):
+            for cy in range(iy - half_h, iy + half_h + 1):
+                self.cells.add((cx, cy))
+    
+    def release(self, ix, iy, half_w, half_h):
+        for cx in range(ix - half_w, ix + half_w + 1):
+            for cy in range(iy - half_h, iy + half_h + 1):
+                self.cells.discard((cx, cy))
+
+def symbol_half_size(comp, grid=GRID):
+    """Half width/height of a symbol in grid cells, from its pin extents plus one cell of clearance"""
+    table = lib_pin_offsets(comp.lib_id, comp.rotation)
+    if not table:
+        return 2, 2
+    half_w = max(abs(dx) for dx, _ in table.values())
+    half_h = max(abs(dy) for _, dy in table.values())
+    # Leave room for the Reference/Value fields 5.08 mm above/below the origin
+    return math.ceil(half_w / grid) + 1, max(math.ceil(half_h / grid), 2) + 1
+
+def estimate_wire_length(components, nets, max_net_size=None):
+    """Half-perimeter wire length (mm) summed over nets (optionally only small nets)"""
+    pos = {comp.ref: (comp.x, comp.y) for comp in components}
+    total = 0.0
+    for pins in nets.values():
+        if max_net_size is not None and len(pins) > max_net_size:
+            continue
+        xs, ys = [], []
+        for pin in pins:
+            p = pos.get(pin.partition('.')[0])
+            if p is not None:
+                xs.append(p[0])
+                ys.append(p[1])
+        if len(xs) > 1:
+            total += (max(xs) - min(xs)) + (max(ys) - min(ys))
+    return total
+
+def _net_clusters(components, nets, max_net_size):
+    """Group component indices connected through nets of at most max_net_size pins"""
+    index = {comp.ref: i for i, comp in enumerate(components)}
+    parent = list(range(len(components)))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    neighbors = [[] for _ in components]
+    for pins in nets.values():
+        if len(pins) > max_net_size:
+            continue    # power/ground nets would merge the whole board
+        members = sorted({index[r] for r in (pin.partition('.')[0] for pin in pins) if r in index})
+        for a in members:
+            for b in members:
+                if a != b:
+                    neighbors[a].append(b)
+        for b in members[1:]:
+            ra, rb = find(members[0]), find(b)
+            if ra != rb:
+                parent[rb] = ra
+    
+    clusters = {}
+    for i in range(len(components)):
+        clusters.setdefault(find(i), []).append(i)
+    # Breadth-first order from the best-connected part keeps neighbours adjacent
+    ordered = []
+    for members in clusters.values():
+        start = max(members, key=lambda i: len(neighbors[i]))
+        seen = {start}
+        queue = [start]
+        for i in queue:
+            for j in neighbors[i]:
+                if j not in seen:
+                    seen.add(j)
+                    queue.append(j)
+        ordered.append(queue)
+    ordered.sort(key=len, reverse=True)
+    return ordered, neighbors
+
+@lru_cache(maxsize=None)
+def _diamond_ring(radius):
+    """Grid offsets at Manhattan distance `radius`"""
+    if radius == 0:
+        return ((0, 0),)
+    ring = []
+    for dx in range(-radius, radius + 1):
+        dy = radius - abs(dx)
+        ring.append((dx, dy))
+        if dy:
+            ring.append((dx, -dy))
+    return tuple(ring)
+
+def auto_place(components, nets, origin=(25.4, 25.4), width=370.0, grid=GRID,
+               max_net_size=8, refine_passes=2):
+    """Assign grid-aligned x/y to components, clustered by shared nets.
+
+    Clusters (union of nets with at most max_net_size pins) are laid out on
+    shelves left to right, wrapping at a roughly square extent (at most
+    width mm) so the shared power/ground nets stay short. Inside a cluster each part goes
+    to the free spot nearest the centroid of its already placed neighbours,
+    searched in growing Manhattan rings over a spatial hash. Same-size parts in a
+    cluster are then swapped while that shortens the half-perimeter wire
+    length of their nets. Components are updated in place.
+    
+    Returns:
+        Estimated total wire length (mm) over all nets
+    """
+    clusters, neighbors = _net_clusters(components, nets, max_net_size)
+    sizes = [symbol_half_size(comp, grid) for comp in components]
+    grid_pos = [None] * len(components)
+    occupied = SpatialHash()
+    cells = occupied.cells
+    ox, oy = round(origin[0] / grid), round(origin[1] / grid)
+    total_area = sum((2 * hw + 1) * (2 * hh + 1) for hw, hh in sizes)
+    max_x = ox + min(int(width / grid), max(math.ceil(1.5 * math.sqrt(total_area)),
+                                             max((2 * hw + 1 for hw, _ in sizes), default=0)))
+    cursor_x, cursor_y, shelf_h = ox, oy, 0
+    
+    for members in clusters:
+        area = sum((2 * sizes[i][0] + 1) * (2 * sizes[i][1] + 1) for i in members)
+        side = max(math.ceil(math.sqrt(area)), max(2 * sizes[i][0] + 1 for i in members))
+        if cursor_x + side > max_x and cursor_x > ox:
+            cursor_x, cursor_y, shelf_h = ox, cursor_y + shelf_h + 2, 0
+        center = (cursor_x + side // 2, cursor_y + side // 2)
+        
+        for i in members:
+            placed = [grid_pos[j] for j in neighbors[i] if grid_pos[j] is not None]
+            if placed:
+                tx = round(sum(p[0] for p in placed) / len(placed))
+                ty = round(sum(p[1] for p in placed) / len(placed))
+            else:
+                tx, ty = center
+            hw, hh = sizes[i]
+            spot = None
+            radius = 0
+            while spot is None:
+                # Cells at Manhattan distance `radius`: the first free one is the nearest
+                for dx, dy in _diamond_ring(radius):
+                    x, y = tx + dx, ty + dy
+                    if (x - hw >= ox and y - hh >= oy and (x, y) not in cells
+                            and occupied.is_free(x, y, hw, hh)):
+                        spot = (x, y)
+                        break
+                radius += 1
+            x, y = spot
+            occupied.occupy(x, y, hw, hh)
+            grid_pos[i] = (x, y)
+        
+        extent_x = max(grid_pos[i][0] + sizes[i][0] for i in members)
+        extent_y = max(grid_pos[i][1] + sizes[i][1] for i in members)
+        cursor_x = max(cursor_x + side, extent_x + 1) + 2
+        shelf_h = max(shelf_h, extent_y - cursor_y + 1)
+    
+    _refine_by_swaps(components, nets, clusters, sizes, grid_pos, max_net_size, refine_passes)
+    
+    for comp, (x, y) in zip(components, grid_pos):
+        comp.x = round(x * grid, 2)
+        comp.y = round(y * grid, 2)
+    return estimate_wire_length(components, nets)
+
+def _refine_by_swaps(components, nets, clusters, sizes, grid_pos, max_net_size, passes):
+    """Swaps of same-size parts within a cluster that reduce signal-net HPWL.
+
+    Swap candidates for a part are its net neighbours plus the same-size parts
+    bucketed around the centroid of its nets' other members, so each pass is
+    linear in the part count. Net HPWLs are cached and only the nets of the
+    two swapped parts are recomputed.
+    """
+    index = {comp.ref: i for i, comp in enumerate(components)}
+    net_members = []
+    comp_nets = [[] for _ in components]
+    for pins in nets.values():
+        if len(pins) > max_net_size:
+            continue
+        members = list({index[r] for r in (pin.partition('.')[0] for pin in pins) if r in index})
+        if len(members) > 1:
+            for i in members:
+                comp_nets[i].append(len(net_members))
+            net_members.append(members)
+    
+    def hpwl(n):
+        xs = [grid_pos[i][0] for i in net_members[n]]
+        ys = [grid_pos[i][1] for i in net_members[n]]
+        return max(xs) - min(xs) + max(ys) - min(ys)
+    
+    net_cost = [hpwl(n) for n in range(len(net_members))]
+    cluster_of = [0] * len(components)
+    for c, members in enumerate(clusters):
+        for i in members:
+            cluster_of[i] = c
+    
+    # Same-size parts bucketed on a grid about one part wide
+    bucket_edge = {size: 2 * max(size) + 1 for size in set(sizes)}
+    
+    def bucket(i, pos=None):
+        x, y = pos or grid_pos[i]
+        edge = bucket_edge[sizes[i]]
+        return sizes[i], x // edge, y // edge
+    
+    buckets = {}
+    for i in range(len(components)):
+        if comp_nets[i]:
+            buckets.setdefault(bucket(i), set()).add(i)
+    
+    for _ in range(passes):
+        improved = False
+        for members in clusters:
+            for a in members:
+                if not comp_nets[a]:
+                    continue
+                # Ideal spot: centroid of the other parts on a's nets
+                others = [j for n in comp_nets[a] for j in net_members[n] if j != a]
+                tx = sum(grid_pos[j][0] for j in others) / len(others)
+                ty = sum(grid_pos[j][1] for j in others) / len(others)
+                size, bx, by = bucket(a, (round(tx), round(ty)))
+                candidates = {j for j in others if sizes[j] == sizes[a]}
+                for cx in (bx - 1, bx, bx + 1):
+                    for cy in (by - 1, by, by + 1):
+                        candidates.update(buckets.get((size, cx, cy), ()))
+                for b in candidates:
+                    if b == a or cluster_of[b] != cluster_of[a]:
+                        continue
+                    affected = set(comp_nets[a]) | set(comp_nets[b])
+                    before = sum(net_cost[n] for n in affected)
+                    old_a, old_b = bucket(a), bucket(b)
+                    grid_pos[a], grid_pos[b] = grid_pos[b], grid_pos[a]
+                    after = {n: hpwl(n) for n in affected}
+                    if sum(after.values()) < before:
+                        improved = True
+                        for n, cost in after.items():
+                            net_cost[n] = cost
+                        if old_a != old_b:
+                            buckets[old_a].discard(a)
+                            buckets[old_b].discard(b)
+                            buckets.setdefault(old_b, set()).add(a)
+                            buckets.setdefault(old_a, set()).add(b)
+                    else:
+                        grid_pos[a], grid_pos[b] = grid_pos[b], grid_pos[a]
+        if not improved:
+            break
+
+#==============================================================================
+# KiCad Schematic Generator
+#==============================================================================
+
+class KiCadSchematicGenerator:
+    """Generates KiCad schematic files"""
+    
+    def __init__(self, project_name, board=None):
+        self.project_name = project_name
+        self.board = board or BL520_BOARD
+        self.uuid = str(stable_uuid(project_name))
+        self.components = []
+        self.wires = []
+        self.labels = []
+        
+    def add_component(self, comp):
+        """Add a component to the schematic"""
+        self.components.append(comp)
+        
+    def generate_header(self):
+        """Generate schematic file header"""
+        return f'''(kicad_sch
+\t(version 20231120)
+\t(generator "BL520_kicad_generator.py")
+\t(generator_version "{GENERATOR_VERSION}")
+\t(uuid "{self.uuid}")
+\t(paper "{self.board.paper}")
+\t(title_block
+\t\t(title "{self.board.title}")
+\t\t(date "{self.board.date}")
+\t\t(rev "{self.board.rev}")
+\t\t(company "{self.board.company}")
+''' + ''.join(f'\t\t(comment {i} "{text}")\n' for i, text in enumerate(self.board.comments, 1)) + "\t)\n"
+
+    def generate_symbol_instance(self, comp, idx):
+        """Generate a symbol instance"""
+        return f'''
+\t(symbol
+\t\t(lib_id "{comp.lib_id}")
+\t\t(at {comp.x} {comp.y} {comp.rotation})
+\t\t(unit 1)
+\t\t(exclude_from_sim no)
+\t\t(in_bom yes)
+\t\t(on_board yes)
+\t\t(dnp no)
+\t\t(uuid "{comp.uuid}")
+\t\t(property "Reference" "{comp.ref}" (at {comp.x} {comp.y - 5.08} 0) (effects (font (size 1.27 1.27))))
+\t\t(property "Value" "{comp.value}" (at {comp.x} {comp.y + 5.08} 0) (effects (font (size 1.27 1.27))))
+\t\t(property "Footprint" "{comp.footprint}" (at {comp.x} {comp.y} 0) (effects (font (size 1.27 1.27)) hide))
+\t\t(property "Datasheet" "" (at {comp.x} {comp.y} 0) (effects (font (size 1.27 1.27)) hide))
+\t\t(instances
+\t\t\t(project "{self.project_name}"
+\t\t\t\t(path "/{self.uuid}" (reference "{comp.ref}") (unit 1))
+\t\t\t)
+\t\t)
+\t)
+'''
+
+    def generate_text_note(self, text, x, y, size=2.54):
+        """Generate a text note"""
+        return f'''
+\t(text "{text}"
+\t\t(exclude_from_sim no)
+\t\t(at {x} {y} 0)
+\t\t(effects (font (size {size} {size})) (justify left))
+\t)
+'''
+
+    def add_net_labels(self, nets):
+        """Place a net label on every connected pin (global for power/interface nets).
+
+        Returns the "REF.PIN" entries that could not be placed (unknown ref or
+        no pin geometry for the symbol).
+        """
+        by_ref = {comp.ref: comp for comp in self.components}
+        unplaced = []
+        for net_name, pins in nets.items():
+            kind = 'global_label' if is_global_net(net_name) else 'label'
+            for pin in pins:
+                ref, _, pin_name = pin.partition('.')
+                comp = by_ref.get(ref)
+                pos = pin_position(comp, pin_name) if comp is not None else None
+                if pos is None:
+                    unplaced.append(pin)
+                    continue
+                self.labels.append((kind, net_name, pos[0], pos[1], pin))
+        return unplaced
+
+    def generate_label(self, kind, net_name, x, y, pin):
+        """Generate a local or global net label"""
+        label_uuid = stable_uuid(f"{self.project_name}/{net_name}/{pin}")
+        if kind == 'global_label':
+            return f'''
+\t(global_label "{net_name}"
+\t\t(shape passive)
+\t\t(at {x} {y} 0)
+\t\t(fields_autoplaced yes)
+\t\t(effects (font (size 1.27 1.27)) (justify left))
+\t\t(uuid "{label_uuid}")
+\t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}" (at {x} {y} 0) (effects (font (size 1.27 1.27)) hide))
+\t)
+'''
+        return f'''
+\t(label "{net_name}"
+\t\t(at {x} {y} 0)
+\t\t(fields_autoplaced yes)
+\t\t(effects (font (size 1.27 1.27)) (justify left bottom))
+\t\t(uuid "{label_uuid}")
+\t)
+'''
+
+    def iter_schematic(self):
+        """Yield schematic file content piece by piece (header, notes, symbols)"""
+        yield self.generate_header()
+        
+        # Add title text and section labels
+        for text, x, y, size in self.board.notes:
+            yield self.generate_text_note(text, x, y, size)
+        
+        # Add all components
+        for idx, comp in enumerate(self.components):
+            yield self.generate_symbol_instance(comp, idx)
+        
+        # Net labels at symbol pins
+        for label in self.labels:
+            yield self.generate_label(*label)
+        
+        # Close the schematic
+        yield "\n)\n"
+
+    def generate_schematic(self):
+        """Generate complete schematic file content"""
+        return ''.join(self.iter_schematic())
+
+    def write_schematic(self, f):
+        """Stream schematic content into an open text file"""
+        f.writelines(self.iter_schematic())
+
+    def save(self, filepath, buffer_size=1 << 16):
+        """Save schematic to file (streamed, memory stays flat)"""
+        with open(filepath, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            self.write_schematic(f)
+        print(f"Schematic saved to: {filepath}")
+
+#==============================================================================
+# BOM Generator
+#==============================================================================
+
+# Reference prefix -> BOM category (longest prefix wins: DC vs D, LED vs L)
+CATEGORY_PREFIXES = {
+    'DC': 'Connectors',
+    'J': 'Connectors',
+    'CHARGE': 'Connectors',
+    'D': 'Diodes',
+    'L': 'Inductors',
+    'C': 'Capacitors',
+    'U': 'ICs',
+    'LED': 'LEDs',
+    'Q': 'Transistors',
+    'R': 'Resistors',
+}
+
+class PrefixTrie:
+    """Character trie for longest-prefix lookups"""
+
+    _VALUE = object()
+
+    def __init__(self, mapping=None):
+        self.root = {}
+        for prefix, value in (mapping or {}).items():
+            self.insert(prefix, value)
+
+    def insert(self, prefix, value):
+        node = self.root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node[self._VALUE] = value
+
+    def longest_match(self, key, default=None):
+        """Value of the longest inserted prefix of key"""
+        node = self.root
+        found = node.get(self._VALUE, default)
+        for ch in key:
+            node = node.get(ch)
+            if node is None:
+                break
+            found = node.get(self._VALUE, found)
+        return found
+
+CATEGORY_TRIE = PrefixTrie(CATEGORY_PREFIXES)
+
+def load_price_table(filepath):
+    """Load unit prices from CSV (value,footprint,unit_price) or JSON.
+
+    Keys are (value, footprint); an empty footprint matches any footprint.
+    JSON may be {"value": price} or {"value|footprint": price}.
+    """
+    prices = {}
+    if filepath.lower().endswith('.json'):
+        import json
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for key, price in json.load(f).items():
+                value, _, footprint = key.partition('|')
+                prices[(value, footprint)] = float(price)
+    else:
+        import csv
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                prices[(row['value'], row.get('footprint') or '')] = float(row['unit_price'])
+    return prices
+
+class BOMLine:
+    """One grouped BOM row (identical value + footprint)"""
+
+    def __init__(self, category, value, footprint, unit_price=None):
+        self.category = category
+        self.value = value
+        self.footprint = footprint
+        self.unit_price = unit_price
+        self.refs = []
+
+    @property
+    def quantity(self):
+        return len(self.refs)
+
+    @property
+    def package(self):
+        return self.footprint.split(':')[-1] if ':' in self.footprint else self.footprint
+
+    @property
+    def extended_price(self):
+        return None if self.unit_price is None else self.unit_price * self.quantity
+
+class BOM:
+    """Grouped bill of materials with category counts and cost rollup.
+
+    Built in one pass over the components: each part is binned into its
+    value+footprint line and its category (via CATEGORY_TRIE).
+    """
+
+    CATEGORY_ORDER = ['Connectors', 'Diodes', 'Inductors', 'Capacitors', 'ICs',
+                      'LEDs', 'Transistors', 'Resistors']
+
+    def __init__(self, components, prices=None, title="BL520 Charger Board V1.0", date=""):
+        self.title = title
+        self.date = date
+        prices = prices or {}
+        lines = {}
+        self.category_refs = {cat: [] for cat in self.CATEGORY_ORDER}
+        self.total_components = 0
+        for comp in components:
+            category = CATEGORY_TRIE.longest_match(comp.ref.rstrip('0123456789'), 'Other')
+            key = (comp.value, comp.footprint)
+            line = lines.get(key)
+            if line is None:
+                price = prices.get(key, prices.get((comp.value, '')))
+                line = lines[key] = BOMLine(category, comp.value, comp.footprint, price)
+            line.refs.append(comp.ref)
+            self.category_refs.setdefault(category, []).append(comp.ref)
+            self.total_components += 1
+        order = {cat: i for i, cat in enumerate(self.category_refs)}
+        self.lines = sorted(lines.values(), key=lambda line: order[line.category])
+
+    @property
+    def category_counts(self):
+        return {cat: len(refs) for cat, refs in self.category_refs.items()}
+
+    @property
+    def total_cost(self):
+        return sum(line.extended_price for line in self.lines if line.unit_price is not None)
+
+    @property
+    def unpriced_lines(self):
+        return [line for line in self.lines if line.unit_price is None]
+
+    def rows(self):
+        """Table rows: item, qty, refs, value, footprint, package, unit, extended"""
+        for idx, line in enumerate(self.lines, 1):
+            yield (idx, line.quantity, ", ".join(line.refs), line.value, line.footprint,
+                   line.package, line.unit_price, line.extended_price)
+
+    HEADER = ("Item", "Qty", "Reference", "Value", "Footprint", "Package", "Unit Price", "Ext. Price")
+
+    def to_markdown(self, notes=None):
+        """Markdown BOM document"""
+        def price(p, fmt):
+            return "-" if p is None else format(p, fmt)
+
+        out = [f"# {self.title} - Bill of Materials",
+               "# Generated by KiCad Python Script",
+               f"# Date: {self.date}",
+               "",
+               "| " + " | ".join(self.HEADER) + " |",
+               "|" + "|".join("-" * (len(h) + 2) for h in self.HEADER) + "|"]
+        for idx, qty, refs, value, footprint, package, unit, ext in self.rows():
+            out.append(f"| {idx} | {qty} | {refs} | {value} | {footprint} | {package} "
+                       f"| {price(unit, '.4f')} | {price(ext, '.2f')} |")
+        out.append("")
+        out.append(f"**Total Components: {self.total_components}** "
+                   f"({len(self.lines)} unique parts)")
+        if any(line.unit_price is not None for line in self.lines):
+            out.append("")
+            out.append(f"**Total Cost: {self.total_cost:.2f}**"
+                       + (f" ({len(self.unpriced_lines)} lines unpriced)" if self.unpriced_lines else ""))
+        out += ["", "## Summary by Type", "",
+                "| Category | Count | References |",
+                "|----------|-------|------------|"]
+        for cat, refs in self.category_refs.items():
+            if refs:
+                out.append(f"| {cat} | {len(refs)} | {', '.join(refs)} |")
+        if notes:
+            out += ["", "## Special Notes", ""]
+            out += [f"- {note}" for note in notes]
+        return "\n".join(out) + "\n"
+
+    def write_markdown(self, filepath, notes=None):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(self.to_markdown(notes))
+
+    def write_csv(self, filepath):
+        import csv
+        with open(filepath, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.HEADER)
+            for row in self.rows():
+                writer.writerow(["" if v is None else v for v in row])
+
+    def write_xlsx(self, filepath):
+        """Write BOM and category summary sheets (requires openpyxl)"""
+        try:
+            from openpyxl import Workbook
+        except ImportError as exc:
+            raise ImportError("XLSX BOM output requires openpyxl: pip install openpyxl") from exc
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "BOM"
+        ws.append(self.HEADER)
+        for row in self.rows():
+            ws.append(list(row))
+        summary = wb.create_sheet("Summary")
+        summary.append(("Category", "Count", "References"))
+        for cat, refs in self.category_refs.items():
+            if refs:
+                summary.append((cat, len(refs), ", ".join(refs)))
+        summary.append(("Total", self.total_components, ""))
+        if any(line.unit_price is not None for line in self.lines):
+            summary.append(("Total Cost", self.total_cost, ""))
+        wb.save(filepath)
+
+    def write(self, filepath, notes=None):
+        """Write in the format given by the file extension (.md, .csv, .xlsx)"""
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext == '.csv':
+            self.write_csv(filepath)
+        elif ext == '.xlsx':
+            self.write_xlsx(filepath)
+        else:
+            self.write_markdown(filepath, notes)
+        print(f"BOM saved to: {filepath}")
+
+def generate_bom(components, filepath, prices=None, title="BL520 Charger Board V1.0", notes=BOM_NOTES,
+                 date=""):
+    """Generate Bill of Materials"""
+    BOM(components, prices, title, date).write(filepath, notes)
+
+#==============================================================================
+# Netlist Generator
+#==============================================================================
+
+def generate_netlist(components, nets, filepath, title="BL520 Charger Board V1.0", date=""):
+    """Generate netlist file"""
+    
+    netlist_content = """# {title} - Netlist
+# Generated by KiCad Python Script
+# Date: {date}
+
+""".format(title=title, date=date)
+    
+    netlist_content += "# COMPONENTS\n"
+    netlist_content += "-" * 60 + "\n"
+    for comp in components:
+        netlist_content += f"{comp.ref:10} {comp.value:20} {comp.footprint}\n"
+    
+    netlist_content += "\n# NETS\n"
+    netlist_content += "-" * 60 + "\n"
+    for net_name, pins in nets.items():
+        netlist_content += f"\n{net_name}:\n"
+        for pin in pins:
+            netlist_content += f"    {pin}\n"
+    
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(netlist_content)
+    print(f"Netlist saved to: {filepath}")
+
+def _sexpr_str(text):
+    """Quote a string for an s-expression"""
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def iter_kicad_netlist(components, nets, source="", project_name="", date=""):
+    """Yield a KiCad netlist (export version "E") built from NETS"""
+    by_ref = {comp.ref: comp for comp in components}
+    yield '(export (version "E")\n'
+    yield (f'  (design\n    (source {_sexpr_str(source)})\n'
+           f'    (date {_sexpr_str(date)})\n'
+           f'    (tool {_sexpr_str("BL520_kicad_generator.py " + GENERATOR_VERSION)}))\n')
+    yield '  (components'
+    for comp in components:
+        lib, _, part = comp.lib_id.partition(':')
+        yield (f'\n    (comp (ref {_sexpr_str(comp.ref)})\n'
+               f'      (value {_sexpr_str(comp.value)})\n'
+               f'      (footprint {_sexpr_str(comp.footprint)})\n'
+               f'      (libsource (lib {_sexpr_str(lib)}) (part {_sexpr_str(part)}) (description ""))\n'
+               f'      (sheetpath (names "/") (tstamps "/"))\n'
+               f'      (tstamps {_sexpr_str(comp.uuid)}))')
+    yield ')\n  (nets'
+    for code, (net_name, pins) in enumerate(nets.items(), 1):
+        yield f'\n    (net (code "{code}") (name {_sexpr_str(net_name)})'
+        for pin in pins:
+            ref, _, pin_name = pin.partition('.')
+            comp = by_ref.get(ref)
+            lookup = lib_pin_lookup(comp.lib_id) if comp is not None else None
+            number = lookup.get(pin_name, pin_name) if lookup else pin_name
+            node = f'\n      (node (ref {_sexpr_str(ref)}) (pin {_sexpr_str(number)})'
+            if number != pin_name:
+                node += f' (pinfunction {_sexpr_str(pin_name)})'
+            yield node + ')'
+        yield ')'
+    yield '))\n'
+
+def generate_kicad_netlist(components, nets, filepath, source="", date=""):
+    """Write a KiCad .net netlist (streamed)"""
+    with open(filepath, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        f.writelines(iter_kicad_netlist(components, nets, source, date=date))
+    print(f"KiCad netlist saved to: {filepath}")
+
+#==============================================================================
+# Incremental Build
+#==============================================================================
+
+MANIFEST_NAME = "{prefix}_build_manifest.json"
+
+def library_digest(lib_ids):
+    """Hash of the registered pin tables (names and label geometry) of the given lib_ids"""
+    return content_hash(*(f"{lib_id}={LIB_PINS.get(lib_id)}"
+                          f"{sorted(LIB_PIN_OFFSETS.get(lib_id, {}).items())}"
+                          for lib_id in sorted(lib_ids)))
+
+def compute_build_hashes(board, prices=None):
+    """Per-component, per-net and per-output input hashes
+
+    The schematic (label placement) and KiCad netlist (pin numbers) also
+    depend on the pin tables of the symbols the board uses, so a --library /
+    register_library() change rebuilds them.
+    """
+    component_hashes = {comp.ref: comp.content_hash() for comp in board.components}
+    net_hashes = {name: content_hash(name, *pins) for name, pins in board.nets.items()}
+    # Order matters: outputs list components/nets in definition order
+    components_digest = content_hash(*(f"{ref}={h}" for ref, h in component_hashes.items()))
+    nets_digest = content_hash(*(f"{name}={h}" for name, h in net_hashes.items()))
+    library = library_digest({comp.lib_id for comp in board.components})
+    outputs = {
+        'schematic': content_hash(GENERATOR_VERSION, board.metadata_hash(), components_digest, nets_digest,
+                                  library),
+        'bom': content_hash(GENERATOR_VERSION, board.title, board.date, *board.bom_notes, components_digest,
+                            sorted((prices or {}).items())),
+        'netlist': content_hash(GENERATOR_VERSION, board.title, board.date, components_digest, nets_digest),
+        'kicad_netlist': content_hash(GENERATOR_VERSION, board.name, board.date, components_digest, nets_digest,
+                                      library),
+    }
+    return {'components': component_hashes, 'nets': net_hashes, 'outputs': outputs}
+
+def load_manifest(filepath):
+    """Load previous build manifest (empty if missing or unreadable)"""
+    import json
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(filepath, manifest):
+    """Save build manifest"""
+    import json
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def _changed_keys(old, new):
+    """Keys added, removed or changed between two hash dicts"""
+    return sorted(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+
+def output_is_current(manifest, hashes, name, filepath):
+    """True if the output exists and was built from the same inputs"""
+    recorded = manifest.get('outputs', {}).get(name)
+    if not recorded or recorded.get('inputs') != hashes['outputs'][name]:
+        return False
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return False
+    # Catch hand edits / partial writes without re-reading the file
+    return st.st_size == recorded.get('size') and st.st_mtime_ns == recorded.get('mtime_ns')
+
+def record_output(manifest, hashes, name, filepath):
+    """Record the inputs an output was built from"""
+    st = os.stat(filepath)
+    manifest.setdefault('outputs', {})[name] = {
+        'inputs': hashes['outputs'][name],
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+    }
+
+#==============================================================================
+# Board Build
+#==============================================================================
+
+def build_board(board, output_dir, incremental=False, prices=None, bom_formats=('md',),
+                auto_placement=False):
+    """Write schematic, BOM and netlist for one board; returns a build summary"""
+    start = time.perf_counter()
+    if auto_placement:
+        # Place copies: the board may share its parts (BL520_BOARD uses COMPONENTS)
+        import copy
+        board = copy.copy(board)
+        board.components = [copy.copy(comp) for comp in board.components]
+        auto_place(board.components, board.nets)
+    generator = KiCadSchematicGenerator(board.name, board)
+    for comp in board.components:
+        generator.add_component(comp)
+    unplaced = generator.add_net_labels(board.nets)
+    bom = BOM(board.components, prices, board.title, board.date)
+    violations = run_erc(board.components, board.nets)
+    by_ref = {}
+    for pin in unplaced:
+        by_ref.setdefault(pin.partition('.')[0], []).append(pin.partition('.')[2])
+    lib_ids = {comp.ref: comp.lib_id for comp in board.components}
+    for ref, pins in by_ref.items():
+        if ref in lib_ids:
+            violations.append(ERCViolation('warning', 'unlabeled_pins', ref,
+                                           f"{ref}: no pin geometry for {lib_ids[ref]} "
+                                           f"({', '.join(pins)}), net labels not placed"))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = board.file_prefix
+    sch_path = os.path.join(output_dir, f"{board.name}_generated.kicad_sch")
+    net_path = os.path.join(output_dir, f"{prefix}_Netlist_generated.txt")
+    kicad_net_path = os.path.join(output_dir, f"{board.name}_generated.net")
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME.format(prefix=prefix))
+    hashes = compute_build_hashes(board, prices)
+    manifest = load_manifest(manifest_path) if incremental else {}
+    
+    if incremental and manifest:
+        changed = _changed_keys(manifest.get('components', {}), hashes['components'])
+        if changed:
+            print(f"Changed components: {', '.join(changed)}")
+        changed = _changed_keys(manifest.get('nets', {}), hashes['nets'])
+        if changed:
+            print(f"Changed nets: {', '.join(changed)}")
+    
+    outputs = [
+        ('schematic', sch_path, lambda: generator.save(sch_path)),
+        ('netlist', net_path, lambda: generate_netlist(board.components, board.nets, net_path, board.title,
+                                                       board.date)),
+        ('kicad_netlist', kicad_net_path, lambda: generate_kicad_netlist(
+            board.components, board.nets, kicad_net_path, os.path.basename(sch_path), board.date)),
+    ]
+    for fmt in bom_formats:
+        bom_path = os.path.join(output_dir, f"{prefix}_BOM_generated.{fmt}")
+        hashes['outputs'][f'bom_{fmt}'] = hashes['outputs']['bom']
+        outputs.insert(1, (f'bom_{fmt}', bom_path, lambda path=bom_path: bom.write(path, board.bom_notes)))
+    new_manifest = {'version': 1, 'components': hashes['components'], 'nets': hashes['nets']}
+    written = []
+    for name, path, build in outputs:
+        if incremental and output_is_current(manifest, hashes, name, path):
+            new_manifest.setdefault('outputs', {})[name] = manifest['outputs'][name]
+            print(f"Up to date: {path}")
+            continue
+        build()
+        record_output(new_manifest, hashes, name, path)
+        written.append(path)
+    save_manifest(manifest_path, new_manifest)
+    
+    return {
+        'board': board.name,
+        'components': len(board.components),
+        'nets': len(board.nets),
+        'written': written,
+        'skipped': len(outputs) - len(written),
+        'erc_errors': sum(1 for v in violations if v.severity == 'error'),
+        'erc_warnings': sum(1 for v in violations if v.severity == 'warning'),
+        'wire_length': estimate_wire_length(board.components, board.nets),
+        'bom': bom,
+        'violations': violations,
+        'seconds': time.perf_counter() - start,
+    }
+
+def _batch_worker_init(library, profile=False):
+    """Install the shared symbol library once per worker process"""
+    if library:
+        register_library(library)
+    if profile:
+        profiler().enable()
+
+def _batch_build(board_path, output_dir, incremental, prices, bom_formats, auto_placement,
+                 profile=None):
+    """Worker: load and build one board file quietly"""
+    start = time.perf_counter()
+    board = load_board(board_path)
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            result = build_board(board, output_dir or os.path.dirname(os.path.abspath(board_path)),
+                                 incremental, prices, bom_formats, auto_placement)
+        finally:
+            sys.stdout = stdout
+    # Parsed objects stay in the worker; only the summary crosses the process boundary
+    del result['bom'], result['violations']
+    if profile:
+        # One profile per worker process, rewritten after each board it builds
+        profiler().write(f"{profile}.{os.getpid()}")
+    result['path'] = board_path
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def build_boards(board_paths, output_dir=None, jobs=None, library=None, incremental=False,
+                 prices=None, bom_formats=('md',), auto_placement=False, profile=None):
+    """Build many board files on a process pool; yields summaries as boards finish.
+
+    The symbol library is parsed once here and handed to each worker at
+    start-up, where lib_pin_lookup() caches it for every board that worker
+    builds. output_dir=None writes next to each board file. With a profile
+    prefix each worker writes PREFIX.<pid>.json and PREFIX.<pid>.trace.json.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_batch_worker_init,
+                             initargs=(library, bool(profile))) as pool:
+        futures = {pool.submit(_batch_build, path, output_dir, incremental, prices, tuple(bom_formats),
+                               auto_placement, profile): path
+                   for path in board_paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as exc:
+                yield {'path': futures[future], 'error': f"{type(exc).__name__}: {exc}"}
+
+def print_batch_report(results, wall_time):
+    """Per-board timing table"""
+    print(f"{'Board':30} {'Parts':>6} {'Nets':>6} {'Written':>7} {'ERC E/W':>8} {'Time':>8}")
+    print("-" * 72)
+    failed = 0
+    for r in sorted(results, key=lambda r: r['path']):
+        if 'error' in r:
+            failed += 1
+            print(f"{os.path.basename(r['path']):30} FAILED: {r['error']}")
+            continue
+        erc = f"{r['erc_errors']}/{r['erc_warnings']}"
+        print(f"{r['board']:30} {r['components']:6} {r['nets']:6} {len(r['written']):7} "
+              f"{erc:>8} {r['seconds'] * 1000:6.1f}ms")
+    print("-" * 72)
+    print(f"{len(results)} boards ({failed} failed) in {wall_time:.2f}s")
+    return failed
+
+#==============================================================================
+# Profiling Hooks
+#==============================================================================
+#
+# profiler().enable() swaps the targets below for timing wrappers and disable()
+# puts the originals back, so a normal run calls the unwrapped functions.
+# The Profiler itself is shared with the motor calculator (common/profile_hooks.py)
+# and is only imported when --profile asks for it, so a copy of this script
+# outside the repository still runs without common/.
+
+PROFILE_TARGETS = [
+    (KiCadSchematicGenerator, 'generate_symbol_instance'),
+    (KiCadSchematicGenerator, 'add_net_labels'),
+    (KiCadSchematicGenerator, 'save'),
+    (None, 'run_erc'),
+    (None, 'auto_place'),
+    (None, 'compute_build_hashes'),
+    (BOM, 'write'),
+    (None, 'generate_netlist'),
+    (None, 'generate_kicad_netlist'),
+    (None, 'save_manifest'),
+    (None, 'build_board'),
+]
+
+PROFILER = None     # created by profiler() on first use
+
+def profiler():
+    """The module Profiler; raises ImportError when common/profile_hooks.py is missing"""
+    global PROFILER
+    if PROFILER is None:
+        try:
+            from profile_hooks import Profiler
+        except ImportError:
+            # Not on sys.path: load it from common/ at the repository root
+            import importlib.util
+            path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                'common', 'profile_hooks.py')
+            if not os.path.exists(path):
+                raise ImportError(f"--profile needs {path}") from None
+            spec = importlib.util.spec_from_file_location('profile_hooks', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            Profiler = module.Profiler
+        PROFILER = Profiler(PROFILE_TARGETS, __name__)
+    return PROFILER
+
+#==============================================================================
+# Main Execution
+#==============================================================================
+
+def main(argv=None):
+    """Main function"""
+    
+    parser = argparse.ArgumentParser(description="KiCad schematic/BOM/netlist generator")
+    parser.add_argument('boards', nargs='*', metavar='BOARD',
+                        help="board description files (JSON/TOML); default: built-in BL520 board")
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help="output directory (default: next to the board file / this script)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="worker processes for multi-board builds (default: CPU count)")
+    parser.add_argument('--library', metavar='FILE',
+                        help="extra symbol pin tables {lib_id: [[number, name, x, y], ...]} (JSON/TOML) "
+                             "or a KiCad .kicad_sym library")
+    parser.add_argument('--auto-place', action='store_true',
+                        help="ignore x/y and place components automatically by net clusters")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only rewrite outputs whose inputs changed since the last build")
+    parser.add_argument('--prices', metavar='FILE',
+                        help="price table (CSV: value,footprint,unit_price or JSON) for BOM cost rollup")
+    parser.add_argument('--bom-format', action='append', choices=['md', 'csv', 'xlsx'],
+                        help="BOM output format (repeatable, default: md)")
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help="time the build hot paths; writes PREFIX.json and PREFIX.trace.json "
+                             "(Chrome trace), one pair per worker for multi-board builds")
+    args = parser.parse_args(argv)
+    if args.profile:
+        try:
+            profiler()
+        except ImportError as exc:
+            parser.error(str(exc))
+    prices = load_price_table(args.prices) if args.prices else None
+    bom_formats = args.bom_format or ['md']
+    library = load_library(args.library) if args.library else None
+    
+    if len(args.boards) > 1:
+        start = time.perf_counter()
+        results = list(build_boards(args.boards, args.output_dir, args.jobs, library,
+                                    args.incremental, prices, bom_formats, args.auto_place,
+                                    args.profile))
+        failed = print_batch_report(results, time.perf_counter() - start)
+        return 1 if failed else 0
+    
+    _batch_worker_init(library, bool(args.profile))
+    if args.boards:
+        board = load_board(args.boards[0])
+        output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.boards[0]))
+    else:
+        board = BL520_BOARD
+        output_dir = args.output_dir or os.path.dirname(os.path.abspath(__file__))
+    
+    print("=" * 60)
+    print(f"{board.title} - KiCad Python Generator")
+    print("=" * 60)
+    print()
+    print(f"Total components: {len(board.components)}")
+    print()
+    
+    try:
+        result = build_board(board, output_dir, args.incremental, prices, bom_formats, args.auto_place)
+    finally:
+        if args.profile:
+            profiler().disable()
+            profiler().write(args.profile)
+            print(f"Profile written: {args.profile}.json, {args.profile}.trace.json")
+    print(f"Estimated wire length: {result['wire_length']:.1f} mm")
+    
+    # Component summary
+    print()
+    print("Component Summary:")
+    print("-" * 40)
+    for cat, count in result['bom'].category_counts.items():
+        print(f"  {cat:15}: {count}")
+    
+    print()
+    print_erc_report(result['violations'])
+    
+    if board.bom_notes:
+        print()
+        print("Notes:")
+        for note in board.bom_notes:
+            print(f"  {note.replace('**', '')}")
+    
+    print()
+    print("=" * 60)
+    print(f"Generation completed in {result['seconds'] * 1000:.1f} ms")
+    print("=" * 60)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
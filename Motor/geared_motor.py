@@ -0,0 +1,3646 @@
+#!/usr/bin/env python3
+"""
+기어드 모터 설계 계산기
+========================
+DC 모터 사양과 목표 성능을 입력하면 필요한 기어비와 기어 구성을 자동으로 계산합니다.
+
+이론적 배경:
+-----------
+1. DC 모터 기본 방정식
+   - 역기전력(Back-EMF): E = Ke × ω
+   - 토크: T = Kt × I
+   - 무부하 속도: ω_no_load = V / Ke
+   - 정지 토크: T_stall = Kt × I_stall
+
+2. 기어 감속 원리
+   - 속도 관계: ω_out = ω_in / G (G: 총 기어비)
+   - 토크 관계: T_out = T_in × G × η (η: 효율)
+   - 출력 = 입력 - 손실
+
+3. 다단 기어 시스템
+   - 총 기어비: G_total = G1 × G2 × G3 × ...
+   - 총 효율: η_total = η1 × η2 × η3 × ...
+
+Author: Claude (Anthropic)
+"""
+
+import os
+import sys
+import math
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple, Optional
+import threading
+
+# json(카탈로그/배치), argparse(명령행), numpy(배치 계산)는 사용하는 함수 안에서
+# 임포트합니다. 대화형/단일 설계 실행의 시작 시간을 줄이기 위함입니다.
+
+
+@dataclass
+class DCMotorSpec:
+    """DC 모터 사양 데이터 클래스"""
+    name: str                    # 모터 이름/모델
+    voltage_nominal: float       # 정격 전압 [V]
+    current_no_load: float       # 무부하 전류 [A]
+    current_stall: float         # 정지(스톨) 전류 [A]
+    rpm_no_load: float           # 무부하 회전수 [RPM]
+    torque_stall: float          # 정지 토크 [mNm]
+    diameter: float              # 모터 직경 [mm]
+    length: float                # 모터 길이 [mm]
+    weight: float                # 모터 무게 [g]
+    
+    @property
+    def omega_no_load(self) -> float:
+        """무부하 각속도 [rad/s]"""
+        return self.rpm_no_load * 2 * math.pi / 60
+    
+    @property
+    def torque_stall_Nm(self) -> float:
+        """정지 토크 [Nm]"""
+        return self.torque_stall / 1000
+    
+    @property
+    def Ke(self) -> float:
+        """역기전력 상수 [V/(rad/s)]"""
+        return self.voltage_nominal / self.omega_no_load
+    
+    @property
+    def Kt(self) -> float:
+        """토크 상수 [Nm/A]"""
+        return self.torque_stall_Nm / self.current_stall
+    
+    @property
+    def R_armature(self) -> float:
+        """전기자 저항 [Ω] (추정값)"""
+        return self.voltage_nominal / self.current_stall
+    
+    @property
+    def power_max(self) -> float:
+        """최대 기계적 출력 [W] (정지토크의 25% 지점에서 발생)"""
+        return (self.torque_stall_Nm / 4) * (self.omega_no_load / 2)
+    
+    def get_operating_point(self, load_torque_Nm: float, duty: float = 1.0) -> Tuple[float, float, float, float]:
+        """
+        주어진 부하 토크에서의 동작점 계산
+        
+        Args:
+            load_torque_Nm: 부하 토크 [Nm]
+            duty: PWM 듀티 (0~1) - 평균 전압 D·V에 비례해 무부하 회전수/정지 토크/정지 전류가
+                줄고, 속도-토크 기울기와 토크-전류 관계는 그대로입니다.
+        
+        Returns:
+            (rpm, current, power_mech, efficiency)
+        """
+        if duty <= 0:
+            return (0, 0, 0, 0)
+        if load_torque_Nm > self.torque_stall_Nm * duty:
+            # 스톨: 정지 토크 D·T_s에서의 전류 (회전 구간 전류식과 연속)
+            return (0, self.current_no_load + (self.current_stall - self.current_no_load) * duty, 0, 0)
+        
+        # 선형 토크-속도 특성 가정
+        rpm = self.rpm_no_load * (duty - load_torque_Nm / self.torque_stall_Nm)
+        omega = rpm * 2 * math.pi / 60
+        
+        # 전류 계산
+        current = self.current_no_load + (self.current_stall - self.current_no_load) * (load_torque_Nm / self.torque_stall_Nm)
+        
+        # 기계적 출력
+        power_mech = load_torque_Nm * omega
+        
+        # 전기적 입력
+        power_elec = self.voltage_nominal * duty * current
+        
+        # 효율
+        efficiency = power_mech / power_elec if power_elec > 0 else 0
+        
+        return (rpm, current, power_mech, efficiency)
+
+
+@dataclass
+class GearStage:
+    """단일 기어 단 정보"""
+    ratio: float                 # 기어비 (>1: 감속)
+    efficiency: float            # 효율 (0~1)
+    gear_type: str              # 기어 종류
+    teeth_driving: int          # 구동 기어 잇수
+    teeth_driven: int           # 피동 기어 잇수
+    module: float               # 모듈 [mm]
+    
+    @property
+    def pitch_diameter_driving(self) -> float:
+        """구동 기어 피치원 직경 [mm]"""
+        return self.module * self.teeth_driving
+    
+    @property
+    def pitch_diameter_driven(self) -> float:
+        """피동 기어 피치원 직경 [mm]"""
+        return self.module * self.teeth_driven
+
+
+@dataclass
+class PlanetaryStage(GearStage):
+    """
+    유성 기어 단 (링 기어 고정, 선기어 입력 → 캐리어 출력)
+
+    teeth_driving은 선기어, teeth_driven은 링 기어 잇수이며
+    기어비 = 1 + 링/선, 링 = 선 + 2 × 유성입니다.
+    """
+    teeth_planet: int            # 유성 기어 잇수
+    num_planets: int             # 유성 기어 수
+    
+    @property
+    def pitch_diameter_planet(self) -> float:
+        """유성 기어 피치원 직경 [mm]"""
+        return self.module * self.teeth_planet
+
+
+@dataclass
+class TargetSpec:
+    """목표 사양"""
+    rpm_output: float            # 목표 출력 회전수 [RPM]
+    torque_output_Nm: float      # 목표 출력 토크 [Nm]
+    
+    @property
+    def torque_output_mNm(self) -> float:
+        return self.torque_output_Nm * 1000
+    
+    @property
+    def power_output(self) -> float:
+        """목표 출력 [W]"""
+        omega = self.rpm_output * 2 * math.pi / 60
+        return self.torque_output_Nm * omega
+
+
+# =============================================================================
+# 슬롯/불변 사양 클래스 (대량 후보 처리용)
+# =============================================================================
+#
+# DCMotorSpec/GearStage/TargetSpec과 같은 필드와 메서드를 제공하지만
+# 인스턴스 __dict__가 없고, 파생 상수를 생성 시 한 번만 계산해 슬롯에 저장합니다.
+# GearTrainDesigner에는 원래 클래스 대신 그대로 넘길 수 있습니다.
+
+@dataclass(frozen=True)
+class CompactMotorSpec:
+    """DCMotorSpec의 슬롯/불변 버전"""
+    __slots__ = ('name', 'voltage_nominal', 'current_no_load', 'current_stall', 'rpm_no_load',
+                 'torque_stall', 'diameter', 'length', 'weight',
+                 'omega_no_load', 'torque_stall_Nm', 'Ke', 'Kt', 'R_armature', 'power_max')
+    name: str
+    voltage_nominal: float
+    current_no_load: float
+    current_stall: float
+    rpm_no_load: float
+    torque_stall: float
+    diameter: float
+    length: float
+    weight: float
+
+    def __post_init__(self):
+        omega_no_load = self.rpm_no_load * 2 * math.pi / 60
+        torque_stall_Nm = self.torque_stall / 1000
+        object.__setattr__(self, 'omega_no_load', omega_no_load)
+        object.__setattr__(self, 'torque_stall_Nm', torque_stall_Nm)
+        object.__setattr__(self, 'Ke', self.voltage_nominal / omega_no_load)
+        object.__setattr__(self, 'Kt', torque_stall_Nm / self.current_stall)
+        object.__setattr__(self, 'R_armature', self.voltage_nominal / self.current_stall)
+        object.__setattr__(self, 'power_max', (torque_stall_Nm / 4) * (omega_no_load / 2))
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.voltage_nominal, self.current_no_load,
+                                 self.current_stall, self.rpm_no_load, self.torque_stall,
+                                 self.diameter, self.length, self.weight))
+
+    @classmethod
+    def from_spec(cls, motor: DCMotorSpec) -> 'CompactMotorSpec':
+        return cls(motor.name, motor.voltage_nominal, motor.current_no_load, motor.current_stall,
+                   motor.rpm_no_load, motor.torque_stall, motor.diameter, motor.length, motor.weight)
+
+    def to_spec(self) -> DCMotorSpec:
+        return DCMotorSpec(*self.__reduce__()[1])
+
+    def get_operating_point(self, load_torque_Nm: float, duty: float = 1.0) -> Tuple[float, float, float, float]:
+        """DCMotorSpec.get_operating_point()와 동일 (미리 계산한 상수 사용)"""
+        torque_stall_Nm = self.torque_stall_Nm
+        if duty <= 0:
+            return (0, 0, 0, 0)
+        if load_torque_Nm > torque_stall_Nm * duty:
+            return (0, self.current_no_load + (self.current_stall - self.current_no_load) * duty, 0, 0)
+        load_fraction = load_torque_Nm / torque_stall_Nm
+        rpm = self.rpm_no_load * (duty - load_fraction)
+        current = self.current_no_load + (self.current_stall - self.current_no_load) * load_fraction
+        power_mech = load_torque_Nm * (rpm * 2 * math.pi / 60)
+        power_elec = self.voltage_nominal * duty * current
+        efficiency = power_mech / power_elec if power_elec > 0 else 0
+        return (rpm, current, power_mech, efficiency)
+
+
+@dataclass(frozen=True)
+class CompactGearStage:
+    """GearStage의 슬롯/불변 버전"""
+    __slots__ = ('ratio', 'efficiency', 'gear_type', 'teeth_driving', 'teeth_driven', 'module',
+                 'pitch_diameter_driving', 'pitch_diameter_driven')
+    ratio: float
+    efficiency: float
+    gear_type: str
+    teeth_driving: int
+    teeth_driven: int
+    module: float
+
+    def __post_init__(self):
+        object.__setattr__(self, 'pitch_diameter_driving', self.module * self.teeth_driving)
+        object.__setattr__(self, 'pitch_diameter_driven', self.module * self.teeth_driven)
+
+    def __reduce__(self):
+        return (self.__class__, (self.ratio, self.efficiency, self.gear_type,
+                                 self.teeth_driving, self.teeth_driven, self.module))
+
+    @classmethod
+    def from_stage(cls, stage: GearStage) -> 'CompactGearStage':
+        return cls(stage.ratio, stage.efficiency, stage.gear_type,
+                   stage.teeth_driving, stage.teeth_driven, stage.module)
+
+
+@dataclass(frozen=True)
+class CompactTargetSpec:
+    """TargetSpec의 슬롯/불변 버전"""
+    __slots__ = ('rpm_output', 'torque_output_Nm', 'torque_output_mNm', 'power_output')
+    rpm_output: float
+    torque_output_Nm: float
+
+    def __post_init__(self):
+        object.__setattr__(self, 'torque_output_mNm', self.torque_output_Nm * 1000)
+        object.__setattr__(self, 'power_output',
+                           self.torque_output_Nm * (self.rpm_output * 2 * math.pi / 60))
+
+    def __reduce__(self):
+        return (self.__class__, (self.rpm_output, self.torque_output_Nm))
+
+    @classmethod
+    def from_spec(cls, target: TargetSpec) -> 'CompactTargetSpec':
+        return cls(target.rpm_output, target.torque_output_Nm)
+
+
+class MotorSpecArray:
+    """
+    모터 사양 컬렉션 (struct-of-arrays)
+
+    사양 필드별로 float64 배열 하나씩 저장하므로 모터 한 개당 약 64바이트입니다.
+    파생 상수는 컬럼 단위로 한 번 계산해 둡니다. 인덱싱하면 CompactMotorSpec을 돌려줍니다.
+    """
+    __slots__ = ('names', 'columns', 'derived')
+
+    FIELDS = ('voltage_nominal', 'current_no_load', 'current_stall', 'rpm_no_load',
+              'torque_stall', 'diameter', 'length', 'weight')
+
+    def __init__(self, columns: dict, names: Optional[List[str]] = None):
+        np = _require_numpy()
+        self.columns = {f: np.ascontiguousarray(columns[f], dtype=np.float64) for f in self.FIELDS}
+        self.names = names
+        c = self.columns
+        omega_no_load = c['rpm_no_load'] * 2 * math.pi / 60
+        torque_stall_Nm = c['torque_stall'] / 1000
+
+        def ratio(num, den):
+            # 분모가 0인 행(사양 누락)은 예외 대신 NaN
+            return np.divide(num, den, out=np.full(den.shape, np.nan), where=den != 0)
+
+        self.derived = {
+            'omega_no_load': omega_no_load,
+            'torque_stall_Nm': torque_stall_Nm,
+            'Ke': ratio(c['voltage_nominal'], omega_no_load),
+            'Kt': ratio(torque_stall_Nm, c['current_stall']),
+            'R_armature': ratio(c['voltage_nominal'], c['current_stall']),
+        }
+
+    @classmethod
+    def from_specs(cls, motors) -> 'MotorSpecArray':
+        """DCMotorSpec(또는 CompactMotorSpec) 목록에서 생성"""
+        motors = list(motors)
+        return cls(motor_spec_arrays(motors, cls.FIELDS), [m.name for m in motors])
+
+    def __len__(self) -> int:
+        return len(self.columns['rpm_no_load'])
+
+    def __getitem__(self, row: int) -> CompactMotorSpec:
+        name = self.names[row] if self.names is not None else ''
+        return CompactMotorSpec(name, *(float(self.columns[f][row]) for f in self.FIELDS))
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __getattr__(self, attr):
+        # 컬럼/파생 상수를 속성처럼 접근 (motors.rpm_no_load, motors.Kt, ...)
+        # copy/unpickle 중에는 슬롯이 비어 있으므로 재귀하지 않고 바로 실패
+        if attr in MotorSpecArray.__slots__:
+            raise AttributeError(attr)
+        for table in (self.columns, self.derived):
+            if attr in table:
+                return table[attr]
+        raise AttributeError(attr)
+
+    def batch_kwargs(self) -> dict:
+        """analyze_performance_batch()에 넘길 모터 파라미터"""
+        return {f: self.columns[f] for f in BATCH_MOTOR_FIELDS}
+
+    def nbytes(self) -> int:
+        """컬럼과 파생 상수 배열의 총 바이트 수"""
+        return sum(a.nbytes for a in self.columns.values()) + sum(a.nbytes for a in self.derived.values())
+
+
+# =============================================================================
+# 기어 강도 (Lewis 굽힘 / Hertz 접촉)
+# =============================================================================
+#
+# 치폭 b = FACE_WIDTH_FACTOR × m, 접선력 Ft = 2T / (m·z1)이므로 두 응력 모두
+# m³에 반비례합니다. 허용 응력을 만족하는 최소 m³를 구한 뒤 표준 모듈의 세제곱
+# 표에서 이분 탐색으로 가장 작은 통과 모듈을 고릅니다.
+# 모든 기어 종류를 압력각 20° 평기어 등가로 계산합니다 (헬리컬/웜의 비틀림각 무시).
+
+# 기어 재질: 종탄성 계수 [MPa], 푸아송비, 허용 굽힘/접촉 응력 [MPa], 밀도 [g/mm³]
+GearMaterial = namedtuple('GearMaterial', ['youngs_modulus', 'poisson', 'bending_allowable',
+                                           'contact_allowable', 'density'])
+
+GEAR_MATERIALS = {
+    'POM': GearMaterial(2800.0, 0.35, 35.0, 60.0, 1.41e-3),
+    'PA66': GearMaterial(3000.0, 0.40, 30.0, 55.0, 1.14e-3),
+    'brass': GearMaterial(100000.0, 0.34, 80.0, 300.0, 8.50e-3),
+    'steel': GearMaterial(206000.0, 0.30, 190.0, 550.0, 7.85e-3),
+}
+
+# 영역 계수 Z_H = √(2 / (sin α·cos α)), α = 20°
+ZONE_FACTOR = math.sqrt(2 / (math.sin(math.radians(20)) * math.cos(math.radians(20))))
+
+
+def lewis_form_factor(z):
+    """Lewis 치형 계수 Y = π(0.154 − 0.912/z) (모듈 기준, 스칼라 또는 배열)"""
+    return math.pi * (0.154 - 0.912 / z)
+
+
+def elastic_coefficient(material: GearMaterial) -> float:
+    """같은 재질 기어 쌍의 탄성 계수 Z_E [√MPa]"""
+    return math.sqrt(material.youngs_modulus / (2 * math.pi * (1 - material.poisson ** 2)))
+
+
+def required_module_cubed(torque_Nm, z_driving, z_driven, material: GearMaterial,
+                          face_width_factor: float, service_factor: float):
+    """
+    굽힘/접촉 허용 응력을 만족하는 최소 m³ [mm³] (스칼라 또는 배열)
+
+    Returns:
+        (굽힘 기준 m³, 접촉 기준 m³)
+        - 굽힘: σ_F = Ft / (b·m·Y)                ≤ σ_Fa (잇수가 적은 쪽 Y 사용)
+        - 접촉: σ_H = Z_E·Z_H·√(Ft·(u+1) / (b·d1·u)) ≤ σ_Ha (d1: 작은 기어, u ≥ 1)
+    """
+    # 구동 기어 토크 [N·mm] → Ft·m = 2T / z_driving
+    force_module = 2000.0 * service_factor * torque_Nm / z_driving
+    if isinstance(z_driving, (int, float)):
+        z_small, z_large = min(z_driving, z_driven), max(z_driving, z_driven)
+    else:
+        np = _require_numpy()
+        z_small, z_large = np.minimum(z_driving, z_driven), np.maximum(z_driving, z_driven)
+    u = z_large / z_small
+    bending = force_module / (face_width_factor * lewis_form_factor(z_small) * material.bending_allowable)
+    z_factor = elastic_coefficient(material) * ZONE_FACTOR / material.contact_allowable
+    contact = force_module * z_factor ** 2 * (u + 1) / (face_width_factor * z_small * u)
+    return bending, contact
+
+
+class GearTrainDesigner:
+    """기어 트레인 설계 클래스"""
+    
+    # 기어 종류별 일반적인 효율
+    GEAR_EFFICIENCY = {
+        'spur': 0.98,           # 평기어
+        'helical': 0.97,        # 헬리컬 기어
+        'bevel': 0.96,          # 베벨 기어
+        'worm': 0.75,           # 웜 기어 (자기 잠금 가능)
+        'planetary': 0.97,      # 유성 기어
+    }
+    
+    # 단일 단에서 권장 최대 기어비
+    MAX_RATIO_PER_STAGE = {
+        'spur': 6.0,
+        'helical': 8.0,
+        'bevel': 5.0,
+        'worm': 60.0,
+        'planetary': 10.0,
+    }
+    
+    # 표준 모듈 값 [mm]
+    STANDARD_MODULES = [0.3, 0.4, 0.5, 0.6, 0.8, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0]
+    
+    # 잇수 탐색 범위 (언더컷 방지 최소 잇수 ~ 최대 잇수)
+    MIN_TEETH = 12
+    MAX_TEETH = 100
+    
+    # 기어 종류별 최소 잇수 (헬리컬은 상당 평기어 잇수가 커서 더 적은 잇수 허용)
+    MIN_TEETH_PER_STAGE = {
+        'spur': 12,
+        'helical': 10,
+        'bevel': 12,
+        'worm': 12,
+        'planetary': 12,
+    }
+    
+    # 최적화 목적별 기본 허용 기어비 상대 오차
+    RATIO_TOLERANCE = {
+        'ratio': 1e-4,          # 이 이하의 오차는 동일하게 보고 크기로 비교
+        'size': 0.005,
+        'efficiency': 0.005,
+    }
+    
+    # 기어 치폭 계수 (치폭 b = 계수 × 모듈)
+    FACE_WIDTH_FACTOR = 10.0
+    
+    # 기어 재질 밀도 [g/mm³] (POM 기준)
+    GEAR_DENSITY = GEAR_MATERIALS['POM'].density
+    
+    # 모듈 선택 시 부하 토크에 곱하는 과부하(사용) 계수
+    SERVICE_FACTOR = 1.5
+    
+    def __init__(self, motor: DCMotorSpec, target: TargetSpec, 
+                 gear_type: str = 'spur', motor_efficiency: float = 0.85,
+                 material: str = 'POM'):
+        """
+        Args:
+            gear_type: 기어 종류, 또는 단별 기어 종류 목록(입력측 → 출력측, 예: ('worm', 'spur'))
+        """
+        self.motor = motor
+        self.target = target
+        self.gear_type = gear_type if isinstance(gear_type, str) else tuple(gear_type)
+        self.motor_efficiency = motor_efficiency
+        self.material = material
+        self.gear_stages: List[GearStage] = []
+        
+    def calculate_required_ratio(self) -> float:
+        """필요한 총 기어비 계산"""
+        return self.motor.rpm_no_load / self.target.rpm_output
+    
+    def calculate_required_motor_torque(self, total_ratio: float, total_efficiency: float) -> float:
+        """모터에 필요한 토크 계산 [Nm]"""
+        return self.target.torque_output_Nm / (total_ratio * total_efficiency)
+    
+    def design_gear_train(self, preferred_stages: int = None, objective: str = None,
+                          ratio_tolerance: float = None) -> List[GearStage]:
+        """
+        기어 트레인 자동 설계
+        
+        Args:
+            preferred_stages: 선호하는 기어 단수 (None이면 자동 결정)
+            objective: None이면 기본 방식(구동 기어 18치, 기어비 균등 분배),
+                'ratio' / 'size' / 'efficiency'이면 잇수 조합 최적화 탐색
+                - 'ratio': 기어비 오차 최소
+                - 'size': 허용 오차 내에서 잇수 합(기어 크기) 최소
+                - 'efficiency': 허용 오차 내에서 단수(효율 손실) 최소
+            ratio_tolerance: 허용 기어비 상대 오차 (None이면 RATIO_TOLERANCE 사용)
+        
+        단별 기어 종류 목록으로 만든 경우 단수는 목록 길이로 고정되고
+        잇수 조합 탐색(objective 기본 'ratio')으로 설계합니다.
+        이때 preferred_stages가 목록 길이와 다르면 ValueError가 발생합니다.
+        """
+        total_ratio = self.calculate_required_ratio()
+        
+        if total_ratio < 1:
+            print("⚠️ 경고: 기어비 < 1 (증속이 필요함). 모터 선택을 재검토하세요.")
+            return []
+        
+        if not isinstance(self.gear_type, str):
+            if preferred_stages and preferred_stages != len(self.gear_type):
+                raise ValueError(f"preferred_stages({preferred_stages})가 단별 기어 종류 수"
+                                 f"({len(self.gear_type)})와 다릅니다")
+            self.gear_stages = self._optimize_typed_train(
+                total_ratio, self.gear_type, objective or 'ratio', ratio_tolerance, fixed_sequence=True)
+            return self.gear_stages
+        
+        # 필요한 단수 결정
+        max_ratio = self.MAX_RATIO_PER_STAGE[self.gear_type]
+        if self.gear_type == 'planetary' and objective is None:
+            # 유성 기어: 조립 가능한 (선, 유성, 링) 표의 기어비 범위로 단수를 정하고 가장 가까운 조합 사용
+            table = planetary_stage_table(max_ratio, self.MIN_TEETH_PER_STAGE['planetary'], self.MAX_TEETH)
+            num_stages, index = planetary_stage_plan(table, total_ratio, preferred_stages)
+            self.gear_stages = self._build_stages(
+                [('planetary', table.driving[index], table.driven[index])] * num_stages)
+            return self.gear_stages
+        
+        if preferred_stages:
+            num_stages = preferred_stages
+        else:
+            num_stages = max(1, math.ceil(math.log(total_ratio) / math.log(max_ratio)))
+        
+        # 각 단의 기어비 균등 분배
+        ratio_per_stage = total_ratio ** (1 / num_stages)
+        
+        # 기어비가 너무 크면 단수 증가
+        while ratio_per_stage > max_ratio and num_stages < 5:
+            num_stages += 1
+            ratio_per_stage = total_ratio ** (1 / num_stages)
+        
+        if objective is not None:
+            self.gear_stages = self._optimize_gear_train(
+                total_ratio, num_stages, objective, ratio_tolerance,
+                fixed_stages=bool(preferred_stages))
+            return self.gear_stages
+        
+        # 기어 잇수 결정 (최소 12치)
+        teeth_driving = 18  # 구동 기어 기본 잇수
+        teeth_driven = round(teeth_driving * ratio_per_stage)
+        
+        # 모듈은 단별 부하 토크에 대한 강도 기준으로 선택
+        self.gear_stages = self._build_stages([(self.gear_type, teeth_driving, teeth_driven)] * num_stages)
+        return self.gear_stages
+    
+    def _optimize_gear_train(self, total_ratio: float, num_stages: int, objective: str,
+                             ratio_tolerance: Optional[float], fixed_stages: bool) -> List[GearStage]:
+        """잇수 조합 탐색으로 기어 단 구성 (design_gear_train의 최적화 모드)"""
+        if objective not in self.RATIO_TOLERANCE:
+            raise ValueError(f"알 수 없는 최적화 목적: {objective}")
+        if ratio_tolerance is None:
+            ratio_tolerance = self.RATIO_TOLERANCE[objective]
+        if self.gear_type == 'planetary':
+            # 유성 기어 표로 단수/잇수 탐색 (단수 고정이면 그 단수의 구성만)
+            if fixed_stages:
+                return self._optimize_typed_train(total_ratio, ('planetary',) * num_stages, objective,
+                                                  ratio_tolerance, fixed_sequence=True)
+            return self._optimize_typed_train(total_ratio, ('planetary',), objective, ratio_tolerance,
+                                              fixed_sequence=False)
+        teeth = optimize_tooth_counts(total_ratio, num_stages, objective, ratio_tolerance, fixed_stages,
+                                      self.MAX_RATIO_PER_STAGE[self.gear_type],
+                                      self.MIN_TEETH_PER_STAGE[self.gear_type], self.MAX_TEETH)
+        return self._build_stages([(self.gear_type, z1, z2) for z1, z2 in teeth])
+    
+    def design_mixed_gear_train(self, gear_types=None, objective: str = 'efficiency',
+                                ratio_tolerance: float = None, max_stages: int = 5) -> List[GearStage]:
+        """
+        단별 기어 종류를 섞은 기어 트레인 설계 (종류 구성 + 잇수 조합 탐색)
+        
+        종류 구성은 단당 최대 기어비가 큰 종류부터 입력측에 배치합니다 (예: 웜 → 평기어).
+        
+        Args:
+            gear_types: 사용할 수 있는 기어 종류 (None이면 전체)
+            objective: 'efficiency' (허용 오차 내 총 효율 최대, 같으면 잇수 합 최소)
+                / 'size' (허용 오차 내 잇수 합 최소)
+                / 'ratio' (기어비 오차 최소, 좁은 허용 오차 이하는 총 효율 최대)
+            ratio_tolerance: 허용 기어비 상대 오차 (None이면 RATIO_TOLERANCE 사용)
+            max_stages: 최대 단수
+        """
+        total_ratio = self.calculate_required_ratio()
+        if total_ratio < 1:
+            print("⚠️ 경고: 기어비 < 1 (증속이 필요함). 모터 선택을 재검토하세요.")
+            return []
+        self.gear_stages = self._optimize_typed_train(
+            total_ratio, tuple(gear_types or self.GEAR_EFFICIENCY), objective, ratio_tolerance,
+            fixed_sequence=False, max_stages=max_stages)
+        return self.gear_stages
+    
+    def _optimize_typed_train(self, total_ratio: float, gear_types: tuple, objective: str,
+                              ratio_tolerance: Optional[float], fixed_sequence: bool,
+                              max_stages: int = 5) -> List[GearStage]:
+        """단별 기어 종류 탐색 결과로 기어 단 구성"""
+        if objective not in self.RATIO_TOLERANCE:
+            raise ValueError(f"알 수 없는 최적화 목적: {objective}")
+        if ratio_tolerance is None:
+            ratio_tolerance = self.RATIO_TOLERANCE[objective]
+        for gear_type in gear_types:
+            if gear_type not in self.GEAR_EFFICIENCY:
+                raise KeyError(f"알 수 없는 기어 종류: {gear_type}")
+        codes = tuple(GEAR_TYPES.index(gear_type) for gear_type in gear_types)
+        typed_teeth = optimize_gear_types(total_ratio, codes, max_stages, objective, ratio_tolerance,
+                                          fixed_sequence, self.MAX_TEETH)
+        return self._build_stages([(GEAR_TYPES[code], z1, z2) for code, z1, z2 in typed_teeth])
+    
+    def _build_stages(self, typed_teeth) -> List[GearStage]:
+        """
+        단별 (기어 종류, 구동 잇수, 피동 잇수)로 기어 단 생성 (모듈은 강도 기준)
+
+        유성 기어 단은 (선, 링) 잇수로 받아 유성 기어 잇수/개수를 채운 PlanetaryStage가 됩니다.
+        """
+        meshes, ratios, efficiencies = [], [], []
+        for gear_type, z1, z2 in typed_teeth:
+            efficiencies.append(self.GEAR_EFFICIENCY[gear_type])
+            if gear_type == 'planetary':
+                planet = (z2 - z1) // 2
+                meshes.append((z1, planet, planet_count(z1, planet)))
+                ratios.append(1 + z2 / z1)
+            else:
+                meshes.append((z1, z2, 1))
+                ratios.append(z2 / z1)
+        
+        stages = []
+        for (gear_type, z1, z2), (_, planet, paths), ratio, efficiency, module in zip(
+                typed_teeth, meshes, ratios, efficiencies, self._select_modules(meshes, ratios, efficiencies)):
+            if gear_type == 'planetary':
+                stages.append(PlanetaryStage(ratio, efficiency, gear_type, z1, z2, module,
+                                             teeth_planet=planet, num_planets=paths))
+            else:
+                stages.append(GearStage(
+                    ratio=ratio,
+                    efficiency=efficiency,
+                    gear_type=gear_type,
+                    teeth_driving=z1,
+                    teeth_driven=z2,
+                    module=module
+                ))
+        return stages
+    
+    def _select_modules(self, meshes, ratios, efficiencies) -> List[float]:
+        """
+        단별 강도 기준 모듈 선택
+
+        analyze_performance()와 같은 필요 모터 토크에서 시작해 각 단 구동 기어의
+        입력 토크(앞 단들의 기어비 × 효율 누적)를 구하고, Lewis 굽힘 / Hertz 접촉
+        응력을 만족하는 가장 작은 표준 모듈을 고릅니다. 통과하는 모듈이 없으면
+        가장 큰 표준 모듈을 사용하고, analyze_performance()가 그 단을
+        gear_overstressed(설계 불가)로 보고합니다.
+
+        Args:
+            meshes: 단별 (구동 잇수, 맞물리는 기어 잇수, 하중 경로 수) 목록
+                - 유성 기어는 (선, 유성, 유성 기어 수)로 토크를 유성 기어 수만큼 나눔
+            ratios: 단별 기어비
+            efficiencies: 단별 효율
+        """
+        cubed = [m ** 3 for m in self.STANDARD_MODULES]
+        last = len(cubed) - 1
+        return [self.STANDARD_MODULES[min(bisect_left(cubed, required), last)]
+                for required in self._required_module_cubed(meshes, ratios, efficiencies)]
+    
+    def _required_module_cubed(self, meshes, ratios, efficiencies) -> List[float]:
+        """단별 굽힘/접촉 강도를 만족하는 최소 m³ [mm³] (_select_modules()와 같은 입력)"""
+        # get_total_ratio()/get_total_efficiency()와 같은 순서로 곱함
+        total_ratio = 1.0
+        total_efficiency = self.motor_efficiency
+        for ratio, efficiency in zip(ratios, efficiencies):
+            total_ratio *= ratio
+            total_efficiency *= efficiency
+        torque = self.calculate_required_motor_torque(total_ratio, total_efficiency)
+        
+        material = GEAR_MATERIALS[self.material]
+        required = []
+        for (z1, z2, paths), ratio, efficiency in zip(meshes, ratios, efficiencies):
+            bending, contact = required_module_cubed(torque / paths, z1, z2, material,
+                                                     self.FACE_WIDTH_FACTOR, self.SERVICE_FACTOR)
+            required.append(max(bending, contact))
+            torque *= ratio * efficiency
+        return required
+    
+    def overstressed_stages(self) -> List[int]:
+        """현재 모듈로 굽힘/접촉 허용 응력을 넘는 단 번호 (1부터, 입력측 → 출력측)"""
+        meshes = [(st.teeth_driving, st.teeth_planet, st.num_planets) if isinstance(st, PlanetaryStage)
+                  else (st.teeth_driving, st.teeth_driven, 1) for st in self.gear_stages]
+        required = self._required_module_cubed(meshes, [st.ratio for st in self.gear_stages],
+                                               [st.efficiency for st in self.gear_stages])
+        return [no for no, (stage, cubed) in enumerate(zip(self.gear_stages, required), 1)
+                if stage.module ** 3 < cubed]
+    
+    def get_total_ratio(self) -> float:
+        """총 기어비"""
+        if not self.gear_stages:
+            return 1.0
+        ratio = 1.0
+        for stage in self.gear_stages:
+            ratio *= stage.ratio
+        return ratio
+    
+    def get_total_efficiency(self) -> float:
+        """총 효율"""
+        if not self.gear_stages:
+            return 1.0
+        eff = self.motor_efficiency
+        for stage in self.gear_stages:
+            eff *= stage.efficiency
+        return eff
+    
+    def get_gearbox_volume(self) -> float:
+        """기어 부피 [mm³] (피치원 직경 × 치폭 원판 근사)"""
+        volume = 0.0
+        for stage in self.gear_stages:
+            face_width = self.FACE_WIDTH_FACTOR * stage.module
+            volume += math.pi / 4 * (stage.pitch_diameter_driving ** 2
+                                     + stage.pitch_diameter_driven ** 2) * face_width
+        return volume
+    
+    def get_total_weight(self) -> float:
+        """모터 + 기어 무게 [g]"""
+        return self.motor.weight + GEAR_MATERIALS[self.material].density * self.get_gearbox_volume()
+    
+    def analyze_performance(self) -> dict:
+        """성능 분석 (set_evaluation_cache()로 켜면 PERFORMANCE_CACHE를 거침)"""
+        if _EVALUATION_CACHE_ENABLED:
+            return cached_analyze_performance(self)
+        return self._analyze_performance()
+    
+    def _analyze_performance(self) -> dict:
+        """analyze_performance()의 계산 본체"""
+        total_ratio = self.get_total_ratio()
+        total_efficiency = self.get_total_efficiency()
+        
+        # 출력 측 성능
+        output_rpm = self.motor.rpm_no_load / total_ratio
+        
+        # 필요한 모터 토크
+        required_motor_torque = self.calculate_required_motor_torque(total_ratio, total_efficiency)
+        
+        # 모터 동작점 분석
+        if _EVALUATION_CACHE_ENABLED:
+            operating_point = cached_operating_point(self.motor, required_motor_torque)
+        else:
+            operating_point = self.motor.get_operating_point(required_motor_torque)
+        motor_rpm, motor_current, motor_power, motor_eff = operating_point
+        
+        # 실제 출력 계산
+        actual_output_rpm = motor_rpm / total_ratio
+        actual_output_torque = required_motor_torque * total_ratio * total_efficiency
+        actual_output_power = actual_output_torque * (actual_output_rpm * 2 * math.pi / 60)
+        
+        # 마진 계산
+        torque_margin = (self.motor.torque_stall_Nm - required_motor_torque) / self.motor.torque_stall_Nm * 100
+        
+        # 가장 큰 표준 모듈로도 강도가 부족한 단이 있으면 설계 불가
+        overstressed = bool(self.overstressed_stages())
+        
+        return {
+            'total_ratio': total_ratio,
+            'total_efficiency': total_efficiency,
+            'output_rpm_no_load': output_rpm,
+            'required_motor_torque_Nm': required_motor_torque,
+            'required_motor_torque_mNm': required_motor_torque * 1000,
+            'motor_operating_rpm': motor_rpm,
+            'motor_operating_current': motor_current,
+            'actual_output_rpm': actual_output_rpm,
+            'actual_output_torque_Nm': actual_output_torque,
+            'actual_output_torque_mNm': actual_output_torque * 1000,
+            'actual_output_power_W': actual_output_power,
+            'torque_margin_percent': torque_margin,
+            'system_efficiency': total_efficiency * motor_eff,
+            'gear_overstressed': overstressed,
+            'feasible': required_motor_torque <= self.motor.torque_stall_Nm * 0.8 and not overstressed
+        }
+
+
+# =============================================================================
+# 평가 결과 캐시 (LRU)
+# =============================================================================
+
+class EvaluationCache:
+    """
+    크기 제한 LRU 캐시 (적중/실패 횟수 집계)
+
+    반복 탐색에서 같은 입력의 계산 결과를 재사용합니다. 가장 오래 사용하지 않은
+    항목부터 제거하므로 장시간 실행되는 서비스에서도 메모리가 maxsize로 제한됩니다.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """key에 해당하는 값 반환, 없으면 compute()로 계산해 저장"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """최대 크기 변경 (초과분은 오래된 항목부터 제거)"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """항목과 통계 초기화"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data),
+                'maxsize': self.maxsize, 'hit_rate': self.hits / total if total else 0.0}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+OPERATING_POINT_CACHE = EvaluationCache(maxsize=4096)
+PERFORMANCE_CACHE = EvaluationCache(maxsize=4096)
+
+# True이면 GearTrainDesigner.analyze_performance()와 그 안의 모터 동작점 계산이
+# 위 캐시를 거칩니다 (반복 탐색/스윕/배치에서 set_evaluation_cache()로 켬)
+_EVALUATION_CACHE_ENABLED = False
+
+
+def set_evaluation_cache(enabled: bool = True, maxsize: int = None) -> None:
+    """
+    analyze_performance() 평가 캐시 사용 여부와 크기 설정
+
+    Args:
+        enabled: True면 analyze_performance()/동작점 계산이 캐시를 거침
+        maxsize: 지정하면 두 캐시의 최대 항목 수 변경
+    """
+    global _EVALUATION_CACHE_ENABLED
+    _EVALUATION_CACHE_ENABLED = enabled
+    if maxsize is not None:
+        OPERATING_POINT_CACHE.resize(maxsize)
+        PERFORMANCE_CACHE.resize(maxsize)
+
+
+def _motor_key(motor) -> tuple:
+    """
+    동작점 계산에 쓰이는 모터 파라미터만으로 만든 정규화 키
+
+    이름/치수/무게는 결과에 영향이 없으므로 제외합니다. int, float, NumPy 실수는
+    값이 같으면 해시와 비교 결과도 같으므로 별도 변환 없이 사용합니다.
+    """
+    return (motor.voltage_nominal, motor.current_no_load, motor.current_stall,
+            motor.rpm_no_load, motor.torque_stall)
+
+
+def cached_operating_point(motor, load_torque_Nm: float) -> Tuple[float, float, float, float]:
+    """OPERATING_POINT_CACHE를 거친 get_operating_point()"""
+    key = _motor_key(motor) + (load_torque_Nm,)
+    return OPERATING_POINT_CACHE.get(key, lambda: motor.get_operating_point(load_torque_Nm))
+
+
+def cached_analyze_performance(designer: GearTrainDesigner) -> dict:
+    """
+    PERFORMANCE_CACHE를 거친 analyze_performance()
+
+    키는 모터 파라미터, 목표 사양, 모터 효율, 기어 재질과 단별 (기어비, 효율, 잇수, 모듈,
+    하중 경로 수)이며 결과는 호출자가 수정해도 캐시에 영향이 없도록 복사본을 반환합니다.
+    """
+    key = (_motor_key(designer.motor), designer.target.rpm_output, designer.target.torque_output_Nm,
+           designer.motor_efficiency, designer.material,
+           tuple([(st.ratio, st.efficiency, st.teeth_driving, st.teeth_driven, st.module,
+                   getattr(st, 'num_planets', 1)) for st in designer.gear_stages]))
+    return dict(PERFORMANCE_CACHE.get(key, designer._analyze_performance))
+
+
+# =============================================================================
+# 잇수 조합 탐색 (분기 한정법)
+# =============================================================================
+
+# 단일 단 잇수 조합 표: ratios는 오름차순, driving/driven은 같은 인덱스의 잇수
+#   size_hull: (ln 기어비, 잇수 합) 점들의 아래쪽 볼록 껍질 (크기 하한용 SizeHull)
+RatioTable = namedtuple('RatioTable', ['ratios', 'driving', 'driven', 'min_teeth', 'size_hull'])
+
+# 아래쪽 볼록 껍질: 꼭짓점 x 오름차순 좌표와 y가 가장 작은 꼭짓점 인덱스
+SizeHull = namedtuple('SizeHull', ['x', 'y', 'lowest'])
+
+
+def _lower_hull(points) -> SizeHull:
+    """(x, y) 점들의 아래쪽 볼록 껍질 (같은 x는 최소 y만)"""
+    hull = []
+    for x, y in sorted(points):
+        if hull and hull[-1][0] == x:
+            continue
+        while len(hull) >= 2:
+            (x1, y1), (x2, y2) = hull[-2], hull[-1]
+            if (y2 - y1) * (x - x1) >= (y - y1) * (x2 - x1):
+                hull.pop()
+            else:
+                break
+        hull.append((x, y))
+    xs, ys = (tuple(col) for col in zip(*hull))
+    return SizeHull(xs, ys, ys.index(min(ys)))
+
+
+def _convolve_hulls(a: SizeHull, b: SizeHull) -> SizeHull:
+    """
+    두 단의 껍질 합성 (infimal convolution): H(x) = min{a(x1) + b(x2) : x1 + x2 = x}
+
+    볼록 구간 선형 함수끼리의 합성은 시작점을 더하고 두 함수의 선분을 기울기 순으로
+    이어 붙인 것과 같습니다. 여러 단을 차례로 합성하면 그 단들의 잇수 합 하한이 됩니다.
+    """
+    segments = sorted(
+        ((y2 - y1) / (x2 - x1), x2 - x1, y2 - y1)
+        for hull in (a, b) for x1, x2, y1, y2 in zip(hull.x, hull.x[1:], hull.y, hull.y[1:]))
+    x, y = a.x[0] + b.x[0], a.y[0] + b.y[0]
+    xs, ys = [x], [y]
+    for _, dx, dy in segments:
+        x += dx
+        y += dy
+        xs.append(x)
+        ys.append(y)
+    return SizeHull(tuple(xs), tuple(ys), ys.index(min(ys)))
+
+
+def _stages_size_hull(tables) -> SizeHull:
+    """단별 표 껍질을 모두 합성한 잇수 합 하한 함수 (ln 총 기어비 → 잇수 합)"""
+    hull = tables[0].size_hull
+    for table in tables[1:]:
+        hull = _convolve_hulls(hull, table.size_hull)
+    return hull
+
+
+def _table_size_hull(ratios, driving, driven) -> SizeHull:
+    """잇수 조합 표의 (ln 기어비, 잇수 합) 아래쪽 볼록 껍질"""
+    return _lower_hull((math.log(r), z1 + z2) for r, z1, z2 in zip(ratios, driving, driven))
+
+
+def hull_size_bound(hull: SizeHull, ratio_low: float, ratio_high: float) -> float:
+    """
+    기어비(곱)가 [ratio_low, ratio_high] 안에 있을 때 잇수 합 하한
+
+    hull은 _stages_size_hull()로 합성한 볼록 함수이고 단조가 아니므로
+    구간 [ln ratio_low, ln ratio_high]에서의 최솟값을 씁니다.
+    """
+    xs, ys, lowest = hull
+    x_lo = max(math.log(ratio_low), xs[0])
+    x_hi = min(math.log(ratio_high), xs[-1])
+    x_min = xs[lowest]
+    if x_lo > x_hi or x_lo <= x_min <= x_hi:
+        return ys[lowest]
+    if x_min < x_lo:
+        x = x_lo
+        i = min(bisect_right(xs, x, lowest), len(xs) - 1)
+    else:
+        x = x_hi
+        i = max(bisect_right(xs, x, 0, lowest), 1)
+    x1, x2, y1, y2 = xs[i - 1], xs[i], ys[i - 1], ys[i]
+    return y1 + (y2 - y1) * (x - x1) / (x2 - x1)
+
+
+@lru_cache(maxsize=None)
+def stage_ratio_table(max_ratio: float, min_teeth: int, max_teeth: int) -> RatioTable:
+    """
+    단일 단에서 가능한 잇수 조합 표 (기어비 오름차순, 캐시됨)
+
+    약분했을 때 같은 기어비가 되는 조합 중 잇수 합이 가장 작은 쌍만 남깁니다.
+    """
+    best = {}
+    for z1 in range(min_teeth, max_teeth + 1):
+        z2_max = min(max_teeth, math.floor(z1 * max_ratio))
+        for z2 in range(z1 + 1, z2_max + 1):
+            g = math.gcd(z1, z2)
+            best.setdefault((z1 // g, z2 // g), (z1, z2))   # z1 오름차순이므로 첫 조합이 최소
+    rows = sorted((z2 / z1, z1, z2) for z1, z2 in best.values())
+    ratios, driving, driven = (tuple(col) for col in zip(*rows))
+    return RatioTable(
+        ratios=ratios,
+        driving=driving,
+        driven=driven,
+        min_teeth=min_teeth,
+        size_hull=_table_size_hull(ratios, driving, driven),
+    )
+
+
+def search_tooth_counts(target_ratio: float, tables: List[RatioTable], objective: str = 'ratio',
+                        tolerance: float = 1e-6):
+    """
+    단별 잇수 조합 분기 한정(branch-and-bound) 탐색
+
+    - 같은 표를 쓰는 연속된 단은 기어비 오름차순으로만 탐색 (순서만 다른 중복 제거)
+    - 남은 단들의 최소/최대 기어비 곱으로 현재 단의 기어비 구간을 이분 탐색으로 한정
+    - 남은 단 표들의 (ln 기어비, 잇수 합) 볼록 껍질을 합성한 함수로 크기 하한을 계산해 가지치기
+    - 마지막 단은 표에서 이분 탐색으로 바로 결정
+
+    Args:
+        target_ratio: 목표 총 기어비
+        tables: 단별 잇수 조합 표 (입력측 → 출력측)
+        objective: 'ratio' (기어비 오차 최소, tolerance 이하 오차는 잇수 합으로 비교)
+            또는 'size' (오차 tolerance 이내에서 잇수 합 최소)
+        tolerance: 허용 기어비 상대 오차
+
+    Returns:
+        (상대 오차, 잇수 합, [(구동 잇수, 피동 잇수), ...]) 또는 조건을 만족하는 조합이 없으면 None
+    """
+    n = len(tables)
+    if n == 0:
+        return None
+    if objective == 'ratio' and tolerance > 0:
+        # 허용 오차 안의 조합이 있으면 최선해는 'size' 탐색 결과와 같음 (구간 한정이 더 강함)
+        result = search_tooth_counts(target_ratio, tables, 'size', tolerance)
+        if result is not None:
+            return result
+    # 뒤쪽 단들의 기어비 곱 범위와 최소 잇수
+    suffix_min = [1.0] * (n + 1)
+    suffix_max = [1.0] * (n + 1)
+    suffix_hull = [None] * (n + 1)    # 뒤쪽 단 껍질의 합성 (잇수 합 하한)
+    for i in reversed(range(n)):
+        suffix_min[i] = suffix_min[i + 1] * tables[i].ratios[0]
+        suffix_max[i] = suffix_max[i + 1] * tables[i].ratios[-1]
+        suffix_hull[i] = (tables[i].size_hull if i + 1 == n
+                          else _convolve_hulls(tables[i].size_hull, suffix_hull[i + 1]))
+
+    best = None             # (비교 키, 오차, 잇수 합, 단별 인덱스)
+    chosen = []
+
+    def key_of(error, size):
+        if objective == 'size':
+            return (size, error)
+        return (max(error, tolerance), size, error)
+
+    def error_window():
+        # 현재 최선해보다 나아질 수 있는 최대 오차
+        if objective == 'size':
+            return tolerance
+        if best is None:
+            return math.inf
+        return max(best[1], tolerance)
+
+    def size_pruned(size, depth, ratio_left):
+        # 잇수 합 size + depth번 이후 단의 하한이 최선해 이상이면 가지치기
+        # (남은 단의 기어비 곱은 ratio_left × (1 ± tolerance) 안, 가지치기는 그때만 적용)
+        if best is None:
+            return False
+        if objective == 'ratio' and best[1] > tolerance:
+            return False
+        if depth == n:
+            return size >= best[2]
+        hull = suffix_hull[depth]
+        if size + hull.y[hull.lowest] >= best[2]:
+            return True
+        # 부동소수점 오차로 최적해가 잘리지 않도록 약간 낮춤
+        return size + hull_size_bound(hull, ratio_left * max(1 - tolerance, 1e-12),
+                                      ratio_left * (1 + tolerance)) - 1e-9 >= best[2]
+
+    def consider(ratio, size, last_index):
+        nonlocal best
+        error = abs(ratio / target_ratio - 1)
+        if objective == 'size' and error > tolerance:
+            return
+        key = key_of(error, size)
+        if best is None or key < best[0]:
+            best = (key, error, size, chosen + [last_index])
+
+    def finish(depth, ratio, size, lo):
+        # 마지막 단: 허용 오차 구간에서 최소 크기, 없으면 가장 가까운 기어비
+        table = tables[depth]
+        ratios = table.ratios
+        ratio_left = target_ratio / ratio
+        i0 = max(lo, bisect_left(ratios, ratio_left * (1 - tolerance)))
+        i1 = bisect_right(ratios, ratio_left * (1 + tolerance))
+        if i0 < i1:
+            for i in range(i0, i1):
+                consider(ratio * ratios[i], size + table.driving[i] + table.driven[i], i)
+        elif objective == 'ratio':
+            pos = bisect_left(ratios, ratio_left)
+            for i in (pos - 1, pos):
+                if lo <= i < len(ratios):
+                    consider(ratio * ratios[i], size + table.driving[i] + table.driven[i], i)
+
+    def visit(depth, ratio, size, lo):
+        if depth == n - 1:
+            finish(depth, ratio, size, lo)
+            return
+        table = tables[depth]
+        ratios = table.ratios
+        ratio_left = target_ratio / ratio
+        k = n - depth
+        symmetric = tables[depth + 1] is table
+
+        # 기하 평균에 가까운 기어비부터 양쪽으로 탐색
+        center = bisect_left(ratios, ratio_left ** (1 / k))
+        left, right = center - 1, max(center, lo)
+        while True:
+            window = error_window()
+            low = ratio_left * max(0.0, 1 - window) / suffix_max[depth + 1]
+            high = ratio_left * (1 + window) / suffix_min[depth + 1]
+            if symmetric:
+                high = min(high, (ratio_left * (1 + window)) ** (1 / k))
+            left_ok = left >= lo and ratios[left] >= low
+            right_ok = right < len(ratios) and ratios[right] <= high
+            if not (left_ok or right_ok):
+                break
+            if left_ok and (not right_ok or
+                            ratio_left ** (1 / k) / ratios[left] < ratios[right] / ratio_left ** (1 / k)):
+                i, left = left, left - 1
+            else:
+                i, right = right, right + 1
+            r = ratios[i]
+            stage_size = size + table.driving[i] + table.driven[i]
+            if size_pruned(stage_size, depth + 1, ratio_left / r):
+                continue
+            chosen.append(i)
+            visit(depth + 1, ratio * r, stage_size, i if symmetric else 0)
+            chosen.pop()
+
+    visit(0, 1.0, 0, 0)
+    if best is None:
+        return None
+    pairs = [(tables[d].driving[i], tables[d].driven[i]) for d, i in enumerate(best[3])]
+    return best[1], best[2], pairs
+
+
+@lru_cache(maxsize=4096)
+def optimize_tooth_counts(total_ratio: float, num_stages: int, objective: str, ratio_tolerance: float,
+                          fixed_stages: bool, max_ratio: float, min_teeth: int,
+                          max_teeth: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    GearTrainDesigner 최적화 모드의 단수/잇수 결정 (동일 기어비 반복 요청은 캐시 재사용)
+    
+    Returns:
+        ((z1, z2), ...) 단별 잇수
+    """
+    table = stage_ratio_table(max_ratio, min_teeth, max_teeth)
+    if not fixed_stages:
+        # 잇수 범위 때문에 단당 기어비가 MAX_RATIO_PER_STAGE보다 작을 수 있음
+        num_stages = max(num_stages, math.ceil(math.log(total_ratio) / math.log(table.ratios[-1])))
+    
+    # 'ratio'는 기본 단수 고정, 'size'/'efficiency'는 단수를 늘려가며 탐색
+    if fixed_stages or objective == 'ratio':
+        stage_counts = [num_stages]
+    else:
+        stage_counts = range(num_stages, max(num_stages, 5) + 1)
+    
+    best = None
+    for count in stage_counts:
+        result = search_tooth_counts(total_ratio, [table] * count, 'size' if objective != 'ratio' else 'ratio',
+                                     ratio_tolerance)
+        if result is None:
+            continue
+        if best is None or (objective == 'size' and result[1] < best[1]):
+            best = result
+        if objective == 'efficiency':
+            break   # 가장 적은 단수 = 가장 높은 효율
+    if best is None:
+        # 허용 오차를 만족하는 조합이 없으면 오차 최소 조합 사용
+        best = search_tooth_counts(total_ratio, [table] * num_stages, 'ratio', 0.0)
+    return tuple(best[2])
+
+
+# =============================================================================
+# 유성 기어 단 (선/유성/링 잇수 표)
+# =============================================================================
+#
+# 링 기어 고정, 선기어 입력, 캐리어 출력 기준:
+#   - 동심 조건: 링 = 선 + 2 × 유성,  기어비 = 1 + 링/선
+#   - 등간격 조립: (선 + 링) % 유성 수 == 0
+#   - 인접 간섭: 이웃 유성 기어 중심 거리 > 유성 기어 이끝원 지름
+#                (선 + 유성)·sin(π/n) > 유성 + 2
+# 조립 가능한 조합을 기어비 오름차순 표로 한 번 만들어 두고(캐시),
+# 단 선택은 표에서 이분 탐색으로 처리합니다.
+
+# 검토하는 유성 기어 수 (조립 가능하면 하중 분담이 큰 많은 쪽 선택)
+PLANET_COUNTS = (3, 4, 5, 6)
+
+# 기본 설계에서 단을 추가해 보는 총 기어비 상대 오차 / 단수 증가 상한
+PLANETARY_RATIO_TOLERANCE = 0.01
+PLANETARY_MAX_STAGES = 5
+
+# 유성 기어 잇수 표: RatioTable 필드(driving = 선, driven = 링) + 유성 잇수/개수
+#   유성 잇수 하한 때문에 낮은 기어비는 큰 선기어가 필요하므로, 크기 하한은
+#   표의 실제 (ln 기어비, 선 + 링) 볼록 껍질(size_hull)로 계산합니다.
+PlanetaryTable = namedtuple('PlanetaryTable', RatioTable._fields + ('planet', 'planets'))
+
+
+def planet_count(sun: int, planet: int, counts=PLANET_COUNTS) -> int:
+    """등간격 조립과 인접 간섭 조건을 만족하는 최대 유성 기어 수 (없으면 0)"""
+    ring = sun + 2 * planet
+    for n in reversed(counts):
+        if (sun + ring) % n == 0 and (sun + planet) * math.sin(math.pi / n) > planet + 2:
+            return n
+    return 0
+
+
+@lru_cache(maxsize=None)
+def planetary_stage_table(max_ratio: float, min_teeth: int, max_teeth: int) -> PlanetaryTable:
+    """
+    조립 가능한 유성 기어 단 표 (기어비 오름차순, 캐시됨)
+
+    같은 기어비(약분 기준)의 조합 중 링 잇수가 가장 작고, 같으면 유성 기어 수가
+    많은 조합만 남깁니다. 링 잇수는 max_teeth 이하입니다.
+    """
+    best = {}
+    for sun in range(min_teeth, max_teeth + 1):
+        for planet in range(min_teeth, (max_teeth - sun) // 2 + 1):
+            ring = sun + 2 * planet
+            if (sun + ring) / sun > max_ratio:
+                continue
+            n = planet_count(sun, planet)
+            if not n:
+                continue
+            g = math.gcd(sun + ring, sun)
+            key = ((sun + ring) // g, sun // g)
+            entry = (ring, -n, sun, planet)
+            if key not in best or entry < best[key]:
+                best[key] = entry
+    rows = sorted((1 + ring / sun, sun, ring, planet, -neg_n) for ring, neg_n, sun, planet in best.values())
+    ratios, driving, driven, planet, planets = (tuple(col) for col in zip(*rows))
+    return PlanetaryTable(
+        ratios=ratios,
+        driving=driving,
+        driven=driven,
+        min_teeth=min(driving),
+        size_hull=_table_size_hull(ratios, driving, driven),
+        planet=planet,
+        planets=planets,
+    )
+
+
+def planetary_stage_index(table: PlanetaryTable, ratio: float) -> int:
+    """표에서 기어비가 가장 가까운 조합의 인덱스 (같은 거리면 작은 쪽)"""
+    ratios = table.ratios
+    pos = bisect_left(ratios, ratio)
+    if pos == len(ratios) or (pos > 0 and ratio - ratios[pos - 1] <= ratios[pos] - ratio):
+        return pos - 1
+    return pos
+
+
+def planetary_stage_index_batch(table: PlanetaryTable, ratio):
+    """planetary_stage_index()의 벡터화 버전"""
+    np = _require_numpy()
+    ratios = np.asarray(table.ratios)
+    ratio = np.asarray(ratio, dtype=np.float64)
+    pos = np.searchsorted(ratios, ratio, side='left')
+    lower = np.maximum(pos - 1, 0)
+    upper = np.minimum(pos, ratios.size - 1)
+    take_lower = (pos == ratios.size) | ((pos > 0) & (ratio - ratios[lower] <= ratios[upper] - ratio))
+    return np.where(take_lower, lower, upper)
+
+
+def planetary_stage_plan(table: PlanetaryTable, total_ratio: float, preferred_stages: int = None,
+                         tolerance: float = PLANETARY_RATIO_TOLERANCE) -> Tuple[int, int]:
+    """
+    같은 유성 기어 단을 반복하는 기본 설계의 (단수, 표 인덱스)
+
+    단수는 표의 최대 기어비로 필요한 최소 단수부터, 단당 기어비가 표의 최소 기어비
+    이상인 범위(최대 PLANETARY_MAX_STAGES)에서 늘려 가며 단당 기어비를 표에 맞춘 뒤
+    총 기어비 오차가 tolerance 이하인 첫 단수를 고릅니다 (없으면 오차가 가장 작은 단수).
+    preferred_stages를 주면 그 단수로 고정합니다.
+    """
+    lo, hi = table.ratios[0], table.ratios[-1]
+    if preferred_stages:
+        first = last = preferred_stages
+    else:
+        first = max(1, math.ceil(math.log(total_ratio) / math.log(hi)))
+        last = max(first, min(PLANETARY_MAX_STAGES, math.floor(math.log(total_ratio) / math.log(lo))))
+    best = None
+    for num_stages in range(first, last + 1):
+        index = planetary_stage_index(table, total_ratio ** (1 / num_stages))
+        error = abs(table.ratios[index] ** num_stages / total_ratio - 1)
+        if best is None or error < best[0] or error <= tolerance:
+            best = (error, num_stages, index)
+        if error <= tolerance:
+            break
+    return best[1], best[2]
+
+
+def planetary_stage_plan_batch(table: PlanetaryTable, total_ratio, preferred_stages=None,
+                               tolerance: float = PLANETARY_RATIO_TOLERANCE):
+    """planetary_stage_plan()의 벡터화 버전 → (단수, 표 인덱스) 배열"""
+    np = _require_numpy()
+    ratios = np.asarray(table.ratios)
+    total_ratio = np.asarray(total_ratio, dtype=np.float64)
+    first = np.maximum(1, np.ceil(np.log(total_ratio) / np.log(ratios[-1]))).astype(np.int64)
+    last = np.maximum(first, np.minimum(PLANETARY_MAX_STAGES,
+                                        np.floor(np.log(total_ratio) / np.log(ratios[0])))).astype(np.int64)
+    if preferred_stages is not None:
+        preferred = np.broadcast_to(np.asarray(preferred_stages, dtype=np.int64), total_ratio.shape)
+        first = np.where(preferred > 0, preferred, first)
+        last = np.where(preferred > 0, preferred, last)
+
+    num_stages = first.copy()
+    index = np.zeros(total_ratio.shape, dtype=np.intp)
+    best_error = np.full(total_ratio.shape, np.inf)
+    done = np.zeros(total_ratio.shape, dtype=bool)
+    for n in range(int(first.min(initial=1)), int(last.max(initial=0)) + 1):
+        active = (first <= n) & (n <= last) & ~done
+        if not active.any():
+            continue
+        candidate = planetary_stage_index_batch(table, total_ratio ** (1 / n))
+        error = np.abs(ratios[candidate] ** n / total_ratio - 1)
+        within = error <= tolerance
+        take = active & ((error < best_error) | within)
+        num_stages[take] = n
+        index[take] = candidate[take]
+        best_error[take] = error[take]
+        done |= active & within
+    return num_stages, index
+
+
+# =============================================================================
+# 배치 설계 (NumPy 벡터화)
+# =============================================================================
+#
+# 수천 개의 모터 × 목표 사양 × 기어 종류 조합을 한 번에 평가하기 위한 API.
+# GearTrainDesigner.design_gear_train() / analyze_performance()와 동일한 식을
+# 배열 단위로 계산하며, 출력 메시지(print)는 없습니다.
+
+# 기어 종류 코드 (배치 API에서 정수 인덱스로 사용)
+GEAR_TYPES = tuple(GearTrainDesigner.GEAR_EFFICIENCY)
+GEAR_TYPE_EFFICIENCY = tuple(GearTrainDesigner.GEAR_EFFICIENCY[t] for t in GEAR_TYPES)
+GEAR_TYPE_MAX_RATIO = tuple(GearTrainDesigner.MAX_RATIO_PER_STAGE[t] for t in GEAR_TYPES)
+GEAR_TYPE_MIN_TEETH = tuple(GearTrainDesigner.MIN_TEETH_PER_STAGE[t] for t in GEAR_TYPES)
+
+# design_gear_train()의 기본 구동 기어 잇수 / 최대 단수
+DEFAULT_TEETH_DRIVING = 18
+MAX_STAGES = 5
+PLANETARY_CODE = GEAR_TYPES.index('planetary')
+
+
+def default_planetary_table() -> PlanetaryTable:
+    """design_gear_train()의 유성 기어 단 표 (GearTrainDesigner 기본 잇수 범위)"""
+    return planetary_stage_table(GEAR_TYPE_MAX_RATIO[PLANETARY_CODE], GEAR_TYPE_MIN_TEETH[PLANETARY_CODE],
+                                 GearTrainDesigner.MAX_TEETH)
+
+# analyze_performance()가 반환하는 필드 (순서 동일)
+PERFORMANCE_FIELDS = (
+    'total_ratio',
+    'total_efficiency',
+    'output_rpm_no_load',
+    'required_motor_torque_Nm',
+    'required_motor_torque_mNm',
+    'motor_operating_rpm',
+    'motor_operating_current',
+    'actual_output_rpm',
+    'actual_output_torque_Nm',
+    'actual_output_torque_mNm',
+    'actual_output_power_W',
+    'torque_margin_percent',
+    'system_efficiency',
+    'gear_overstressed',
+    'feasible',
+)
+
+
+def _require_numpy():
+    """NumPy 지연 임포트 (배치 기능에서만 필요)"""
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError("배치 계산에는 NumPy가 필요합니다: pip install numpy") from exc
+    return numpy
+
+
+def performance_dtype():
+    """analyze_performance() 필드와 동일한 구조화 배열 dtype"""
+    np = _require_numpy()
+    return np.dtype([(name, np.bool_ if name in ('gear_overstressed', 'feasible') else np.float64)
+                     for name in PERFORMANCE_FIELDS])
+
+
+def gear_type_codes(gear_type):
+    """기어 종류(문자열, 문자열 배열 또는 정수 코드)를 GEAR_TYPES 인덱스 배열로 변환"""
+    np = _require_numpy()
+    if isinstance(gear_type, str):
+        return np.asarray(GEAR_TYPES.index(gear_type), dtype=np.intp)
+    names = np.asarray(gear_type)
+    if names.dtype.kind not in 'USO':
+        return names.astype(np.intp)
+    codes = np.full(names.shape, -1, dtype=np.intp)
+    for code, name in enumerate(GEAR_TYPES):
+        codes[names == name] = code
+    if (codes < 0).any():
+        unknown = sorted(set(names[codes < 0].tolist()))
+        raise KeyError(f"알 수 없는 기어 종류: {unknown}")
+    return codes
+
+
+# analyze_performance_batch()가 받는 모터 파라미터
+BATCH_MOTOR_FIELDS = ('voltage_nominal', 'current_no_load', 'current_stall', 'rpm_no_load', 'torque_stall')
+
+
+def motor_spec_arrays(motors: List[DCMotorSpec], fields=BATCH_MOTOR_FIELDS) -> dict:
+    """DCMotorSpec 목록을 배치 API용 파라미터 배열로 변환"""
+    np = _require_numpy()
+    return {f: np.array([getattr(m, f) for m in motors], dtype=np.float64) for f in fields}
+
+
+def target_spec_arrays(targets: List[TargetSpec]) -> dict:
+    """TargetSpec 목록을 배치 API용 파라미터 배열로 변환"""
+    np = _require_numpy()
+    fields = ('rpm_output', 'torque_output_Nm')
+    return {f: np.array([getattr(t, f) for t in targets], dtype=np.float64) for f in fields}
+
+
+# 한 번에 계산하는 행 수 (중간 배열이 CPU 캐시에 머물도록 분할)
+BATCH_CHUNK_SIZE = 16384
+
+
+def _broadcast_flat(*arrays):
+    """인자들을 공통 형상으로 브로드캐스트한 뒤 1차원으로 펼침"""
+    np = _require_numpy()
+    arrays = np.broadcast_arrays(*arrays)
+    shape = arrays[0].shape
+    return shape, [a.reshape(-1) for a in arrays]
+
+
+def design_gear_train_batch(rpm_no_load, rpm_output, gear_type='spur', preferred_stages=None):
+    """
+    design_gear_train()의 벡터화 버전
+
+    Args:
+        rpm_no_load: 모터 무부하 회전수 배열 [RPM]
+        rpm_output: 목표 출력 회전수 배열 [RPM]
+        gear_type: 기어 종류 (문자열, 배열 또는 GEAR_TYPES 코드)
+        preferred_stages: 선호 단수 (None 또는 0이면 자동 결정)
+
+    Returns:
+        (num_stages, stage_ratio) - 단수 0은 기어비 < 1로 기어 없음을 의미
+    """
+    np = _require_numpy()
+    codes = gear_type_codes(gear_type)
+    max_ratio = np.asarray(GEAR_TYPE_MAX_RATIO)[codes]
+    total_ratio = np.asarray(rpm_no_load, dtype=np.float64) / np.asarray(rpm_output, dtype=np.float64)
+    total_ratio, max_ratio, codes = np.broadcast_arrays(total_ratio, max_ratio, codes)
+    no_gear = total_ratio < 1
+
+    # 필요한 단수 결정
+    safe_ratio = np.where(no_gear, 1.0, total_ratio)
+    num_stages = np.maximum(1, np.ceil(np.log(safe_ratio) / np.log(max_ratio))).astype(np.int64)
+    if preferred_stages is not None:
+        preferred = np.asarray(preferred_stages, dtype=np.int64)
+        num_stages = np.where(preferred > 0, preferred, num_stages)
+
+    # 각 단의 기어비 균등 분배, 기어비가 너무 크면 단수 증가
+    ratio_per_stage = safe_ratio ** (1.0 / num_stages)
+    for _ in range(MAX_STAGES):
+        bump = (ratio_per_stage > max_ratio) & (num_stages < MAX_STAGES)
+        if not bump.any():
+            break
+        num_stages = num_stages + bump
+        ratio_per_stage = safe_ratio ** (1.0 / num_stages)
+
+    teeth_driven = np.round(DEFAULT_TEETH_DRIVING * ratio_per_stage)
+    stage_ratio = teeth_driven / DEFAULT_TEETH_DRIVING
+
+    # 유성 기어는 조립 가능한 (선, 유성, 링) 표의 기어비 범위로 단수와 조합 결정
+    planetary = codes == PLANETARY_CODE
+    if planetary.any():
+        table = default_planetary_table()
+        preferred = None if preferred_stages is None else np.broadcast_to(
+            np.asarray(preferred_stages, dtype=np.int64), codes.shape)[planetary]
+        planetary_stages, index = planetary_stage_plan_batch(table, safe_ratio[planetary], preferred)
+        num_stages, stage_ratio = num_stages.copy(), stage_ratio.copy()
+        num_stages[planetary] = planetary_stages
+        stage_ratio[planetary] = np.asarray(table.ratios)[index]
+    return np.where(no_gear, 0, num_stages), np.where(no_gear, 1.0, stage_ratio)
+
+
+def select_modules_batch(stage_torque_Nm, teeth_driving, teeth_driven, material='POM', modules=None):
+    """
+    GearTrainDesigner._select_modules()의 벡터화 버전 (단 × 설계 배열을 한 번에)
+
+    Args:
+        stage_torque_Nm: 각 단 구동 기어의 입력 토크 배열 [Nm]
+        teeth_driving, teeth_driven: 잇수 배열 (브로드캐스트 가능)
+        material: GEAR_MATERIALS 키
+        modules: 후보 모듈 (오름차순, None이면 STANDARD_MODULES)
+
+    Returns:
+        (통과하는 가장 작은 모듈 배열 [mm] (없으면 가장 큰 후보), 통과하는 후보가 없는지 여부 배열)
+    """
+    np = _require_numpy()
+    table = np.asarray(GearTrainDesigner.STANDARD_MODULES if modules is None else modules,
+                       dtype=np.float64)
+    bending, contact = required_module_cubed(
+        np.asarray(stage_torque_Nm, dtype=np.float64), np.asarray(teeth_driving, dtype=np.float64),
+        np.asarray(teeth_driven, dtype=np.float64), GEAR_MATERIALS[material],
+        GearTrainDesigner.FACE_WIDTH_FACTOR, GearTrainDesigner.SERVICE_FACTOR)
+    index = np.searchsorted(table ** 3, np.maximum(bending, contact), side='left')
+    return table[np.minimum(index, table.size - 1)], index == table.size
+
+
+def _default_stage_teeth(code_idx, stage_ratio):
+    """
+    design_gear_train() 기본 방식의 단별 잇수 배열
+
+    Returns:
+        (구동 잇수, 피동 잇수, 강도 계산용 맞물림 잇수, 하중 경로 수)
+        - 기본 구동 18치, 유성 기어는 표의 (선, 링, 유성)과 유성 기어 수만큼 하중 분담
+    """
+    np = _require_numpy()
+    teeth_driving = np.full(stage_ratio.shape, float(DEFAULT_TEETH_DRIVING))
+    teeth_driven = stage_ratio * DEFAULT_TEETH_DRIVING
+    teeth_mating = teeth_driven.copy()
+    load_paths = np.ones(stage_ratio.shape)
+    planetary = code_idx == PLANETARY_CODE
+    if planetary.any():
+        table = default_planetary_table()
+        index = planetary_stage_index_batch(table, stage_ratio[planetary])
+        teeth_driving[planetary] = np.asarray(table.driving)[index]
+        teeth_driven[planetary] = np.asarray(table.driven)[index]
+        teeth_mating[planetary] = np.asarray(table.planet)[index]
+        load_paths[planetary] = np.asarray(table.planets)[index]
+    return teeth_driving, teeth_driven, teeth_mating, load_paths
+
+
+def _evaluate_chunk(out, voltage_nominal, current_no_load, current_stall, rpm_no_load,
+                    torque_stall, torque_output_Nm, total_ratio, total_efficiency):
+    """evaluate_performance_batch()의 1차원 분할 계산 (결과를 out에 기록)"""
+    np = _require_numpy()
+    torque_stall_Nm = torque_stall / 1000
+    required = torque_output_Nm / (total_ratio * total_efficiency)
+
+    # 모터 동작점 (get_operating_point와 동일한 선형 모델)
+    stalled = required > torque_stall_Nm
+    load_fraction = required / torque_stall_Nm
+    motor_rpm = np.where(stalled, 0.0, rpm_no_load * (1 - load_fraction))
+    motor_current = np.where(stalled, current_stall,
+                             current_no_load + (current_stall - current_no_load) * load_fraction)
+    power_mech = required * (motor_rpm * 2 * math.pi / 60)
+    power_elec = voltage_nominal * motor_current
+    with np.errstate(divide='ignore', invalid='ignore'):
+        motor_eff = np.where(stalled | (power_elec <= 0), 0.0, power_mech / power_elec)
+
+    actual_output_rpm = motor_rpm / total_ratio
+    actual_output_torque = required * total_ratio * total_efficiency
+    out['total_ratio'] = total_ratio
+    out['total_efficiency'] = total_efficiency
+    out['output_rpm_no_load'] = rpm_no_load / total_ratio
+    out['required_motor_torque_Nm'] = required
+    out['required_motor_torque_mNm'] = required * 1000
+    out['motor_operating_rpm'] = motor_rpm
+    out['motor_operating_current'] = motor_current
+    out['actual_output_rpm'] = actual_output_rpm
+    out['actual_output_torque_Nm'] = actual_output_torque
+    out['actual_output_torque_mNm'] = actual_output_torque * 1000
+    out['actual_output_power_W'] = actual_output_torque * (actual_output_rpm * 2 * math.pi / 60)
+    out['torque_margin_percent'] = (torque_stall_Nm - required) / torque_stall_Nm * 100
+    out['system_efficiency'] = total_efficiency * motor_eff
+    out['gear_overstressed'] = False
+    out['feasible'] = required <= torque_stall_Nm * 0.8
+
+
+def evaluate_performance_batch(voltage_nominal, current_no_load, current_stall, rpm_no_load,
+                               torque_stall, torque_output_Nm, total_ratio, total_efficiency):
+    """
+    주어진 총 기어비/효율에서 analyze_performance()와 동일한 성능 계산 (벡터화)
+
+    단 구성(잇수/모듈)이 없으므로 기어 강도는 검사하지 않습니다 (gear_overstressed는 False).
+
+    Returns:
+        performance_dtype() 구조화 배열
+    """
+    np = _require_numpy()
+    shape, columns = _broadcast_flat(*(np.asarray(a, dtype=np.float64) for a in (
+        voltage_nominal, current_no_load, current_stall, rpm_no_load, torque_stall,
+        torque_output_Nm, total_ratio, total_efficiency)))
+    out = np.empty(columns[0].size, dtype=performance_dtype())
+    for start in range(0, out.size, BATCH_CHUNK_SIZE):
+        chunk = slice(start, start + BATCH_CHUNK_SIZE)
+        _evaluate_chunk(out[chunk], *(c[chunk] for c in columns))
+    return out.reshape(shape)
+
+
+def analyze_performance_batch(voltage_nominal, current_no_load, current_stall, rpm_no_load,
+                              torque_stall, rpm_output, torque_output_Nm, gear_type='spur',
+                              motor_efficiency=0.85, preferred_stages=None):
+    """
+    기어 트레인 설계 + 성능 분석 배치 계산
+
+    모든 인자는 브로드캐스트 가능한 배열(또는 스칼라)이며, 각 행은
+    GearTrainDesigner(motor, target, gear_type, motor_efficiency)의
+    design_gear_train(preferred_stages) → analyze_performance() 결과와 같습니다.
+
+    Returns:
+        performance_dtype() 구조화 배열
+    """
+    np = _require_numpy()
+    shape, columns = _broadcast_flat(
+        *(np.asarray(a, dtype=np.float64) for a in (
+            voltage_nominal, current_no_load, current_stall, rpm_no_load, torque_stall,
+            rpm_output, torque_output_Nm, motor_efficiency)),
+        gear_type_codes(gear_type),
+        np.asarray(0 if preferred_stages is None else preferred_stages, dtype=np.int64))
+    (voltage_nominal, current_no_load, current_stall, rpm_no_load, torque_stall,
+     rpm_output, torque_output_Nm, motor_efficiency, codes, preferred) = columns
+    gear_eff_table = np.asarray(GEAR_TYPE_EFFICIENCY)
+
+    out = np.empty(codes.size, dtype=performance_dtype())
+    for start in range(0, out.size, BATCH_CHUNK_SIZE):
+        chunk = slice(start, start + BATCH_CHUNK_SIZE)
+        num_stages, stage_ratio = design_gear_train_batch(
+            rpm_no_load[chunk], rpm_output[chunk], codes[chunk], preferred[chunk])
+        gear_eff = gear_eff_table[codes[chunk]]
+
+        # get_total_ratio()/get_total_efficiency()와 같은 순서로 단별 곱셈
+        total_ratio = np.ones(num_stages.shape)
+        total_efficiency = motor_efficiency[chunk].copy()
+        # 자동 단수나 preferred_stages는 MAX_STAGES를 넘을 수 있으므로 실제 최대 단수까지
+        for stage in range(1, int(num_stages.max(initial=0)) + 1):
+            active = num_stages >= stage
+            total_ratio = np.where(active, total_ratio * stage_ratio, total_ratio)
+            total_efficiency = np.where(active, total_efficiency * gear_eff, total_efficiency)
+        # 기어가 없으면 총 효율 1.0 (get_total_efficiency 규칙)
+        total_efficiency[num_stages == 0] = 1.0
+
+        perf = out[chunk]
+        _evaluate_chunk(perf, voltage_nominal[chunk], current_no_load[chunk],
+                        current_stall[chunk], rpm_no_load[chunk], torque_stall[chunk],
+                        torque_output_Nm[chunk], total_ratio, total_efficiency)
+
+        # 기어 강도: _required_module_cubed()와 같은 순서로 단별 입력 토크 누적
+        teeth_driving, _, teeth_mating, load_paths = _default_stage_teeth(codes[chunk], stage_ratio)
+        torque = perf['required_motor_torque_Nm']
+        overstressed = np.zeros(num_stages.shape, dtype=bool)
+        for stage in range(1, int(num_stages.max(initial=0)) + 1):
+            _, failed = select_modules_batch(torque / load_paths, teeth_driving, teeth_mating)
+            overstressed |= failed & (num_stages >= stage)
+            torque = torque * (stage_ratio * gear_eff)
+        perf['gear_overstressed'] = overstressed
+        perf['feasible'] &= ~overstressed
+    return out.reshape(shape)
+
+
+# =============================================================================
+# 혼합 기어 트레인 (단별 기어 종류 탐색)
+# =============================================================================
+#
+# 종류별 효율/최대 기어비/최소 잇수는 GEAR_TYPE_* 배열(기어 종류 코드 인덱스)을 사용합니다.
+# 총 기어비와 효율은 단 순서와 무관하므로 종류 구성은 다중집합으로만 열거하고,
+# 최대 기어비 곱으로 목표에 닿지 못하는 구성은 열거 단계에서 잘라냅니다.
+
+# 종류 구성의 단 순서: 단당 최대 기어비가 큰 종류를 입력측(고속·저토크)에 배치
+STAGE_ORDER = tuple(sorted(range(len(GEAR_TYPES)), key=lambda code: -GEAR_TYPE_MAX_RATIO[code]))
+
+# 종류 구성 후보: codes는 단별 기어 종류 코드, size_bound는 잇수 합 하한
+GearTypeSequence = namedtuple('GearTypeSequence', ['codes', 'efficiency', 'size_bound'])
+
+
+@lru_cache(maxsize=None)
+def gear_type_tables(max_teeth: int) -> Tuple[RatioTable, ...]:
+    """기어 종류 코드별 잇수 조합 표 (유성 기어는 PlanetaryTable, 캐시됨)"""
+    return tuple((planetary_stage_table if GEAR_TYPES[code] == 'planetary' else stage_ratio_table)(
+                     GEAR_TYPE_MAX_RATIO[code], GEAR_TYPE_MIN_TEETH[code], max_teeth)
+                 for code in range(len(GEAR_TYPES)))
+
+
+def _sequence_size_bound(tables: List[RatioTable], total_ratio: float, tolerance: float) -> float:
+    """잇수 합 하한: 단별 껍질 합성의 기어비 R × (1 ± 허용 오차) 구간 최솟값"""
+    return hull_size_bound(_stages_size_hull(tables), total_ratio * max(1 - tolerance, 1e-12),
+                           total_ratio * (1 + tolerance)) - 1e-9
+
+
+def gear_type_sequences(total_ratio: float, codes, max_stages: int, tables: Tuple[RatioTable, ...],
+                        tolerance: float) -> List[GearTypeSequence]:
+    """
+    목표 기어비에 도달할 수 있는 종류 구성 열거 (STAGE_ORDER 순, 중복 구성 없음)
+
+    남은 단을 모두 최대 기어비가 가장 큰 종류로 채워도 목표에 못 미치거나,
+    최소 기어비 곱이 이미 목표를 넘으면 더 깊이 탐색하지 않습니다.
+    """
+    codes = sorted(set(codes), key=STAGE_ORDER.index)
+    reach = [tables[code].ratios[-1] for code in codes]
+    floor = [tables[code].ratios[0] for code in codes]
+    # reach_after[j]: j번 이후 종류 중 가장 큰 최대 기어비
+    reach_after = [max(reach[j:]) for j in range(len(codes))]
+    low = total_ratio * (1 - tolerance)
+    high = total_ratio * (1 + tolerance)
+    found = []
+    
+    def visit(start, seq, ratio_max, ratio_min, efficiency):
+        if seq and ratio_max >= low:
+            stage_tables = [tables[code] for code in seq]
+            found.append(GearTypeSequence(seq, efficiency, _sequence_size_bound(stage_tables, total_ratio, tolerance)))
+        remaining = max_stages - len(seq)
+        for j in range(start, len(codes)):
+            if remaining == 0 or ratio_max * reach_after[j] ** remaining < low:
+                break
+            if ratio_min * floor[j] > high:
+                continue
+            visit(j, seq + (codes[j],), ratio_max * reach[j], ratio_min * floor[j],
+                  efficiency * GEAR_TYPE_EFFICIENCY[codes[j]])
+    
+    visit(0, (), 1.0, 1.0, 1.0)
+    return found
+
+
+@lru_cache(maxsize=4096)
+def optimize_gear_types(total_ratio: float, codes: Tuple[int, ...], max_stages: int, objective: str,
+                        ratio_tolerance: float, fixed_sequence: bool,
+                        max_teeth: int) -> Tuple[Tuple[int, int, int], ...]:
+    """
+    단별 기어 종류 + 잇수 조합 탐색 (GearTrainDesigner.design_mixed_gear_train 본체)
+
+    종류 구성을 목적 함수의 상한 순서(효율 내림차순 또는 잇수 합 하한 오름차순)로
+    정렬해 두고, 남은 구성이 현재 최선해를 넘을 수 없으면 탐색을 멈춥니다.
+
+    Args:
+        codes: 사용할 기어 종류 코드 (fixed_sequence면 단별 종류 그대로)
+        objective: 'efficiency' / 'size' / 'ratio' ('ratio'는 기어비 오차를 먼저 비교하고,
+            허용 오차 이하의 오차는 같다고 보고 'efficiency'와 같은 순서로 비교)
+
+    Returns:
+        ((기어 종류 코드, z1, z2), ...) 단별 결과
+    """
+    tables = gear_type_tables(max_teeth)
+    if fixed_sequence:
+        candidates = [GearTypeSequence(codes, math.prod(GEAR_TYPE_EFFICIENCY[c] for c in codes), 0.0)]
+    else:
+        candidates = gear_type_sequences(total_ratio, codes, max_stages, tables, ratio_tolerance)
+        if objective == 'ratio' and not candidates:
+            # 허용 오차 구간에 닿는 구성이 없으면 오차가 가장 작은 구성을 찾기 위해 전부 탐색
+            candidates = gear_type_sequences(total_ratio, codes, max_stages, tables, math.inf)
+        if objective == 'size':
+            candidates.sort(key=lambda c: (c.size_bound, -c.efficiency))
+        else:
+            candidates.sort(key=lambda c: (-c.efficiency, c.size_bound))
+    
+    best = None         # (비교 키, 종류 구성, 탐색 결과)
+    for candidate in candidates:
+        if best is not None:
+            if objective == 'size':
+                if candidate.size_bound >= best[0][0]:
+                    break
+            elif objective == 'ratio':
+                # 허용 오차 안의 해를 찾은 뒤에만 효율 순서로 중단 가능
+                if best[0][0] <= ratio_tolerance and candidate.efficiency < -best[0][1] - 1e-12:
+                    break
+            elif candidate.efficiency < -best[0][0] - 1e-12:
+                break
+        stage_tables = [tables[code] for code in candidate.codes]
+        if objective == 'ratio':
+            result = search_tooth_counts(total_ratio, stage_tables, 'ratio', ratio_tolerance)
+            error, size = result[0], result[1]
+            key = (max(error, ratio_tolerance), -candidate.efficiency, size)
+            if best is None or key < best[0]:
+                best = (key, candidate.codes, result)
+            continue
+        result = search_tooth_counts(total_ratio, stage_tables, 'size', ratio_tolerance)
+        if result is None:
+            continue
+        size = result[1]
+        if objective == 'size':
+            key = (size, -candidate.efficiency)
+        else:
+            key = (-candidate.efficiency, size)
+        if best is None or key < best[0]:
+            best = (key, candidate.codes, result)
+    
+    if best is None:
+        # 허용 오차를 만족하는 구성이 없으면 효율이 가장 높은 구성(도달 가능한 구성이 없으면
+        # 최대 기어비가 가장 큰 종류만으로 max_stages단)에서 오차 최소 조합 사용
+        if candidates:
+            seq = candidates[0].codes
+        else:
+            seq = (max(codes, key=lambda code: tables[code].ratios[-1]),) * max_stages
+        best = (None, seq, search_tooth_counts(total_ratio, [tables[code] for code in seq], 'ratio', 0.0))
+    _, seq, (_, _, pairs) = best
+    return tuple((code, z1, z2) for code, (z1, z2) in zip(seq, pairs))
+
+
+# =============================================================================
+# 파레토 최적 설계 탐색
+# =============================================================================
+
+# pareto_designs() 목적 함수: (필드, 최대화 여부)
+PARETO_OBJECTIVES = (
+    ('system_efficiency', True),
+    ('torque_margin_percent', True),
+    ('gearbox_volume_mm3', False),
+    ('weight_g', False),
+)
+
+
+def _pareto_front_2d(objectives):
+    """2목적 비지배 필터 (최소화): 정렬 후 한 번의 누적 최소 스윕, O(n log n)"""
+    np = _require_numpy()
+    order = np.lexsort((objectives[:, 1], objectives[:, 0]))
+    second = objectives[order, 1]
+    best_before = np.empty_like(second)
+    best_before[0] = np.inf
+    np.minimum.accumulate(second[:-1], out=best_before[1:])
+    return np.sort(order[second < best_before])
+
+
+def pareto_front(objectives, maximize=None, block_size: int = 1024):
+    """
+    비지배(파레토 최적) 행 인덱스 계산
+
+    - 2목적: 정렬 기반 스윕 O(n log n)
+    - k목적: 정렬-필터 스카이라인(SFS). 목적값 순위 합으로 정렬하면 뒤쪽 점은
+      앞쪽 점을 지배할 수 없으므로, 각 점을 현재 스카이라인과만 비교합니다.
+      비교는 block_size 단위로 벡터화합니다.
+
+    Args:
+        objectives: (n, k) 목적값 배열
+        maximize: 목적별 최대화 여부 (None이면 모두 최소화)
+
+    Returns:
+        파레토 최적 행 인덱스 (오름차순, 완전히 같은 점은 하나만 유지)
+    """
+    np = _require_numpy()
+    values = np.array(objectives, dtype=np.float64, ndmin=2)
+    if maximize is not None:
+        values[:, np.asarray(maximize, dtype=bool)] *= -1
+    n, k = values.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k == 1:
+        return np.flatnonzero(values[:, 0] == values[:, 0].min())[:1]
+    if k == 2:
+        return _pareto_front_2d(values)
+
+    # 목적별 순위(동점은 같은 순위) 합으로 정렬 → 앞선 점만 뒤의 점을 지배할 수 있음
+    rank_sum = np.zeros(n)
+    for j in range(k):
+        rank_sum += np.unique(values[:, j], return_inverse=True)[1].reshape(-1)
+    order = np.lexsort(values.T[::-1])
+    order = order[np.argsort(rank_sum[order], kind='stable')]
+    values = values[order]
+
+    def weakly_dominated(points, by):
+        # (점 수, 지배 후보 수) 행렬: by의 모든 목적값이 points 이하
+        mask = by[None, :, 0] <= points[:, None, 0]
+        for j in range(1, k):
+            mask &= by[None, :, j] <= points[:, None, j]
+        return mask
+
+    skyline = np.empty((0, k))
+    keep = []
+    for start in range(0, n, block_size):
+        block = values[start:start + block_size]
+        # 기존 스카이라인 점에 약지배되는 점 제거
+        candidates = np.flatnonzero(~weakly_dominated(block, skyline).any(axis=1))
+        # 남은 점끼리 블록 안의 앞선 점에 약지배되는지 확인 (지배는 추이적이므로 충분)
+        block = block[candidates]
+        fresh = ~np.tril(weakly_dominated(block, block), -1).any(axis=1)
+        survivors = candidates[fresh]
+        skyline = np.concatenate([skyline, block[fresh]])
+        keep.append(start + survivors)
+    return np.sort(order[np.concatenate(keep)])
+
+
+def pareto_designs(motors, target: TargetSpec, gear_types=GEAR_TYPES, stage_counts=None,
+                   modules=None, motor_efficiency: float = 0.85, feasible_only: bool = True,
+                   objectives=PARETO_OBJECTIVES, material: str = 'POM'):
+    """
+    모터 × 기어 종류 × 단수 조합의 파레토 최적 설계
+
+    기어 구성은 design_gear_train()의 기본 방식(구동 기어 18치, 균등 분배)을 따르고,
+    단별 모듈은 _select_modules()와 같은 강도 기준으로 고릅니다.
+    결과의 module 필드는 마지막(가장 큰) 단의 모듈입니다.
+
+    Args:
+        motors: DCMotorSpec 목록 또는 BATCH_MOTOR_FIELDS + 'weight' 배열 사전
+        target: 목표 사양
+        gear_types: 탐색할 기어 종류
+        stage_counts: 탐색할 단수 (None이면 1 ~ MAX_STAGES)
+        modules: 후보 모듈 (None이면 STANDARD_MODULES)
+        feasible_only: True면 feasible 설계만 후보로 사용
+        objectives: (필드, 최대화 여부) 목록
+        material: 기어 재질 (GEAR_MATERIALS 키)
+
+    Returns:
+        파레토 최적 설계 구조화 배열
+    """
+    np = _require_numpy()
+    if not isinstance(motors, dict):
+        motors = motor_spec_arrays(motors, BATCH_MOTOR_FIELDS + ('weight',))
+    stage_counts = np.arange(1, MAX_STAGES + 1) if stage_counts is None else np.asarray(stage_counts)
+    codes = gear_type_codes(list(gear_types))
+
+    # (모터, 기어 종류, 단수) 격자
+    motor_idx, code_idx, stage_idx = (a.reshape(-1) for a in np.meshgrid(
+        np.arange(len(motors['rpm_no_load'])), codes, stage_counts, indexing='ij'))
+    num_stages, stage_ratio = design_gear_train_batch(
+        motors['rpm_no_load'][motor_idx], target.rpm_output, code_idx, stage_idx)
+    # 단수가 자동으로 늘어난 조합은 다른 격자점과 중복이므로 제외
+    valid = num_stages == stage_idx
+    motor_idx, code_idx, num_stages, stage_ratio = (
+        a[valid] for a in (motor_idx, code_idx, num_stages, stage_ratio))
+    perf = analyze_performance_batch(
+        *(motors[f][motor_idx] for f in BATCH_MOTOR_FIELDS), target.rpm_output,
+        target.torque_output_Nm, code_idx, motor_efficiency, num_stages)
+
+    teeth_driving, teeth_driven, teeth_mating, load_paths = _default_stage_teeth(code_idx, stage_ratio)
+
+    # 단별 입력 토크 = 필요 모터 토크 × (기어비 × 효율)^(단 번호) → 단 × 설계 배열
+    stage_gain = stage_ratio * np.asarray(GEAR_TYPE_EFFICIENCY)[code_idx]
+    stage_no = np.arange(int(num_stages.max(initial=0)))[:, None]
+    module, overstressed = select_modules_batch(
+        perf['required_motor_torque_Nm'] * stage_gain ** stage_no / load_paths,
+        teeth_driving, teeth_mating, material, modules)
+    module = np.where(stage_no < num_stages, module, 0.0)
+    overstressed = (overstressed & (stage_no < num_stages)).any(axis=0)
+
+    # 기어 부피 = Σ π/4 × (d1² + d2²) × b,  d = m·z, b = 계수·m
+    volume = (math.pi / 4 * GearTrainDesigner.FACE_WIDTH_FACTOR * (module ** 3).sum(axis=0)
+              * (teeth_driving ** 2 + teeth_driven ** 2))
+    module = module.max(axis=0)
+
+    dtype = np.dtype([
+        ('motor_index', np.intp),
+        ('gear_type', 'U16'),
+        ('num_stages', np.int64),
+        ('module', np.float64),
+        ('total_ratio', np.float64),
+        ('system_efficiency', np.float64),
+        ('torque_margin_percent', np.float64),
+        ('gearbox_volume_mm3', np.float64),
+        ('weight_g', np.float64),
+        ('feasible', np.bool_),
+    ])
+    rows = np.empty(num_stages.shape, dtype=dtype)
+    rows['motor_index'] = motor_idx
+    rows['gear_type'] = np.asarray(GEAR_TYPES)[code_idx]
+    rows['num_stages'] = num_stages
+    rows['module'] = module
+    for name in ('total_ratio', 'system_efficiency', 'torque_margin_percent'):
+        rows[name] = perf[name]
+    # 토크 기준(_evaluate_chunk와 같은 식) + 후보 모듈로 강도를 만족하지 못하는 단이 없을 것
+    rows['feasible'] = ((perf['required_motor_torque_Nm'] <= motors['torque_stall'][motor_idx] / 1000 * 0.8)
+                        & ~overstressed)
+    rows['gearbox_volume_mm3'] = volume
+    rows['weight_g'] = motors['weight'][motor_idx] + GEAR_MATERIALS[material].density * volume
+    if feasible_only:
+        rows = rows[rows['feasible']]
+
+    names = [name for name, _ in objectives]
+    front = pareto_front(np.column_stack([rows[name] for name in names]),
+                         maximize=[flag for _, flag in objectives])
+    return rows[front]
+
+
+# =============================================================================
+# 모터 카탈로그 (메모리 맵 컬럼 저장소)
+# =============================================================================
+#
+# 파일 구조 (리틀 엔디언):
+#   [0:8)    매직 b'MCATLG1\0'
+#   [8:16)   데이터 시작 위치 (uint64)
+#   [16:24)  헤더 길이 (uint64)
+#   [24:..)  JSON 헤더 - 행 수, 컬럼/인덱스별 dtype과 데이터 시작 기준 오프셋
+#   [데이터] 64바이트 정렬된 컬럼 배열, 인덱스(정렬 키 + 행 번호), 모델명 오프셋/바이트열
+
+MOTOR_FIELDS = ('voltage_nominal', 'current_no_load', 'current_stall', 'rpm_no_load',
+                'torque_stall', 'diameter', 'length', 'weight')
+
+# 정렬 인덱스를 유지하는 컬럼 (범위 질의를 이분 탐색으로 처리)
+CATALOG_INDEXED_FIELDS = ('rpm_no_load', 'torque_stall', 'voltage_nominal', 'diameter')
+
+_CATALOG_MAGIC = b'MCATLG1\0'
+_CATALOG_ALIGN = 64
+
+
+class MotorCatalog:
+    """메모리 맵으로 여는 모터 카탈로그 (행 접근 시 DCMotorSpec 생성)"""
+
+    def __init__(self, path: str):
+        np = _require_numpy()
+        self.path = path
+        self._raw = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self._raw[:8]) != _CATALOG_MAGIC:
+            raise ValueError(f"모터 카탈로그 파일이 아닙니다: {path}")
+        import json
+        data_start, header_len = (int(v) for v in self._raw[8:24].view('<u8'))
+        header = json.loads(bytes(self._raw[24:24 + header_len]).decode('utf-8'))
+        self._count = header['count']
+        self._data_start = data_start
+        self._columns = {name: self._section(spec) for name, spec in header['columns'].items()}
+        self._indexes = {name: (self._section(spec['keys']), self._section(spec['order']))
+                         for name, spec in header['indexes'].items()}
+        self._name_offsets = self._section(header['names']['offsets'])
+        self._name_blob = self._section(header['names']['blob'])
+
+    def _section(self, spec):
+        dtype = _require_numpy().dtype(spec['dtype'])
+        start = self._data_start + spec['offset']
+        return self._raw[start:start + spec['count'] * dtype.itemsize].view(dtype)
+
+    @classmethod
+    def open(cls, path: str) -> 'MotorCatalog':
+        """카탈로그 파일 열기 (메모리 맵, 읽기 전용)"""
+        return cls(path)
+
+    @staticmethod
+    def write(path: str, motors) -> None:
+        """
+        카탈로그 파일 작성
+
+        Args:
+            motors: DCMotorSpec 목록 또는 'name' + MOTOR_FIELDS 배열 사전
+        """
+        np = _require_numpy()
+        if not isinstance(motors, dict):
+            names = [m.name for m in motors]
+            motors = motor_spec_arrays(motors, MOTOR_FIELDS)
+            motors['name'] = names
+        count = len(motors['name'])
+        order_dtype = np.dtype('<u4') if count < 2 ** 32 else np.dtype('<u8')
+
+        sections = []       # (헤더 기술자, 배열)
+
+        def add(array):
+            array = np.ascontiguousarray(array)
+            spec = {'dtype': array.dtype.str, 'count': int(array.size), 'offset': 0}
+            sections.append((spec, array))
+            return spec
+
+        columns = {f: add(np.asarray(motors[f], dtype='<f8')) for f in MOTOR_FIELDS}
+        indexes = {}
+        for field in CATALOG_INDEXED_FIELDS:
+            values = np.asarray(motors[field], dtype='<f8')
+            order = np.argsort(values, kind='stable')
+            indexes[field] = {'keys': add(values[order]), 'order': add(order.astype(order_dtype))}
+        encoded = [str(n).encode('utf-8') for n in motors['name']]
+        offsets = np.zeros(count + 1, dtype='<u8')
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        names = {'offsets': add(offsets),
+                 'blob': add(np.frombuffer(b''.join(encoded), dtype=np.uint8))}
+
+        # 64바이트 정렬 오프셋 배정
+        position = 0
+        for spec, array in sections:
+            position = -(-position // _CATALOG_ALIGN) * _CATALOG_ALIGN
+            spec['offset'] = position
+            position += array.nbytes
+        import json
+        header = json.dumps({'count': count, 'columns': columns, 'indexes': indexes,
+                             'names': names}).encode('utf-8')
+        data_start = -(-(24 + len(header)) // _CATALOG_ALIGN) * _CATALOG_ALIGN
+
+        with open(path, 'wb') as f:
+            f.write(_CATALOG_MAGIC)
+            f.write(np.array([data_start, len(header)], dtype='<u8').tobytes())
+            f.write(header)
+            for spec, array in sections:
+                f.seek(data_start + spec['offset'])
+                f.write(array.tobytes())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, row: int) -> DCMotorSpec:
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return DCMotorSpec(self.name(row), *(float(self._columns[f][row]) for f in MOTOR_FIELDS))
+
+    def __iter__(self):
+        for row in range(self._count):
+            yield self[row]
+
+    def name(self, row: int) -> str:
+        """모델명"""
+        start, end = int(self._name_offsets[row]), int(self._name_offsets[row + 1])
+        return bytes(self._name_blob[start:end]).decode('utf-8')
+
+    def column(self, field: str):
+        """컬럼 배열 (메모리 맵 뷰)"""
+        return self._columns[field]
+
+    def arrays(self, rows=None, fields=BATCH_MOTOR_FIELDS) -> dict:
+        """선택한 행의 컬럼 배열 사전 (analyze_performance_batch/pareto_designs 입력용)"""
+        np = _require_numpy()
+        if rows is None:
+            return {f: np.asarray(self._columns[f]) for f in fields}
+        return {f: self._columns[f][rows] for f in fields}
+
+    def specs(self, rows) -> List[DCMotorSpec]:
+        """선택한 행의 DCMotorSpec 목록"""
+        return [self[int(row)] for row in rows]
+
+    def select(self, rows) -> 'MotorSpecArray':
+        """선택한 행을 MotorSpecArray로 복사"""
+        return MotorSpecArray(self.arrays(rows, MOTOR_FIELDS), [self.name(int(r)) for r in rows])
+
+    def range_rows(self, field: str, low: float = None, high: float = None):
+        """정렬 인덱스로 low <= field <= high 인 행 번호 조회 (정렬 키 순서)"""
+        keys, order = self._indexes[field]
+        start = 0 if low is None else int(keys.searchsorted(low, side='left'))
+        stop = len(keys) if high is None else int(keys.searchsorted(high, side='right'))
+        return order[start:max(start, stop)]
+
+    def query(self, **ranges):
+        """
+        범위 조건 질의
+
+        예) catalog.query(diameter=(None, 25), torque_stall=(50, None))
+            → 직경 25 mm 이하, 정지 토크 50 mNm 이상인 행 번호 (오름차순)
+
+        인덱스가 있는 조건 중 가장 선택적인 조건으로 후보를 구한 뒤,
+        나머지 조건은 후보 행만 모아 검사합니다.
+        """
+        np = _require_numpy()
+        indexed = [f for f in ranges if f in self._indexes]
+        if indexed:
+            def span(field):
+                keys, _ = self._indexes[field]
+                low, high = ranges[field]
+                start = 0 if low is None else keys.searchsorted(low, side='left')
+                stop = len(keys) if high is None else keys.searchsorted(high, side='right')
+                return stop - start
+            driver = min(indexed, key=span)
+            rows = np.sort(self.range_rows(driver, *ranges[driver]).astype(np.intp))
+        else:
+            driver = None
+            rows = np.arange(self._count)
+        for field, (low, high) in ranges.items():
+            if field == driver:
+                continue
+            values = self._columns[field][rows]
+            mask = np.ones(rows.shape, dtype=bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            rows = rows[mask]
+        return rows
+
+
+# =============================================================================
+# 병렬 설계 스윕 (프로세스 풀)
+# =============================================================================
+
+# 작업자 프로세스 전역 상태 (_sweep_worker_init에서 설정)
+_SWEEP_STATE = {}
+
+
+def sweep_dtype():
+    """DesignSweepRunner 결과 구조화 배열 dtype"""
+    np = _require_numpy()
+    return np.dtype([
+        ('motor_index', np.int64),
+        ('target_index', np.int64),
+        ('gear_type', np.int64),        # GEAR_TYPES 코드
+        ('num_stages', np.int64),
+        ('ratio_error', np.float64),    # 실제 / 필요 기어비 상대 오차
+    ] + performance_dtype().descr)
+
+
+def _attach_shared_memory(name: str):
+    """
+    부모가 만든 공유 메모리에 resource tracker 등록 없이 연결
+
+    Python 3.12 이하는 연결만 해도 등록되어, 작업자 쪽 tracker가 종료 시 블록을
+    unlink하거나 경고를 남길 수 있습니다. 등록 후 unregister하면 부모와 공유하는
+    tracker에서 부모의 등록까지 지워지므로, 연결하는 동안 등록 자체를 건너뜁니다.
+    """
+    from multiprocessing import shared_memory
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _sweep_worker_init(shm_name, n_motors, n_targets, gear_types, objective, motor_efficiency,
+                       cache_size=0):
+    """작업자 초기화: 공유 메모리의 모터/목표 배열에 연결, 평가 캐시 설정"""
+    np = _require_numpy()
+    if cache_size:
+        set_evaluation_cache(True, cache_size)
+    shm = _attach_shared_memory(shm_name)
+    params = np.ndarray((n_motors * len(BATCH_MOTOR_FIELDS) + n_targets * 2,),
+                        dtype=np.float64, buffer=shm.buf)
+    _SWEEP_STATE.update(
+        shm=shm,
+        motors=params[:n_motors * len(BATCH_MOTOR_FIELDS)].reshape(n_motors, -1),
+        targets=params[n_motors * len(BATCH_MOTOR_FIELDS):].reshape(n_targets, 2),
+        gear_types=gear_types,
+        objective=objective,
+        motor_efficiency=motor_efficiency,
+    )
+
+
+def _sweep_worker_run(start: int, stop: int):
+    """작업 인덱스 [start, stop) 구간 실행 → (start, 결과 배열)"""
+    np = _require_numpy()
+    state = _SWEEP_STATE
+    motors, targets, gear_types = state['motors'], state['targets'], state['gear_types']
+    n_targets, n_types = len(targets), len(gear_types)
+
+    out = np.zeros(stop - start, dtype=sweep_dtype())
+    float_fields = [name for name in out.dtype.names if out.dtype[name].kind == 'f']
+    for row, job in enumerate(range(start, stop)):
+        motor_index, rest = divmod(job, n_targets * n_types)
+        target_index, type_index = divmod(rest, n_types)
+        gear_type = gear_types[type_index]
+        record = out[row]
+        record['motor_index'] = motor_index
+        record['target_index'] = target_index
+        record['gear_type'] = GEAR_TYPES.index(gear_type)
+        try:
+            motor = CompactMotorSpec('', *motors[motor_index].tolist(), 0.0, 0.0, 0.0)
+            target = CompactTargetSpec(*targets[target_index].tolist())
+            designer = GearTrainDesigner(motor, target, gear_type, state['motor_efficiency'])
+            # 기어비 < 1이면 design_gear_train()이 경고만 출력하므로 설계를 건너뜀
+            if designer.calculate_required_ratio() >= 1:
+                designer.design_gear_train(objective=state['objective'])
+            perf = designer.analyze_performance()
+        except Exception:
+            # 계산할 수 없는 사양 행(정지 전류 0 등)은 스윕을 멈추지 않고 NaN, feasible=False로 기록
+            for name in float_fields:
+                record[name] = math.nan
+            continue
+
+        record['num_stages'] = len(designer.gear_stages)
+        record['ratio_error'] = perf['total_ratio'] / designer.calculate_required_ratio() - 1
+        for name in PERFORMANCE_FIELDS:
+            record[name] = perf[name]
+    return start, out
+
+
+class DesignSweepRunner:
+    """
+    (모터, 목표, 기어 종류) 설계 작업을 ProcessPoolExecutor로 분산 실행
+
+    - 모터/목표 파라미터는 공유 메모리에 한 번만 올리고 작업자는 연결만 합니다.
+    - 작업은 연속 구간(chunk_size개)으로 나누어 보내고, 완료되는 순서대로 결과를
+      구조화 배열 조각으로 돌려줍니다. 동시에 대기하는 구간 수를 제한해
+      메모리 사용량이 작업 수와 무관하게 유지됩니다.
+    - 작업자마다 cache_size 크기의 평가 캐시를 켭니다 (0이면 끔).
+    - 계산할 수 없는 작업(정지 전류 0인 모터 등)은 NaN, feasible=False 행으로 기록하고
+      report()에 실패 수로 표시합니다.
+
+    사용 예:
+        runner = DesignSweepRunner(motors, targets, ('spur', 'planetary'))
+        for chunk in runner.run():
+            ...
+        print(runner.report())
+    """
+
+    def __init__(self, motors, targets, gear_types=('spur',), objective: str = 'ratio',
+                 motor_efficiency: float = 0.85, workers: int = None, chunk_size: int = 256,
+                 cache_size: int = 4096):
+        np = _require_numpy()
+        if not isinstance(motors, dict):
+            motors = motor_spec_arrays(motors)
+        if not isinstance(targets, dict):
+            targets = target_spec_arrays(targets)
+        self.motor_params = np.column_stack([np.asarray(motors[f], dtype=np.float64)
+                                             for f in BATCH_MOTOR_FIELDS])
+        self.target_params = np.column_stack([np.asarray(targets[f], dtype=np.float64)
+                                              for f in ('rpm_output', 'torque_output_Nm')])
+        self.gear_types = tuple(gear_types)
+        self.objective = objective
+        self.motor_efficiency = motor_efficiency
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.stats = {}
+
+    def __len__(self) -> int:
+        return len(self.motor_params) * len(self.target_params) * len(self.gear_types)
+
+    def run(self):
+        """결과 조각(sweep_dtype() 구조화 배열)을 완료 순서대로 생성"""
+        import time
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        from multiprocessing import shared_memory
+        np = _require_numpy()
+
+        total = len(self)
+        workers = self.workers or os.cpu_count() or 1
+        params = np.concatenate([self.motor_params.ravel(), self.target_params.ravel()])
+        shm = shared_memory.SharedMemory(create=True, size=max(params.nbytes, 1))
+        np.ndarray(params.shape, dtype=np.float64, buffer=shm.buf)[:] = params
+        init_args = (shm.name, len(self.motor_params), len(self.target_params),
+                     self.gear_types, self.objective, self.motor_efficiency, self.cache_size)
+
+        self.stats = {'jobs': total, 'done': 0, 'failed': 0, 'chunks': 0, 'workers': workers,
+                      'elapsed_s': 0.0, 'jobs_per_s': 0.0}
+        started = time.perf_counter()
+        ranges = ((start, min(start + self.chunk_size, total))
+                  for start in range(0, total, self.chunk_size))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_sweep_worker_init,
+                                     initargs=init_args) as pool:
+                pending = set()
+                for _ in range(workers * 2):
+                    job = next(ranges, None)
+                    if job is None:
+                        break
+                    pending.add(pool.submit(_sweep_worker_run, *job))
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        job = next(ranges, None)
+                        if job is not None:
+                            pending.add(pool.submit(_sweep_worker_run, *job))
+                        _, chunk = future.result()
+                        elapsed = time.perf_counter() - started
+                        self.stats.update(done=self.stats['done'] + len(chunk),
+                                          failed=self.stats['failed']
+                                          + int(np.isnan(chunk['total_ratio']).sum()),
+                                          chunks=self.stats['chunks'] + 1, elapsed_s=elapsed,
+                                          jobs_per_s=(self.stats['done'] + len(chunk)) / elapsed)
+                        yield chunk
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def report(self) -> str:
+        """처리량 요약"""
+        st = self.stats
+        if not st:
+            return "스윕 미실행"
+        per_worker = st['jobs_per_s'] / st['workers'] if st['workers'] else 0.0
+        return (f"{st['done']:,}/{st['jobs']:,} 작업 (실패 {st['failed']:,}), {st['chunks']:,} 조각, "
+                f"{st['elapsed_s']:.2f} s, {st['jobs_per_s']:,.0f} 작업/s "
+                f"(작업자 {st['workers']}개, 작업자당 {per_worker:,.0f} 작업/s)")
+
+
+# =============================================================================
+# 구동 시간 영역 시뮬레이션 (미션 프로파일)
+# =============================================================================
+#
+# 모델 (전기적 시정수 << 샘플 주기로 보고 인덕턴스 무시):
+#   i = (V - Ke·ω) / R(T),   R(T) = Ra·(1 + α·(T - T_amb))
+#   J·dω/dt = Kt·i - Tf - T_load / (G·η_gear),   Tf = Kt·I_no_load
+#   C_th·dT/dt = i²·R - (T - T_amb) / R_th
+# 한 조각(chunk) 안에서는 R을 조각 시작 온도로 고정하여 선형 시불변 시스템으로 보고,
+# 정확한 이산화 ω[k+1] = a·ω[k] + (1-a)·ω_ss[k]를 누적합으로 벡터화해 적분합니다.
+# 부하는 저항성(역구동 불가)으로 보고 ω_ss >= 0으로 제한하므로 과부하 시 정지(스톨)합니다.
+
+@dataclass
+class MissionSegment:
+    """미션 프로파일 구간 (출력축 기준)"""
+    name: str                    # 구간 이름
+    duration_s: float            # 지속 시간 [s]
+    duty: float                  # PWM 듀티 (0~1)
+    load_torque_Nm: float        # 출력축 부하 토크 [Nm]
+
+
+@dataclass
+class DriveSimulationParams:
+    """시뮬레이션 파라미터 (사양서에 없는 값은 소형 DC 모터 기준 추정값)"""
+    dt: float = 1e-3                     # 적분 간격 [s] (1 kHz)
+    rotor_inertia: float = 2e-6          # 회전자 관성 [kg·m²]
+    load_inertia: float = 1e-4           # 출력축 기준 부하 관성 [kg·m²] (바퀴 + 차체 환산)
+    ambient_temp: float = 25.0           # 주위 온도 [°C]
+    thermal_resistance: float = 15.0     # 권선-주위 열저항 [K/W]
+    thermal_capacitance: float = 20.0    # 권선 열용량 [J/K]
+    copper_temp_coeff: float = 0.00393   # 구리 저항 온도계수 [1/K]
+    chunk_steps: int = 8192              # 한 번에 적분하는 스텝 수
+    decimation: int = 1                  # 디스크 기록 간격 (스텝 단위)
+
+
+def cleaning_mission_profile(target: TargetSpec, duration_s: float = 7200.0,
+                             seed: int = 0) -> List[MissionSegment]:
+    """
+    청소 주행 미션 프로파일 생성 (재현 가능한 난수)
+
+    하드 플로어 주행, 카펫, 문턱 넘기, 정지/회전, 가끔 발생하는 바퀴 구속(스톨)을
+    반복합니다. 부하 토크는 목표 출력 토크에 대한 비율로 정하고, 구속 구간은 무한대입니다.
+    """
+    import random
+    rng = random.Random(seed)
+    rated = target.torque_output_Nm
+    segments = []
+    elapsed = 0.0
+    while elapsed < duration_s:
+        choice = rng.random()
+        if choice < 0.55:
+            segment = MissionSegment('hard_floor', rng.uniform(5, 30), 0.7, 0.1 * rated)
+        elif choice < 0.80:
+            segment = MissionSegment('carpet', rng.uniform(5, 20), 0.8, 0.35 * rated)
+        elif choice < 0.90:
+            segment = MissionSegment('turn_stop', rng.uniform(0.5, 3), 0.0, 0.05 * rated)
+        elif choice < 0.98:
+            segment = MissionSegment('threshold', rng.uniform(0.5, 2), 1.0, 1.0 * rated)
+        else:
+            # 바퀴 구속: 무한대 부하 → 속도 0, 스톨 전류
+            segment = MissionSegment('stall', rng.uniform(0.5, 3), 1.0, math.inf)
+        segment.duration_s = min(segment.duration_s, duration_s - elapsed)
+        segments.append(segment)
+        elapsed += segment.duration_s
+    return segments
+
+
+def _linear_recurrence(a: float, b, y0: float):
+    """y[k+1] = a·y[k] + b[k] (0 <= a < 1)의 y[1..m]을 벡터화 계산"""
+    np = _require_numpy()
+    m = len(b)
+    if a <= 0.5:
+        # 빠르게 감쇠: a^L < 1e-16이 되는 L개 항까지만 합산
+        terms = min(m, int(math.ceil(-37 / math.log(a))) if a > 0 else 1)
+        y = b.copy()
+        weight = 1.0
+        for lag in range(1, terms):
+            weight *= a
+            y[lag:] += weight * b[:-lag]
+        return y + y0 * a ** np.arange(1, m + 1)
+    # 느리게 감쇠: y[k] = a^k·(y0 + Σ a^-(j+1)·b[j]), a^-m이 넘치지 않도록 블록 분할
+    block = max(1, int(50 / -math.log(a)))
+    y = np.empty(m)
+    for start in range(0, m, block):
+        part = b[start:start + block]
+        powers = a ** np.arange(1, len(part) + 1)
+        y[start:start + len(part)] = powers * (y0 + np.cumsum(part / powers))
+        y0 = y[start + len(part) - 1]
+    return y
+
+
+def simulation_record_dtype():
+    """시뮬레이션 기록 dtype"""
+    np = _require_numpy()
+    return np.dtype([
+        ('time_s', np.float64),
+        ('duty', np.float32),
+        ('load_torque_Nm', np.float32),      # 출력축 부하
+        ('current_A', np.float32),
+        ('motor_rpm', np.float32),
+        ('output_rpm', np.float32),
+        ('winding_temp_C', np.float32),
+        ('energy_Wh', np.float64),           # 누적 입력 에너지
+    ])
+
+
+class DriveSimulator:
+    """DCMotorSpec + GearTrainDesigner 기반 구동계 시간 영역 시뮬레이터"""
+
+    def __init__(self, designer: GearTrainDesigner, params: DriveSimulationParams = None):
+        if not designer.gear_stages:
+            designer.design_gear_train()
+        self.designer = designer
+        self.params = params or DriveSimulationParams()
+
+    def _profile_chunks(self, segments: List[MissionSegment]):
+        """미션 구간을 최대 chunk_steps 길이의 (듀티, 부하) 배열로 분할"""
+        np = _require_numpy()
+        size = self.params.chunk_steps
+        duty = np.empty(size)
+        load = np.empty(size)
+        filled = 0
+        for segment in segments:
+            remaining = int(round(segment.duration_s / self.params.dt))
+            while remaining:
+                take = min(remaining, size - filled)
+                duty[filled:filled + take] = segment.duty
+                load[filled:filled + take] = segment.load_torque_Nm
+                filled += take
+                remaining -= take
+                if filled == size:
+                    yield duty, load
+                    filled = 0
+        if filled:
+            yield duty[:filled], load[:filled]
+
+    def run(self, segments: List[MissionSegment], out_path: str = None) -> dict:
+        """
+        미션 프로파일 시뮬레이션
+
+        Args:
+            segments: 미션 구간 목록
+            out_path: 지정하면 시계열을 .npy 파일(simulation_record_dtype)로 조각 단위 기록
+
+        Returns:
+            요약 통계 (에너지, 최대/RMS 전류, 최고 권선 온도, 스톨 시간, 실시간 대비 속도)
+        """
+        import time
+        np = _require_numpy()
+        p = self.params
+        motor = self.designer.motor
+        ratio = self.designer.get_total_ratio()
+        gear_eff = 1.0
+        for stage in self.designer.gear_stages:
+            gear_eff *= stage.efficiency
+        Ke, Kt, Ra = motor.Ke, motor.Kt, motor.R_armature
+        friction = Kt * motor.current_no_load
+        inertia = p.rotor_inertia + p.load_inertia / ratio ** 2
+        a_th = math.exp(-p.dt / (p.thermal_resistance * p.thermal_capacitance))
+
+        total_steps = sum(int(round(seg.duration_s / p.dt)) for seg in segments)
+        writer = None
+        if out_path is not None:
+            writer = np.lib.format.open_memmap(out_path, mode='w+', dtype=simulation_record_dtype(),
+                                               shape=(-(-total_steps // p.decimation),))
+
+        omega, temp, energy = 0.0, p.ambient_temp, 0.0
+        step = written = 0
+        peak_current = max_temp = stall_time = sum_i2 = 0.0
+        started = time.perf_counter()
+        for duty, load in self._profile_chunks(segments):
+            m = len(duty)
+            resistance = Ra * (1 + p.copper_temp_coeff * (temp - p.ambient_temp))
+            a = math.exp(-p.dt * Kt * Ke / (inertia * resistance))
+            voltage = duty * motor.voltage_nominal
+            motor_load = friction + load / (ratio * gear_eff)
+            omega_ss = np.maximum(0.0, (voltage - resistance * motor_load / Kt) / Ke)
+            omega_end = _linear_recurrence(a, (1 - a) * omega_ss, omega)
+            omega_start = np.concatenate(([omega], omega_end[:-1]))
+            current = (voltage - Ke * omega_start) / resistance
+            copper_loss = current ** 2 * resistance
+            temps = _linear_recurrence(
+                a_th, (1 - a_th) * (p.ambient_temp + p.thermal_resistance * copper_loss), temp)
+            energies = energy + np.cumsum(voltage * current) * (p.dt / 3600)
+
+            peak_current = max(peak_current, float(np.abs(current).max()))
+            max_temp = max(max_temp, float(temps.max()))
+            # 스톨: 구동 중인데 부하가 낼 수 있는 토크를 넘는 스텝 (가속 중 저속 구간은 제외)
+            stall_time += float(np.count_nonzero((omega_ss == 0) & (duty > 0))) * p.dt
+            sum_i2 += float(np.dot(current, current))
+
+            if writer is not None:
+                offset = (-step) % p.decimation
+                picks = slice(offset, m, p.decimation)
+                rows = writer[written:written + len(range(offset, m, p.decimation))]
+                rows['time_s'] = (step + np.arange(m)[picks] + 1) * p.dt
+                rows['duty'] = duty[picks]
+                rows['load_torque_Nm'] = load[picks]
+                rows['current_A'] = current[picks]
+                rows['motor_rpm'] = omega_end[picks] * 60 / (2 * math.pi)
+                rows['output_rpm'] = rows['motor_rpm'] / ratio
+                rows['winding_temp_C'] = temps[picks]
+                rows['energy_Wh'] = energies[picks]
+                written += len(rows)
+
+            omega, temp, energy = float(omega_end[-1]), float(temps[-1]), float(energies[-1])
+            step += m
+
+        wall = time.perf_counter() - started
+        if writer is not None:
+            writer.flush()
+            del writer
+        duration = step * p.dt
+        return {
+            'duration_s': duration,
+            'steps': step,
+            'energy_Wh': energy,
+            'peak_current_A': peak_current,
+            'rms_current_A': math.sqrt(sum_i2 / step) if step else 0.0,
+            'max_winding_temp_C': max_temp,
+            'final_winding_temp_C': temp,
+            'stall_time_s': stall_time,
+            'wall_time_s': wall,
+            'realtime_factor': duration / wall if wall > 0 else math.inf,
+        }
+
+
+# =============================================================================
+# 효율 맵 (펌웨어 룩업 테이블)
+# =============================================================================
+#
+# get_operating_point(T_m, D)의 선형 모델을 (PWM 듀티, 출력축 부하 토크) 격자에서
+# 벡터화 계산해 MCU용 고정소수점 표로 내보냅니다. 모터 토크는 analyze_performance()와
+# 같이 T_m = T_out / (G·η_total)이므로 듀티 100% 행은 설계 결과의 동작점과 같습니다.
+# 축은 등간격 정수 격자(듀티 Q16, 토크 µNm)이므로 MCU에서는 나눗셈 한 번으로
+# 인덱스를 구하고 정수 쌍선형 보간만 하면 됩니다. 표 값은 uint16 × LSB입니다.
+#
+# 바이너리 파일 구조 (리틀 엔디언):
+#   [0:8)    매직 b'EFFMAP1\0'
+#   [8:16)   버전, 듀티 점 수, 토크 점 수, 표 개수 (uint16 × 4)
+#   [16:32)  듀티 시작/간격 [Q16], 토크 시작/간격 [µNm] (int32 × 4)
+#   [32:..)  표마다 이름(16바이트, NUL 채움) + LSB(float32)
+#   [데이터] 표 순서대로 uint16[듀티][토크]
+#   [끝 4]   앞 전체의 CRC-32 (uint32)
+
+_EFFMAP_MAGIC = b'EFFMAP1\0'
+_EFFMAP_VERSION = 1
+_EFFMAP_HEADER = '<8s4H4i'
+_EFFMAP_TABLE_ENTRY = '<16sf'
+
+# 듀티 축 고정소수점 단위 (1.0 = 65536) / 토크 축 단위 [Nm]
+DUTY_ONE_Q16 = 1 << 16
+TORQUE_UNIT_NM = 1e-6
+
+
+def _div_trunc(a: int, b: int) -> int:
+    """C 정수 나눗셈과 같은 0 방향 버림"""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b > 0) else -q
+
+
+def _c_identifier(name: str) -> str:
+    """C 식별자로 쓸 수 있게 변환 (영숫자/_ 외 문자는 _, 숫자나 _로 시작하면 앞에 map_)"""
+    ident = ''.join(c if c.isascii() and (c.isalnum() or c == '_') else '_' for c in name)
+    if not ident or not ident[0].isalpha():
+        ident = 'map_' + ident
+    return ident
+
+
+class EfficiencyMap:
+    """
+    (PWM 듀티, 출력 토크) 격자의 전류/출력 회전수/효율 표와 고정소수점 내보내기
+
+    사용 예:
+        emap = efficiency_map(designer)
+        emap.write_c_header('wheel_effmap.h')
+        emap.write_blob('wheel_effmap.bin')
+        emap.lookup(0.6, 0.3, 'current_A')      # MCU와 같은 정수 보간 결과
+    """
+
+    def __init__(self, duty_start: int, duty_step: int, torque_start: int, torque_step: int,
+                 tables: dict, title: str = ''):
+        """
+        Args:
+            duty_start, duty_step: 듀티 축 [Q16]
+            torque_start, torque_step: 토크 축 [µNm]
+            tables: 이름 → (듀티 점 수, 토크 점 수) 실수 배열 또는 (uint16 배열, LSB)
+        """
+        np = _require_numpy()
+        self.duty_start = int(duty_start)
+        self.duty_step = int(duty_step)
+        self.torque_start = int(torque_start)
+        self.torque_step = int(torque_step)
+        self.title = title
+        self.raw = {}                   # 이름 -> uint16 배열
+        self.lsb = {}                   # 이름 -> 실수 단위 / LSB
+        for name, values in tables.items():
+            if len(name.encode('ascii')) > 16:
+                raise ValueError(f"표 이름은 16바이트 이하여야 합니다: {name}")
+            if isinstance(values, tuple):
+                self.raw[name], self.lsb[name] = values
+                continue
+            values = np.asarray(values, dtype=np.float64)
+            if (values < 0).any():
+                raise ValueError(f"음수 값은 uint16 표로 저장할 수 없습니다: {name}")
+            peak = float(values.max()) if values.size else 0.0
+            lsb = float(np.float32(peak / 65535)) if peak > 0 else 1.0
+            self.raw[name] = np.minimum(np.round(values / lsb), 65535).astype(np.uint16)
+            self.lsb[name] = lsb
+        shapes = {a.shape for a in self.raw.values()}
+        if len(shapes) != 1 or len(next(iter(shapes))) != 2:
+            raise ValueError("모든 표는 같은 (듀티, 토크) 2차원 크기여야 합니다")
+        self.shape = shapes.pop()
+
+    # ------------------------------------------------------------------ 축
+
+    def duty_axis(self):
+        """듀티 격자 (0~1)"""
+        np = _require_numpy()
+        return (self.duty_start + self.duty_step * np.arange(self.shape[0])) / DUTY_ONE_Q16
+
+    def torque_axis(self):
+        """토크 격자 [Nm]"""
+        np = _require_numpy()
+        return (self.torque_start + self.torque_step * np.arange(self.shape[1])) * TORQUE_UNIT_NM
+
+    def values(self, name: str):
+        """표 값 (uint16 × LSB)"""
+        return self.raw[name] * self.lsb[name]
+
+    # ------------------------------------------------------------------ 조회
+
+    @staticmethod
+    def _axis_index(x: int, start: int, step: int, points: int) -> Tuple[int, int]:
+        """정수 축 좌표 → (하단 인덱스, 간격 내 위치) (격자 밖은 끝값으로 고정)"""
+        x = min(max(x - start, 0), step * (points - 1))
+        index, frac = divmod(x, step)
+        if index == points - 1:
+            index, frac = points - 2, step
+        return index, frac
+
+    def lookup_raw(self, duty_q16: int, torque_unm: int, name: str) -> int:
+        """MCU와 같은 정수 쌍선형 보간 (uint16 원시값)"""
+        table = self.raw[name]
+        i, fx = self._axis_index(duty_q16, self.duty_start, self.duty_step, self.shape[0])
+        j, fy = self._axis_index(torque_unm, self.torque_start, self.torque_step, self.shape[1])
+        v00, v01 = int(table[i, j]), int(table[i, j + 1])
+        v10, v11 = int(table[i + 1, j]), int(table[i + 1, j + 1])
+        low = v00 + _div_trunc((v01 - v00) * fy, self.torque_step)
+        high = v10 + _div_trunc((v11 - v10) * fy, self.torque_step)
+        return low + _div_trunc((high - low) * fx, self.duty_step)
+
+    def lookup(self, duty: float, torque_Nm: float, name: str) -> float:
+        """듀티(0~1), 출력 토크 [Nm]에서 표 값 조회 (정수 보간 후 LSB 환산)"""
+        return self.lookup_raw(round(duty * DUTY_ONE_Q16), round(torque_Nm / TORQUE_UNIT_NM), name) \
+            * self.lsb[name]
+
+    # ------------------------------------------------------------------ 내보내기
+
+    def to_bytes(self) -> bytes:
+        """바이너리 표 (헤더 + 표 메타데이터 + uint16 데이터 + CRC-32)"""
+        import struct
+        import zlib
+        parts = [struct.pack(_EFFMAP_HEADER, _EFFMAP_MAGIC, _EFFMAP_VERSION, self.shape[0], self.shape[1],
+                             len(self.raw), self.duty_start, self.duty_step,
+                             self.torque_start, self.torque_step)]
+        for name in self.raw:
+            parts.append(struct.pack(_EFFMAP_TABLE_ENTRY, name.encode('ascii'), self.lsb[name]))
+        for table in self.raw.values():
+            parts.append(table.astype('<u2').tobytes())
+        body = b''.join(parts)
+        return body + struct.pack('<I', zlib.crc32(body))
+
+    def write_blob(self, path: str):
+        """바이너리 표 파일 저장"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'EfficiencyMap':
+        """to_bytes() 결과 복원 (매직/버전/CRC 검사)"""
+        import struct
+        import zlib
+        np = _require_numpy()
+        if len(data) < struct.calcsize(_EFFMAP_HEADER) + 4 or data[:8] != _EFFMAP_MAGIC:
+            raise ValueError("효율 맵 파일이 아닙니다")
+        (crc,) = struct.unpack_from('<I', data, len(data) - 4)
+        if zlib.crc32(data[:-4]) != crc:
+            raise ValueError("효율 맵 CRC 불일치")
+        _, version, n_duty, n_torque, n_tables, duty_start, duty_step, torque_start, torque_step = \
+            struct.unpack_from(_EFFMAP_HEADER, data)
+        if version != _EFFMAP_VERSION:
+            raise ValueError(f"지원하지 않는 효율 맵 버전: {version}")
+        offset = struct.calcsize(_EFFMAP_HEADER)
+        entries = []
+        for _ in range(n_tables):
+            name, lsb = struct.unpack_from(_EFFMAP_TABLE_ENTRY, data, offset)
+            entries.append((name.rstrip(b'\0').decode('ascii'), lsb))
+            offset += struct.calcsize(_EFFMAP_TABLE_ENTRY)
+        tables = {}
+        count = n_duty * n_torque
+        for name, lsb in entries:
+            raw = np.frombuffer(data, dtype='<u2', count=count, offset=offset).reshape(n_duty, n_torque)
+            tables[name] = (raw.astype(np.uint16), lsb)
+            offset += 2 * count
+        return cls(duty_start, duty_step, torque_start, torque_step, tables)
+
+    @classmethod
+    def read_blob(cls, path: str) -> 'EfficiencyMap':
+        """바이너리 표 파일 읽기"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def c_header(self, prefix: str = 'effmap') -> str:
+        """C 헤더 (축/LSB 매크로, const uint16_t 표, 정수 보간 함수)"""
+        prefix = _c_identifier(prefix)
+        upper = prefix.upper()
+        n_duty, n_torque = self.shape
+        lines = [
+            f"/* {self.title or 'Efficiency map'} - generated by geared_motor_calculator.py */",
+            f"#ifndef {upper}_H",
+            f"#define {upper}_H",
+            "",
+            "#include <stdint.h>",
+            "",
+            f"#define {upper}_DUTY_POINTS    {n_duty}",
+            f"#define {upper}_TORQUE_POINTS  {n_torque}",
+            f"#define {upper}_DUTY_START     {self.duty_start}   /* Q16, 65536 = 100% */",
+            f"#define {upper}_DUTY_STEP      {self.duty_step}",
+            f"#define {upper}_TORQUE_START   {self.torque_start}   /* uNm at gearbox output */",
+            f"#define {upper}_TORQUE_STEP    {self.torque_step}",
+        ]
+        for name, lsb in self.lsb.items():
+            lines.append(f"#define {upper}_{name.upper()}_LSB  {lsb!r}f")
+        for name, table in self.raw.items():
+            lines.append("")
+            lines.append(f"static const uint16_t {prefix}_{name}[{n_duty}][{n_torque}] = {{")
+            for row in table.tolist():
+                lines.append("    {" + ", ".join(map(str, row)) + "},")
+            lines.append("};")
+        lines += [
+            "",
+            f"static inline void {prefix}_axis(int32_t x, int32_t start, int32_t step, int32_t points,",
+            "                                 int32_t *index, int32_t *frac)",
+            "{",
+            "    x -= start;",
+            "    if (x < 0) x = 0;",
+            "    if (x > step * (points - 1)) x = step * (points - 1);",
+            "    *index = x / step;",
+            "    *frac = x - *index * step;",
+            "    if (*index == points - 1) { *index = points - 2; *frac = step; }",
+            "}",
+            "",
+            f"static inline int32_t {prefix}_lookup(const uint16_t table[{upper}_DUTY_POINTS][{upper}_TORQUE_POINTS],",
+            "                                     int32_t duty_q16, int32_t torque_unm)",
+            "{",
+            "    int32_t i, fx, j, fy;",
+            f"    {prefix}_axis(duty_q16, {upper}_DUTY_START, {upper}_DUTY_STEP, {upper}_DUTY_POINTS, &i, &fx);",
+            f"    {prefix}_axis(torque_unm, {upper}_TORQUE_START, {upper}_TORQUE_STEP, {upper}_TORQUE_POINTS, &j, &fy);",
+            f"    int64_t low = table[i][j] + ((int64_t)(table[i][j + 1] - table[i][j]) * fy) / {upper}_TORQUE_STEP;",
+            f"    int64_t high = table[i + 1][j] + ((int64_t)(table[i + 1][j + 1] - table[i + 1][j]) * fy) / {upper}_TORQUE_STEP;",
+            f"    return (int32_t)(low + ((high - low) * fx) / {upper}_DUTY_STEP);",
+            "}",
+            "",
+            f"#endif /* {upper}_H */",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def write_c_header(self, path: str, prefix: str = 'effmap'):
+        """C 헤더 파일 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.c_header(prefix))
+
+
+def efficiency_map(designer: GearTrainDesigner, duty_points: int = 17, torque_points: int = 33,
+                   duty_range: Tuple[float, float] = (0.0, 1.0), torque_max_Nm: float = None) -> EfficiencyMap:
+    """
+    기어박스 출력 기준 (PWM 듀티, 부하 토크) 격자의 정상 상태 효율 맵 (벡터화)
+
+    Args:
+        designer: 기어 트레인이 설계된 GearTrainDesigner (비어 있으면 기본 설계)
+        duty_points, torque_points: 축별 격자 점 수
+            (듀티 축 간격은 버림이라 마지막 점이 duty_range를 넘지 않음.
+             범위가 (duty_points - 1)로 나누어떨어지면 끝점과 정확히 일치: 기본 17점 = 4096 간격)
+        duty_range: 듀티 범위 (0~1)
+        torque_max_Nm: 토크 축 최대값 [Nm] (None이면 듀티 100% 스톨 토크)
+
+    Returns:
+        current_A [A], output_rpm [RPM], efficiency(출력/전기 입력) 표를 담은 EfficiencyMap
+        - 카탈로그 값의 Kt와 Ke가 맞지 않으면 선형 모델 효율이 1을 넘을 수 있어 1로 제한
+    """
+    np = _require_numpy()
+    if duty_points < 2 or torque_points < 2:
+        raise ValueError("격자 점 수는 축마다 2 이상이어야 합니다")
+    if not designer.gear_stages:
+        designer.design_gear_train()
+    motor = designer.motor
+    ratio = designer.get_total_ratio()
+    total_efficiency = designer.get_total_efficiency()
+    torque_stall_Nm = motor.torque_stall_Nm
+    if torque_max_Nm is None:
+        torque_max_Nm = torque_stall_Nm * ratio * total_efficiency
+
+    # 정수 격자 (MCU와 같은 축 값으로 계산)
+    duty_start = round(duty_range[0] * DUTY_ONE_Q16)
+    duty_step = max(1, (round(duty_range[1] * DUTY_ONE_Q16) - duty_start) // (duty_points - 1))
+    torque_step = max(1, round(torque_max_Nm / TORQUE_UNIT_NM / (torque_points - 1)))
+    duty = (duty_start + duty_step * np.arange(duty_points))[:, None] / DUTY_ONE_Q16
+    load = (torque_step * np.arange(torque_points))[None, :] * TORQUE_UNIT_NM
+
+    # get_operating_point(T_m, D)와 같은 식 (스톨: 회전 0, 전류 I0 + (Is - I0)·D, D = 0이면 0)
+    load_fraction = load / (ratio * total_efficiency) / torque_stall_Nm
+    stalled = (duty <= 0) | (load_fraction > duty)
+    motor_rpm = np.where(stalled, 0.0, motor.rpm_no_load * (duty - load_fraction))
+    current = np.where(stalled,
+                       np.where(duty > 0, motor.current_no_load
+                                + (motor.current_stall - motor.current_no_load) * duty, 0.0),
+                       motor.current_no_load + (motor.current_stall - motor.current_no_load) * load_fraction)
+    output_rpm = motor_rpm / ratio
+    power_in = motor.voltage_nominal * duty * current
+    power_out = load * (output_rpm * 2 * math.pi / 60)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efficiency = np.where(power_in > 0, np.minimum(power_out / power_in, 1.0), 0.0)
+
+    gear = ' + '.join(stage.gear_type for stage in designer.gear_stages)
+    return EfficiencyMap(duty_start, duty_step, 0, torque_step, {
+        'current_A': current,
+        'output_rpm': output_rpm,
+        'efficiency': efficiency,
+    }, title=f"{motor.name} / {gear} {ratio:.2f}:1")
+
+
+# =============================================================================
+# 공차 몬테카를로 (양산 수율)
+# =============================================================================
+#
+# 카탈로그 값은 공칭값이고 양산 모터는 무부하 회전수/정지 토크/정지 전류가 ±10~15% 흩어집니다.
+# 설계된 기어 트레인(총 기어비·효율 고정)에 대해 모터 사양을 샘플링하고
+# evaluate_performance_batch()로 블록 단위 평가해 분포와 feasible 비율을 집계합니다.
+# 블록마다 SeedSequence.spawn()으로 독립 난수 스트림을 쓰므로 결과는 (seed, 샘플 수)로만 정해지고,
+# 분위수는 전체 샘플을 보관하지 않도록 고정 구간 히스토그램에서 보간합니다.
+
+# 기본 공차 (상대값, 정규분포이면 ±3σ)
+DEFAULT_SPEC_TOLERANCES = {'rpm_no_load': 0.10, 'torque_stall': 0.15, 'current_stall': 0.15}
+
+# 분포를 집계하는 performance_dtype() 필드
+MONTE_CARLO_FIELDS = ('torque_margin_percent', 'system_efficiency', 'actual_output_rpm')
+MONTE_CARLO_PERCENTILES = (1, 5, 50, 95, 99)
+
+# 블록(난수 스트림) 크기와 히스토그램 구간 수
+MONTE_CARLO_BLOCK = 1 << 17
+MONTE_CARLO_BINS = 4096
+
+
+def sample_motor_specs(motor: DCMotorSpec, size: int, rng, tolerances: dict = None,
+                       distribution: str = 'normal') -> dict:
+    """
+    공차를 적용한 모터 사양 샘플 (evaluate_performance_batch 인자 사전)
+
+    Args:
+        motor: 공칭 모터 사양
+        size: 샘플 수
+        rng: numpy.random.Generator
+        tolerances: {BATCH_MOTOR_FIELDS 필드: 상대 공차} (None이면 DEFAULT_SPEC_TOLERANCES)
+        distribution: 'normal'(σ = 공차/3, 출하 검사로 ±공차에서 절단) 또는 'uniform'
+
+    Returns:
+        필드별 배열 (공차가 없는 필드는 공칭 스칼라)
+    """
+    np = _require_numpy()
+    tolerances = DEFAULT_SPEC_TOLERANCES if tolerances is None else tolerances
+    specs = {field: getattr(motor, field) for field in BATCH_MOTOR_FIELDS}
+    for field, tolerance in tolerances.items():
+        if field not in specs:
+            raise KeyError(f"공차를 적용할 수 없는 필드: {field}")
+        if distribution == 'normal':
+            deviation = np.clip(rng.standard_normal(size), -3.0, 3.0) * (tolerance / 3)
+        elif distribution == 'uniform':
+            deviation = rng.uniform(-tolerance, tolerance, size)
+        else:
+            raise ValueError(f"알 수 없는 분포: {distribution}")
+        specs[field] = specs[field] * (1 + deviation)
+    return specs
+
+
+class _Histogram:
+    """고정 구간 스트리밍 히스토그램 (범위는 첫 블록에서 여유를 두고 결정, 밖의 값은 양 끝 구간)"""
+
+    def __init__(self, values, bins: int):
+        np = _require_numpy()
+        lo, hi = float(values.min()), float(values.max())
+        pad = (hi - lo) * 0.25 or max(abs(lo), 1.0) * 1e-6
+        self.lo, self.hi = lo - pad, hi + pad
+        self.scale = bins / (self.hi - self.lo)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.total = self.sum = self.sum_sq = 0.0
+        self.min, self.max = math.inf, -math.inf
+
+    def add(self, values):
+        np = _require_numpy()
+        bins = self.counts.size
+        index = np.clip(((values - self.lo) * self.scale).astype(np.int64), 0, bins - 1)
+        self.counts += np.bincount(index, minlength=bins)
+        self.total += values.size
+        self.sum += float(values.sum())
+        self.sum_sq += float(np.dot(values, values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def percentile(self, q: float) -> float:
+        """구간 안 균등 분포로 보간한 분위수 (해상도: 범위 / 구간 수)"""
+        np = _require_numpy()
+        cumulative = np.cumsum(self.counts)
+        rank = q / 100 * self.total
+        index = min(int(np.searchsorted(cumulative, rank, side='left')), self.counts.size - 1)
+        before = cumulative[index - 1] if index else 0
+        fraction = (rank - before) / self.counts[index] if self.counts[index] else 0.0
+        value = self.lo + (index + fraction) / self.scale
+        return float(min(max(value, self.min), self.max))
+
+    def summary(self, percentiles) -> dict:
+        mean = self.sum / self.total
+        result = {'mean': mean,
+                  'std': math.sqrt(max(0.0, self.sum_sq / self.total - mean * mean)),
+                  'min': self.min,
+                  'max': self.max}
+        for q in percentiles:
+            result[f'p{q:g}'] = self.percentile(q)
+        return result
+
+
+def monte_carlo_yield(designer: GearTrainDesigner, samples: int = 1000000, tolerances: dict = None,
+                      distribution: str = 'normal', seed: int = 0,
+                      block_size: int = MONTE_CARLO_BLOCK) -> dict:
+    """
+    모터 사양 공차에 대한 몬테카를로 성능 분포와 양산 수율 (벡터화)
+
+    Args:
+        designer: 기어 트레인이 설계된 GearTrainDesigner (비어 있으면 기본 설계)
+        samples: 샘플 수
+        tolerances, distribution: sample_motor_specs() 참고
+        seed: 난수 시드 (같은 seed, samples, block_size면 같은 결과)
+        block_size: 블록(난수 스트림)당 샘플 수
+
+    Returns:
+        feasible_percent, stalled_percent, MONTE_CARLO_FIELDS별 평균/표준편차/최소/최대/분위수,
+        공칭 analyze_performance() 값(nominal)과 계산 시간
+    """
+    import time
+    np = _require_numpy()
+    if samples < 1:
+        raise ValueError("샘플 수는 1 이상이어야 합니다")
+    if not designer.gear_stages:
+        designer.design_gear_train()
+    total_ratio = designer.get_total_ratio()
+    total_efficiency = designer.get_total_efficiency()
+    torque_output_Nm = designer.target.torque_output_Nm
+    # 단별 입력 토크는 목표 토크로 정해지므로 기어 강도 부족은 모든 샘플에 공통
+    overstressed = bool(designer.overstressed_stages())
+
+    started = time.perf_counter()
+    streams = np.random.SeedSequence(seed).spawn(-(-samples // block_size))
+    histograms = None
+    feasible = stalled = 0
+    for block, stream in enumerate(streams):
+        size = min(block_size, samples - block * block_size)
+        specs = sample_motor_specs(designer.motor, size, np.random.default_rng(stream),
+                                   tolerances, distribution)
+        perf = evaluate_performance_batch(torque_output_Nm=torque_output_Nm, total_ratio=total_ratio,
+                                          total_efficiency=total_efficiency, **specs)
+        perf = np.broadcast_to(perf, (size,))
+        if histograms is None:
+            histograms = {field: _Histogram(perf[field], MONTE_CARLO_BINS) for field in MONTE_CARLO_FIELDS}
+        for field, histogram in histograms.items():
+            histogram.add(perf[field])
+        if not overstressed:
+            feasible += int(np.count_nonzero(perf['feasible']))
+        stalled += int(np.count_nonzero(perf['torque_margin_percent'] < 0))
+    wall = time.perf_counter() - started
+
+    result = {
+        'samples': samples,
+        'seed': seed,
+        'distribution': distribution,
+        'tolerances': dict(DEFAULT_SPEC_TOLERANCES if tolerances is None else tolerances),
+        'feasible_percent': feasible / samples * 100,
+        'stalled_percent': stalled / samples * 100,
+        'nominal': designer.analyze_performance(),
+        'wall_time_s': wall,
+        'samples_per_s': samples / wall if wall > 0 else math.inf,
+    }
+    for field, histogram in histograms.items():
+        result[field] = histogram.summary(MONTE_CARLO_PERCENTILES)
+    return result
+
+
+# =============================================================================
+# 계측 (프로파일링 훅)
+# =============================================================================
+#
+# 구현은 저장소 루트의 common/profile_hooks.py (HW/Electronics/kicad_generator.py와 공용),
+# 여기서는 이 모듈의 계측 대상만 정의합니다. --profile을 줄 때만 임포트하므로
+# 저장소 밖으로 복사한 스크립트도 common/ 없이 실행됩니다.
+
+PROFILE_TARGETS = [
+    (GearTrainDesigner, 'design_gear_train'),
+    (GearTrainDesigner, '_select_modules'),
+    (GearTrainDesigner, 'analyze_performance'),
+    (MotorCatalog, 'write'),
+    (DriveSimulator, 'run'),
+    (None, 'monte_carlo_yield'),
+    (None, 'run_batch'),
+]
+
+PROFILER = None     # profiler() 첫 호출 시 생성
+
+
+def profiler():
+    """모듈 Profiler (common/profile_hooks.py가 없으면 ImportError)"""
+    global PROFILER
+    if PROFILER is None:
+        try:
+            from profile_hooks import Profiler
+        except ImportError:
+            # sys.path에 없으면 저장소 루트 common/에서 직접 로드
+            import importlib.util
+            path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'common', 'profile_hooks.py')
+            if not os.path.exists(path):
+                raise ImportError(f"--profile에 필요한 {path} 파일이 없습니다") from None
+            spec = importlib.util.spec_from_file_location('profile_hooks', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            Profiler = module.Profiler
+        PROFILER = Profiler(PROFILE_TARGETS, __name__)
+    return PROFILER
+
+
+def print_motor_info(motor: DCMotorSpec):
+    """모터 정보 출력"""
+    print("\n" + "="*70)
+    print(f"  DC 모터 사양: {motor.name}")
+    print("="*70)
+    
+    print(f"\n  [기본 사양]")
+    print(f"    정격 전압        : {motor.voltage_nominal:>8.1f} V")
+    print(f"    무부하 전류      : {motor.current_no_load:>8.3f} A")
+    print(f"    정지(스톨) 전류  : {motor.current_stall:>8.2f} A")
+    print(f"    무부하 회전수    : {motor.rpm_no_load:>8.0f} RPM")
+    print(f"    정지 토크        : {motor.torque_stall:>8.1f} mNm")
+    
+    print(f"\n  [물리적 사양]")
+    print(f"    직경             : {motor.diameter:>8.1f} mm")
+    print(f"    길이             : {motor.length:>8.1f} mm")
+    print(f"    무게             : {motor.weight:>8.1f} g")
+    
+    print(f"\n  [계산된 상수]")
+    print(f"    역기전력 상수 Ke : {motor.Ke*1000:>8.3f} mV/(rad/s)")
+    print(f"    토크 상수 Kt     : {motor.Kt*1000:>8.3f} mNm/A")
+    print(f"    전기자 저항 Ra   : {motor.R_armature:>8.2f} Ω")
+    print(f"    최대 출력        : {motor.power_max:>8.3f} W")
+
+
+def print_target_info(target: TargetSpec):
+    """목표 사양 출력"""
+    print("\n" + "="*70)
+    print("  목표 사양")
+    print("="*70)
+    print(f"    목표 출력 회전수 : {target.rpm_output:>8.1f} RPM")
+    print(f"    목표 출력 토크   : {target.torque_output_mNm:>8.1f} mNm ({target.torque_output_Nm:.4f} Nm)")
+    print(f"    목표 출력        : {target.power_output:>8.3f} W")
+
+
+def print_gear_design(designer: GearTrainDesigner):
+    """기어 설계 결과 출력"""
+    print("\n" + "="*70)
+    print("  기어 트레인 설계 결과")
+    print("="*70)
+    
+    if isinstance(designer.gear_type, str) and all(
+            stage.gear_type == designer.gear_type for stage in designer.gear_stages):
+        print(f"\n  기어 종류: {designer.gear_type.upper()}")
+    else:
+        print(f"\n  기어 종류: {' + '.join(stage.gear_type.upper() for stage in designer.gear_stages)}")
+    print(f"  기어 단수: {len(designer.gear_stages)}단")
+    
+    for i, stage in enumerate(designer.gear_stages, 1):
+        print(f"\n  [Stage {i}]")
+        print(f"    기어비           : {stage.ratio:>8.2f}:1")
+        if isinstance(stage, PlanetaryStage):
+            print(f"    선기어 잇수      : {stage.teeth_driving:>8d} 치")
+            print(f"    유성 기어 잇수   : {stage.teeth_planet:>8d} 치 × {stage.num_planets}")
+            print(f"    링 기어 잇수     : {stage.teeth_driven:>8d} 치")
+            print(f"    모듈             : {stage.module:>8.2f} mm")
+            print(f"    선기어 PCD       : {stage.pitch_diameter_driving:>8.1f} mm")
+            print(f"    링 기어 PCD      : {stage.pitch_diameter_driven:>8.1f} mm")
+        else:
+            print(f"    구동 기어 잇수   : {stage.teeth_driving:>8d} 치")
+            print(f"    피동 기어 잇수   : {stage.teeth_driven:>8d} 치")
+            print(f"    모듈             : {stage.module:>8.2f} mm")
+            print(f"    구동 기어 PCD    : {stage.pitch_diameter_driving:>8.1f} mm")
+            print(f"    피동 기어 PCD    : {stage.pitch_diameter_driven:>8.1f} mm")
+        print(f"    단 효율          : {stage.efficiency*100:>8.1f} %")
+
+
+def print_performance_analysis(perf: dict):
+    """성능 분석 결과 출력"""
+    print("\n" + "="*70)
+    print("  성능 분석 결과")
+    print("="*70)
+    
+    print(f"\n  [기어 시스템]")
+    print(f"    총 기어비        : {perf['total_ratio']:>8.2f}:1")
+    print(f"    총 기어 효율     : {perf['total_efficiency']*100:>8.1f} %")
+    
+    print(f"\n  [모터 동작점]")
+    print(f"    필요 모터 토크   : {perf['required_motor_torque_mNm']:>8.2f} mNm")
+    print(f"    모터 회전수      : {perf['motor_operating_rpm']:>8.0f} RPM")
+    print(f"    모터 전류        : {perf['motor_operating_current']:>8.3f} A")
+    print(f"    토크 마진        : {perf['torque_margin_percent']:>8.1f} %")
+    
+    print(f"\n  [출력 성능]")
+    print(f"    출력 회전수      : {perf['actual_output_rpm']:>8.1f} RPM")
+    print(f"    출력 토크        : {perf['actual_output_torque_mNm']:>8.2f} mNm ({perf['actual_output_torque_Nm']:.4f} Nm)")
+    print(f"    출력 파워        : {perf['actual_output_power_W']:>8.3f} W")
+    print(f"    시스템 효율      : {perf['system_efficiency']*100:>8.1f} %")
+    
+    print(f"\n  [설계 적합성]")
+    if perf['feasible']:
+        print("    ✅ 설계 가능 - 모터가 목표 성능을 달성할 수 있습니다.")
+    elif perf['gear_overstressed']:
+        print("    ❌ 설계 불가 - 가장 큰 표준 모듈로도 기어 강도가 부족한 단이 있습니다.")
+        print("       (단수를 늘리거나 재질을 바꾸세요)")
+    else:
+        print("    ❌ 설계 불가 - 더 강력한 모터가 필요합니다.")
+        print("       (토크 마진이 20% 미만입니다)")
+
+
+def print_monte_carlo(report: dict):
+    """monte_carlo_yield() 결과 출력"""
+    print("\n" + "="*70)
+    print("  공차 몬테카를로 (양산 수율)")
+    print("="*70)
+    
+    tolerances = ', '.join(f"{field} ±{tol*100:.0f}%" for field, tol in report['tolerances'].items())
+    print(f"\n  샘플 {report['samples']:,}개 ({report['distribution']}, seed={report['seed']}): {tolerances}")
+    print(f"  계산 시간 {report['wall_time_s']:.2f} s ({report['samples_per_s']/1e6:.1f} M샘플/s)")
+    
+    rows = (('토크 마진 [%]', 'torque_margin_percent', 1),
+            ('시스템 효율 [%]', 'system_efficiency', 100),
+            ('출력 회전수 [RPM]', 'actual_output_rpm', 1))
+    percentiles = [f'p{q:g}' for q in MONTE_CARLO_PERCENTILES]
+    print(f"\n  {'':<18}{'공칭':>8}{'평균':>8}{'σ':>8}" + ''.join(f"{p:>8}" for p in percentiles))
+    for label, field, scale in rows:
+        stats = report[field]
+        values = [report['nominal'][field], stats['mean'], stats['std']] + [stats[p] for p in percentiles]
+        print(f"  {label:<18}" + ''.join(f"{v * scale:>8.1f}" for v in values))
+    
+    print(f"\n  [수율]")
+    print(f"    설계 적합 (마진 ≥ 20%) : {report['feasible_percent']:>6.2f} %")
+    print(f"    스톨 (마진 < 0%)       : {report['stalled_percent']:>6.2f} %")
+
+
+def print_theory():
+    """이론 설명 출력"""
+    print("\n" + "="*70)
+    print("  기어드 모터 설계 이론")
+    print("="*70)
+    
+    theory_text = """
+  1. DC 모터 기본 특성
+  ───────────────────────────────────────────────────────────────────
+  
+  DC 모터는 전기 에너지를 기계적 회전 에너지로 변환합니다.
+  
+  • 역기전력 (Back-EMF): E = Ke × ω
+    - 모터가 회전하면 역방향 전압이 발생
+    - Ke: 역기전력 상수 [V/(rad/s)]
+    
+  • 토크 생성: T = Kt × I
+    - 전류에 비례하여 토크 발생
+    - Kt: 토크 상수 [Nm/A]
+    - 이상적으로 Ke = Kt (SI 단위계에서)
+    
+  • 토크-속도 특성 (선형):
+    
+    토크(T) ▲
+            │╲
+    T_stall │ ╲
+            │  ╲
+            │   ╲
+            │    ╲
+            └─────╲──────► 속도(ω)
+                   ω_no_load
+    
+    ω = ω_no_load × (1 - T/T_stall)
+    
+  • 최대 효율점: 정지 토크의 약 50% 지점
+  • 최대 출력점: 정지 토크의 약 50% 지점
+
+
+  2. 기어 감속 원리
+  ───────────────────────────────────────────────────────────────────
+  
+  기어비 G = N_driven / N_driving = 피동기어 잇수 / 구동기어 잇수
+  
+  • 속도 변환: ω_out = ω_in / G
+    - G > 1: 감속 (속도 감소)
+    - G < 1: 증속 (속도 증가)
+    
+  • 토크 변환: T_out = T_in × G × η
+    - η: 기어 효율 (0 < η < 1)
+    - 감속 시 토크 증가 (힘 증폭)
+    
+  • 출력 보존 (이상적):
+    P_out = P_in × η
+    T_out × ω_out = (T_in × ω_in) × η
+
+
+  3. 다단 기어 시스템
+  ───────────────────────────────────────────────────────────────────
+  
+  큰 기어비가 필요한 경우 여러 단을 직렬 연결합니다.
+  
+    ┌─────┐    ┌─────┐    ┌─────┐
+    │ G1  │────│ G2  │────│ G3  │
+    └─────┘    └─────┘    └─────┘
+      η1         η2         η3
+  
+  • 총 기어비: G_total = G1 × G2 × G3
+  • 총 효율: η_total = η1 × η2 × η3
+  
+  예) 100:1 감속 필요 시
+      - 단일 단: 100:1 (비실용적, 기어가 너무 큼)
+      - 3단: 약 4.64:1 × 4.64:1 × 4.64:1 ≈ 100:1
+
+
+  4. 기어 종류별 특성
+  ───────────────────────────────────────────────────────────────────
+  
+  │ 기어 종류   │ 효율  │ 최대 기어비 │ 특징                    │
+  │────────────│──────│───────────│────────────────────────│
+  │ 평기어     │ ~98% │ 6:1       │ 단순, 저렴, 소음 있음    │
+  │ 헬리컬     │ ~97% │ 8:1       │ 저소음, 축방향 하중      │
+  │ 베벨      │ ~96% │ 5:1       │ 축 방향 변경 가능        │
+  │ 웜        │ ~75% │ 60:1      │ 자기잠금, 큰 감속비      │
+  │ 유성기어   │ ~97% │ 10:1      │ 컴팩트, 동축, 고토크     │
+
+
+  5. 기어 치수 설계
+  ───────────────────────────────────────────────────────────────────
+  
+  • 모듈 (m): 기어 크기의 기준
+    - 피치원 직경: d = m × z (z: 잇수)
+    - 이끝원 직경: da = d + 2m
+    - 이뿌리원 직경: df = d - 2.5m
+    
+  • 중심거리: a = m × (z1 + z2) / 2
+  
+  • 모듈 선정 (강도): 각 단 입력 토크 T, 치폭 b = 10m, Ft = 2T / (m·z1)
+    - Lewis 굽힘: σF = Ft / (b·m·Y) ≤ σFa,  Y = π(0.154 − 0.912/z)
+    - Hertz 접촉: σH = ZE·ZH·√(Ft(u+1) / (b·d1·u)) ≤ σHa
+    → 두 조건을 만족하는 가장 작은 표준 모듈
+  
+  • 최소 잇수: 일반적으로 12~18치 (언더컷 방지)
+
+
+  6. 설계 시 고려사항
+  ───────────────────────────────────────────────────────────────────
+  
+  • 토크 마진: 정지 토크의 80% 이하에서 운전 권장
+  • 열 관리: 연속 운전 시 모터 발열 고려
+  • 백래시: 정밀 위치 제어 시 중요
+  • 관성: 부하 관성과 모터 관성의 매칭
+  • 공진: 시스템 고유진동수 회피
+"""
+    print(theory_text)
+
+
+def interactive_mode():
+    """대화형 모드로 실행"""
+    print("\n" + "="*70)
+    print("  기어드 모터 설계 계산기")
+    print("="*70)
+    print("\n  DC 모터의 사양과 목표 성능을 입력하면")
+    print("  필요한 기어비와 기어 구성을 자동으로 계산합니다.\n")
+    
+    # 모터 사양 입력
+    print("  [DC 모터 사양 입력]")
+    print("  (Enter를 누르면 기본값 사용)\n")
+    
+    def get_float(prompt, default):
+        val = input(f"    {prompt} [{default}]: ").strip()
+        return float(val) if val else default
+    
+    def get_str(prompt, default):
+        val = input(f"    {prompt} [{default}]: ").strip()
+        return val if val else default
+    
+    name = get_str("모터 이름", "FA-130")
+    voltage = get_float("정격 전압 (V)", 3.0)
+    current_no_load = get_float("무부하 전류 (A)", 0.15)
+    current_stall = get_float("정지(스톨) 전류 (A)", 2.2)
+    rpm_no_load = get_float("무부하 회전수 (RPM)", 9600)
+    torque_stall = get_float("정지 토크 (mNm)", 11.8)
+    diameter = get_float("모터 직경 (mm)", 20.4)
+    length = get_float("모터 길이 (mm)", 25.1)
+    weight = get_float("모터 무게 (g)", 18.0)
+    
+    motor = DCMotorSpec(
+        name=name,
+        voltage_nominal=voltage,
+        current_no_load=current_no_load,
+        current_stall=current_stall,
+        rpm_no_load=rpm_no_load,
+        torque_stall=torque_stall,
+        diameter=diameter,
+        length=length,
+        weight=weight
+    )
+    
+    # 목표 사양 입력
+    print("\n  [목표 사양 입력]\n")
+    target_rpm = get_float("목표 출력 회전수 (RPM)", 100)
+    target_torque = get_float("목표 출력 토크 (mNm)", 500)
+    
+    target = TargetSpec(
+        rpm_output=target_rpm,
+        torque_output_Nm=target_torque / 1000
+    )
+    
+    # 기어 종류 선택
+    print("\n  [기어 종류 선택]")
+    print("    1. spur (평기어) - 기본")
+    print("    2. helical (헬리컬 기어)")
+    print("    3. planetary (유성 기어)")
+    print("    4. worm (웜 기어)")
+    
+    gear_choice = input("\n    선택 [1]: ").strip()
+    gear_types = {'1': 'spur', '2': 'helical', '3': 'planetary', '4': 'worm', '': 'spur'}
+    gear_type = gear_types.get(gear_choice, 'spur')
+    
+    # 설계 및 분석
+    designer = GearTrainDesigner(motor, target, gear_type)
+    designer.design_gear_train()
+    performance = designer.analyze_performance()
+    
+    # 결과 출력
+    print_motor_info(motor)
+    print_target_info(target)
+    print_gear_design(designer)
+    print_performance_analysis(performance)
+    
+    # 이론 출력 여부
+    show_theory = input("\n  이론 설명을 보시겠습니까? (y/n) [n]: ").strip().lower()
+    if show_theory == 'y':
+        print_theory()
+    
+    return motor, target, designer, performance
+
+
+def example_calculation():
+    """예제 계산 실행"""
+    print("\n" + "="*70)
+    print("  기어드 모터 설계 예제")
+    print("="*70)
+    
+    # 예제 1: 소형 로봇용 모터 (FA-130 기반)
+    motor1 = DCMotorSpec(
+        name="FA-130 (3V)",
+        voltage_nominal=3.0,
+        current_no_load=0.15,
+        current_stall=2.2,
+        rpm_no_load=9600,
+        torque_stall=11.8,
+        diameter=20.4,
+        length=25.1,
+        weight=18.0
+    )
+    
+    # 예제 2: 중형 모터 (RS-385)
+    motor2 = DCMotorSpec(
+        name="RS-385 (12V)",
+        voltage_nominal=12.0,
+        current_no_load=0.08,
+        current_stall=3.8,
+        rpm_no_load=7400,
+        torque_stall=98.0,
+        diameter=28.0,
+        length=38.0,
+        weight=65.0
+    )
+    
+    # 목표 사양: 로봇 바퀴 구동 (100 RPM, 500 mNm)
+    target = TargetSpec(
+        rpm_output=100,
+        torque_output_Nm=0.5
+    )
+    
+    print("\n  예제: 로봇 바퀴 구동 시스템 설계")
+    print("  목표: 100 RPM, 500 mNm 토크")
+    
+    for motor in [motor1, motor2]:
+        print_motor_info(motor)
+        print_target_info(target)
+        
+        designer = GearTrainDesigner(motor, target, 'spur')
+        designer.design_gear_train()
+        performance = designer.analyze_performance()
+        
+        print_gear_design(designer)
+        print_performance_analysis(performance)
+    
+    print_theory()
+
+
+def _designer_from_request(request: dict) -> GearTrainDesigner:
+    """NDJSON 요청 한 건으로 기어 트레인 설계"""
+    motor_fields = dict(request['motor'])
+    motor_fields.setdefault('name', '')
+    for optional in ('diameter', 'length', 'weight'):
+        motor_fields.setdefault(optional, 0.0)
+    motor = DCMotorSpec(**motor_fields)
+    
+    target_fields = dict(request['target'])
+    if 'torque_output_mNm' in target_fields:
+        target_fields['torque_output_Nm'] = target_fields.pop('torque_output_mNm') / 1000
+    target = TargetSpec(**target_fields)
+    
+    designer = GearTrainDesigner(motor, target, request.get('gear_type', 'spur'),
+                                 request.get('motor_efficiency', 0.85))
+    # 기어비 < 1이면 design_gear_train()이 경고를 stdout에 출력하므로 건너뜀
+    if designer.calculate_required_ratio() >= 1:
+        if 'gear_types' in request:
+            designer.design_mixed_gear_train(request['gear_types'], request.get('objective') or 'efficiency',
+                                             request.get('ratio_tolerance'),
+                                             request.get('preferred_stages') or MAX_STAGES)
+        else:
+            designer.design_gear_train(request.get('preferred_stages'), request.get('objective'),
+                                       request.get('ratio_tolerance'))
+    return designer
+
+
+def _design_from_request(request: dict) -> dict:
+    """NDJSON 요청 한 건 처리 → 결과 사전"""
+    designer = _designer_from_request(request)
+    if 'gear_types' in request or not isinstance(designer.gear_type, str):
+        gear_type = [stage.gear_type for stage in designer.gear_stages]
+    else:
+        gear_type = designer.gear_type
+    result = {'id': request.get('id'), 'gear_type': gear_type,
+              'num_stages': len(designer.gear_stages)}
+    result.update(designer.analyze_performance())
+    return result
+
+
+def run_batch(in_stream, out_stream) -> Tuple[int, int]:
+    """
+    NDJSON 배치 모드: 한 줄에 요청 하나를 읽고 결과 한 줄을 바로 기록
+    
+    요청 예:
+        {"id": 1, "motor": {"voltage_nominal": 3.0, "current_no_load": 0.15,
+         "current_stall": 2.2, "rpm_no_load": 9600, "torque_stall": 11.8},
+         "target": {"rpm_output": 100, "torque_output_mNm": 500},
+         "gear_type": "spur", "objective": null}
+    
+    "gear_type"에 단별 종류 목록(["worm", "spur"])을 주면 그 구성으로, "gear_types"에
+    사용할 종류 목록을 주면 design_mixed_gear_train()으로 종류 구성까지 탐색합니다
+    (preferred_stages는 최대 단수). 이때 결과의 gear_type은 단별 종류 목록입니다.
+    
+    결과는 id, gear_type, num_stages와 analyze_performance() 필드이며, 잘못된 요청은
+    {"id", "line", "error"} 줄로 기록하고 다음 줄을 계속 처리합니다.
+    같은 설계가 반복되는 배치가 많으므로 실행하는 동안 평가 캐시를 켜고, 끝나면
+    이전 설정으로 되돌립니다.
+    
+    Returns:
+        (처리 건수, 오류 건수)
+    """
+    previous = _EVALUATION_CACHE_ENABLED
+    set_evaluation_cache(True)
+    try:
+        return _run_batch(in_stream, out_stream)
+    finally:
+        set_evaluation_cache(previous)
+
+
+def _run_batch(in_stream, out_stream) -> Tuple[int, int]:
+    """run_batch()의 처리 본체"""
+    import json
+    
+    count = errors = 0
+    for line_no, line in enumerate(in_stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        count += 1
+        request = None
+        try:
+            request = json.loads(line)
+            result = _design_from_request(request)
+        except Exception as exc:
+            errors += 1
+            request_id = request.get('id') if isinstance(request, dict) else None
+            result = {'id': request_id, 'line': line_no, 'error': f"{type(exc).__name__}: {exc}"}
+        out_stream.write(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+        out_stream.write('\n')
+    out_stream.flush()
+    return count, errors
+
+
+def main(argv=None) -> int:
+    """명령행 진입점"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="기어드 모터 설계 계산기")
+    parser.add_argument('--example', action='store_true', help="예제 계산 실행")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help="NDJSON 배치 모드 (FILE 생략 또는 '-'이면 stdin)")
+    parser.add_argument('--output', default='-', metavar='FILE',
+                        help="배치 결과 NDJSON 파일 (기본: stdout)")
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help="계측 활성화: PREFIX.json(카운터), PREFIX.trace.json(Chrome trace) 저장")
+    parser.add_argument('--efficiency-map', nargs=2, metavar=('REQUEST', 'PREFIX'),
+                        help="배치 요청 형식 JSON 파일로 설계한 구동계의 (듀티, 토크) 효율 맵을 "
+                             "PREFIX.h(C 표), PREFIX.bin(바이너리)으로 저장")
+    parser.add_argument('--map-points', nargs=2, type=int, default=(17, 33), metavar=('DUTY', 'TORQUE'),
+                        help="효율 맵 격자 점 수 (기본: 17 33)")
+    parser.add_argument('--monte-carlo', metavar='REQUEST',
+                        help="배치 요청 형식 JSON 파일로 설계한 구동계의 모터 사양 공차 몬테카를로 "
+                             "(요청에 tolerances, distribution 지정 가능)")
+    parser.add_argument('--samples', type=int, default=1000000, metavar='N',
+                        help="몬테카를로 샘플 수 (기본: 1000000)")
+    parser.add_argument('--seed', type=int, default=0, help="몬테카를로 난수 시드 (기본: 0)")
+    args = parser.parse_args(argv)
+    
+    if args.profile:
+        try:
+            profiler().enable()
+        except ImportError as exc:
+            parser.error(str(exc))
+        try:
+            return _run_cli(args)
+        finally:
+            profiler().disable()
+            profiler().write(args.profile)
+            print(f"계측 결과 저장: {args.profile}.json, {args.profile}.trace.json", file=sys.stderr)
+    return _run_cli(args)
+
+
+def _run_cli(args) -> int:
+    """main()에서 파싱한 인자로 실행"""
+    if args.batch is not None:
+        in_stream = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+        out_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            count, errors = run_batch(in_stream, out_stream)
+        finally:
+            if in_stream is not sys.stdin:
+                in_stream.close()
+            if out_stream is not sys.stdout:
+                out_stream.close()
+        print(f"{count}건 처리, 오류 {errors}건", file=sys.stderr)
+        return 1 if errors else 0
+    
+    if args.efficiency_map:
+        import json
+        request_path, prefix = args.efficiency_map
+        with open(request_path, encoding='utf-8') as f:
+            designer = _designer_from_request(json.load(f))
+        emap = efficiency_map(designer, *args.map_points)
+        emap.write_c_header(prefix + '.h', os.path.basename(prefix))
+        emap.write_blob(prefix + '.bin')
+        print(f"효율 맵 저장: {prefix}.h, {prefix}.bin ({emap.title}, "
+              f"{emap.shape[0]}×{emap.shape[1]} 격자, 표 {len(emap.raw)}개)")
+        return 0
+    
+    if args.monte_carlo:
+        import json
+        with open(args.monte_carlo, encoding='utf-8') as f:
+            request = json.load(f)
+        report = monte_carlo_yield(_designer_from_request(request), args.samples,
+                                   request.get('tolerances'), request.get('distribution', 'normal'),
+                                   args.seed)
+        print_monte_carlo(report)
+        return 0
+    
+    if args.example:
+        example_calculation()
+    else:
+        interactive_mode()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
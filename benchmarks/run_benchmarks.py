@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+기어드 모터 계산기 / KiCad 회로도 생성기 벤치마크
+
+각 케이스를 별도 프로세스에서 실행해 벽시계 시간, 최대 RSS, tracemalloc 할당 피크를
+측정하고 JSON 기준값(baseline)과 비교합니다.
+
+사용법:
+    python benchmarks/run_benchmarks.py                      # 전체 실행 + 기준값 비교
+    python benchmarks/run_benchmarks.py --save-baseline      # 현재 결과를 기준값으로 저장
+    python benchmarks/run_benchmarks.py -k schematic --max-size 10000
+    python benchmarks/run_benchmarks.py --threshold 0.1 --output result.json
+    python benchmarks/run_benchmarks.py --startup           # 명령행 시작 시간 / 모듈별 임포트 비용
+
+기준값 대비 시간/메모리가 threshold(기본 20%) 이상 늘어난 케이스가 있으면 종료 코드 1.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'Motor'))
+sys.path.insert(0, os.path.join(ROOT, 'HW', 'Electronics'))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+# =============================================================================
+# 벤치마크 케이스
+# =============================================================================
+#
+# 각 케이스 함수는 (setup 끝난) 실행 함수를 반환합니다. setup 시간은 측정하지 않습니다.
+
+def _sample_motor():
+    from geared_motor import DCMotorSpec
+    return DCMotorSpec(name="RF-500TB", voltage_nominal=3.0, current_no_load=0.15,
+                       current_stall=2.2, rpm_no_load=9600, torque_stall=11.8,
+                       diameter=24.0, length=32.0, weight=45.0)
+
+
+def case_operating_point(n):
+    motor = _sample_motor()
+    loads = [0.0118 * i / n for i in range(n)]
+
+    def run():
+        for load in loads:
+            motor.get_operating_point(load)
+    return run
+
+
+def case_design_scalar(n):
+    from geared_motor import GearTrainDesigner, TargetSpec
+    motor = _sample_motor()
+    targets = [TargetSpec(rpm_output=40 + (i % 200), torque_output_Nm=0.05 + 0.001 * (i % 50))
+               for i in range(n)]
+
+    def run():
+        for target in targets:
+            designer = GearTrainDesigner(motor, target, 'spur')
+            designer.design_gear_train()
+            designer.analyze_performance()
+    return run
+
+
+def case_design_mixed_size(n):
+    """모든 기어 종류 혼합 + objective='size' (유성 단 포함 잇수 합 최소 탐색)"""
+    from geared_motor import GearTrainDesigner, TargetSpec, optimize_gear_types
+    motor = _sample_motor()
+    ratios = (99.9, 41.3, 370.0, 14.8, 1000.0)
+    targets = [TargetSpec(rpm_output=9600 / ratios[i % len(ratios)], torque_output_Nm=0.05)
+               for i in range(n)]
+
+    def run():
+        optimize_gear_types.cache_clear()
+        for target in targets:
+            GearTrainDesigner(motor, target).design_mixed_gear_train(objective='size')
+    return run
+
+
+def case_design_batch(n):
+    import numpy as np
+    from geared_motor import analyze_performance_batch
+    rng = np.random.default_rng(0)
+    rpm_output = rng.uniform(40, 240, n)
+    torque = rng.uniform(0.05, 0.1, n)
+
+    def run():
+        analyze_performance_batch(3.0, 0.15, 2.2, 9600.0, 11.8, rpm_output, torque, gear_type='spur')
+    return run
+
+
+def case_monte_carlo(n):
+    from geared_motor import GearTrainDesigner, TargetSpec, monte_carlo_yield
+    designer = GearTrainDesigner(_sample_motor(), TargetSpec(rpm_output=120, torque_output_Nm=0.08), 'spur')
+    designer.design_gear_train()
+
+    def run():
+        monte_carlo_yield(designer, n)
+    return run
+
+
+def _synthetic_board(n):
+    """n개 부품의 합성 보드 (BL520 부품을 반복 배치, 2~3핀 넷)"""
+    from kicad_generator import COMPONENTS, Component
+    components = []
+    nets = {'GND': []}
+    for i in range(n):
+        proto = COMPONENTS[i % len(COMPONENTS)]
+        ref = f"{proto.ref.rstrip('0123456789')}{i + 1}"
+        components.append(Component(ref, proto.value, proto.footprint, proto.lib_id,
+                                    25.4 + (i % 100) * 10.16, 25.4 + (i // 100) * 10.16, proto.rotation))
+    for i in range(1, n):
+        nets[f"N{i}"] = [f"{components[i - 1].ref}.2", f"{components[i].ref}.1"]
+    nets['GND'] = [f"{comp.ref}.1" for comp in components[::10]]
+    return components, nets
+
+
+def case_schematic(n):
+    from kicad_generator import KiCadSchematicGenerator
+    components, _ = _synthetic_board(n)
+    generator = KiCadSchematicGenerator("Bench")
+    for comp in components:
+        generator.add_component(comp)
+
+    def run():
+        generator.generate_schematic()
+    return run
+
+
+def case_bom(n):
+    from kicad_generator import generate_bom
+    components, _ = _synthetic_board(n)
+    path = os.path.join(tempfile.mkdtemp(), 'bom.md')
+
+    def run():
+        generate_bom(components, path)
+    return run
+
+
+def case_netlist(n):
+    from kicad_generator import generate_netlist
+    components, nets = _synthetic_board(n)
+    path = os.path.join(tempfile.mkdtemp(), 'netlist.txt')
+
+    def run():
+        generate_netlist(components, nets, path)
+    return run
+
+
+def case_auto_place(n):
+    from kicad_generator import auto_place
+    components, nets = _synthetic_board(n)
+
+    def run():
+        auto_place(components, nets)
+    return run
+
+
+# (이름, 함수, 크기 목록, 필요한 모듈)
+CASES = [
+    ('operating_point', case_operating_point, (1, 1000, 1000000), None),
+    ('design_scalar', case_design_scalar, (1, 1000), None),
+    ('design_mixed_size', case_design_mixed_size, (1, 5), None),
+    ('design_batch', case_design_batch, (1000, 1000000), 'numpy'),
+    ('monte_carlo', case_monte_carlo, (1000, 1000000), 'numpy'),
+    ('schematic', case_schematic, (100, 1000, 10000, 100000), None),
+    ('bom', case_bom, (100, 1000, 10000, 100000), None),
+    ('netlist', case_netlist, (100, 1000, 10000, 100000), None),
+    ('auto_place', case_auto_place, (100, 1000, 3000), None),
+]
+
+
+def case_names(pattern=None, max_size=None):
+    """실행할 'name[size]' 목록"""
+    names = []
+    for name, _, sizes, _ in CASES:
+        for size in sizes:
+            label = f"{name}[{size}]"
+            if pattern and pattern not in label:
+                continue
+            if max_size and size > max_size:
+                continue
+            names.append(label)
+    return names
+
+
+# =============================================================================
+# 시작 시간 (명령행 실행)
+# =============================================================================
+
+MOTOR_SCRIPT = os.path.join(ROOT, 'Motor', 'geared_motor_calculator.py')
+KICAD_SCRIPT = os.path.join(ROOT, 'HW', 'Electronics', 'BL520_kicad_generator.py')
+
+SINGLE_DESIGN = json.dumps({
+    "motor": {"voltage_nominal": 3.0, "current_no_load": 0.15, "current_stall": 2.2,
+              "rpm_no_load": 9600, "torque_stall": 11.8},
+    "target": {"rpm_output": 100, "torque_output_mNm": 50},
+}) + "\n"
+
+# (이름, 스크립트, 인자, stdin)
+STARTUP_SCENARIOS = [
+    ('motor_help', MOTOR_SCRIPT, ['--help'], None),
+    ('motor_single_design', MOTOR_SCRIPT, ['--batch'], SINGLE_DESIGN),
+    ('kicad_help', KICAD_SCRIPT, ['--help'], None),
+    ('kicad_schematic', KICAD_SCRIPT, ['--output-dir', '{tmp}'], None),
+]
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → [(모듈, 자체 us, 누적 us, 깊이)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def startup_report(repeat, top=8):
+    """시나리오별 시작 시간(중앙값)과 인터프리터 기본 임포트를 제외한 모듈별 비용"""
+    tmp = tempfile.mkdtemp()
+    bare = {name for name, *_ in parse_importtime(
+        subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'],
+                       capture_output=True, text=True).stderr)}
+    results = {}
+    for name, script, args, stdin in STARTUP_SCENARIOS:
+        cmd = [sys.executable, script] + [a.format(tmp=tmp) for a in args]
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(cmd, input=stdin, capture_output=True, text=True)
+            times.append(time.perf_counter() - start)
+        proc = subprocess.run([sys.executable, '-X', 'importtime'] + cmd[1:], input=stdin,
+                              capture_output=True, text=True)
+        rows = [r for r in parse_importtime(proc.stderr) if r[0] not in bare]
+        top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: -r[2])
+        with open(script, 'r', encoding='utf-8') as f:
+            source = f.read()
+        start = time.perf_counter()
+        compile(source, script, 'exec')   # 스크립트로 실행하면 .pyc 없이 매번 컴파일됨
+        compile_s = time.perf_counter() - start
+        times.sort()
+        results[f"startup[{name}]"] = {
+            'wall_s': times[len(times) // 2],
+            'import_ms': sum(r[2] for r in top_level) / 1000,
+            'compile_ms': compile_s * 1000,
+            'modules': {r[0]: r[2] / 1000 for r in top_level[:top]},
+        }
+    return results
+
+
+def print_startup_report(results):
+    for label, r in results.items():
+        print(f"{label:32} {r['wall_s'] * 1000:7.1f}ms  (imports {r['import_ms']:.1f}ms, "
+              f"script compile {r['compile_ms']:.1f}ms)")
+        for module, ms in r['modules'].items():
+            print(f"    {module:28} {ms:7.2f}ms")
+
+
+# =============================================================================
+# 측정
+# =============================================================================
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 kB, macOS는 byte
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure(label, repeat):
+    """케이스 하나 측정 (자식 프로세스에서 호출)"""
+    name, _, size = label.partition('[')
+    size = int(size.rstrip(']'))
+    func, module = next((f, m) for n, f, _, m in CASES if n == name)
+    if module:
+        try:
+            __import__(module)
+        except ImportError:
+            return {'skipped': f"{module} not installed"}
+
+    run = func(size)
+    # stdout 출력(saved to ...)은 측정 결과와 섞이지 않도록 버림
+    devnull = open(os.devnull, 'w')
+    stdout, sys.stdout = sys.stdout, devnull
+    try:
+        # 할당 피크는 타이밍과 분리된 1회 실행으로 측정 (tracemalloc 오버헤드 제외)
+        tracemalloc.start()
+        run()
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+    return {
+        'wall_s': min(times),
+        'peak_rss_kb': _peak_rss_kb(),
+        'alloc_peak_kb': alloc_peak // 1024,
+    }
+
+
+def run_case(label, repeat, timeout):
+    """새 프로세스에서 케이스 실행 (RSS가 케이스별로 분리되도록)"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', label, '--repeat', str(repeat)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timeout after {timeout}s"}
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+METRICS = ('wall_s', 'peak_rss_kb', 'alloc_peak_kb')
+
+
+def compare(results, baseline, threshold):
+    """기준값 대비 threshold 이상 나빠진 (케이스, 지표, 기준, 현재) 목록"""
+    regressions = []
+    for label, result in results.items():
+        base = baseline.get(label)
+        if not base or 'wall_s' not in result:
+            continue
+        for metric in METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append((label, metric, old, new))
+    return regressions
+
+
+def _format(metric, value):
+    if value is None:
+        return '-'
+    if metric == 'wall_s':
+        return f"{value * 1000:.2f}ms" if value < 1 else f"{value:.3f}s"
+    return f"{value / 1024:.1f}MB"
+
+
+def run_cases(args, baseline):
+    """벤치마크 케이스 실행 및 표 출력"""
+    results = {}
+    print(f"{'case':28} {'wall':>10} {'peak RSS':>10} {'alloc peak':>11}  vs baseline")
+    print("-" * 76)
+    for label in case_names(args.pattern, args.max_size):
+        result = run_case(label, args.repeat, args.timeout)
+        results[label] = result
+        if 'wall_s' not in result:
+            print(f"{label:28} {result.get('skipped') or 'ERROR: ' + result.get('error', '')}")
+            continue
+        base = baseline.get(label, {}).get('wall_s')
+        delta = f"{(result['wall_s'] / base - 1) * 100:+.1f}%" if base else ''
+        print(f"{label:28} {_format('wall_s', result['wall_s']):>10} "
+              f"{_format('peak_rss_kb', result['peak_rss_kb']):>10} "
+              f"{_format('alloc_peak_kb', result['alloc_peak_kb']):>11}  {delta}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기어 계산기 / 회로도 생성기 벤치마크")
+    parser.add_argument('-k', dest='pattern', help="이름에 포함된 케이스만 실행 (예: schematic, [1000])")
+    parser.add_argument('--max-size', type=int, help="이 크기 이하 케이스만 실행")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    parser.add_argument('--timeout', type=float, default=600, help="케이스당 제한 시간 [s]")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="결과를 기준값으로 저장")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀 판정 비율 (0.2 = 20%%)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--startup', action='store_true',
+                        help="명령행 시작 시간과 모듈별 임포트 비용만 측정")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.repeat)))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+
+    if args.startup:
+        results = startup_report(max(args.repeat, 5))
+        print_startup_report(results)
+    else:
+        results = run_cases(args, baseline)
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        # 기존 기준값에 이번 실행 결과만 덮어씀 (-k 로 일부만 실행한 경우 대비)
+        merged = dict(baseline)
+        merged.update({k: v for k, v in results.items() if 'wall_s' in v})
+        report['results'] = merged
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n⚠️ 회귀 {len(regressions)}건 (기준 대비 +{args.threshold * 100:.0f}% 초과):")
+        for label, metric, old, new in regressions:
+            print(f"  {label:28} {metric:14} {_format(metric, old)} → {_format(metric, new)}")
+        return 1
+    if baseline:
+        print("\n기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
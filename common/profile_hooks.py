@@ -0,0 +1,155 @@
+"""
+선택적 계측 훅 (Motor/geared_motor.py, HW/Electronics/kicad_generator.py 공용)
+
+Profiler.enable() 시에만 대상 함수를 타이밍 래퍼로 교체하고 disable() 시 원래 함수로
+되돌립니다. 비활성 상태에서는 원래 함수가 그대로 호출되므로 오버헤드가 없습니다.
+각 스크립트는 자신의 계측 대상 목록만 정의합니다:
+
+    PROFILE_TARGETS = [(클래스, '메서드'), (None, '모듈 함수'), ...]
+    PROFILER = Profiler(PROFILE_TARGETS, __name__)
+"""
+
+import sys
+import time
+
+# threading은 enable() 때 임포트합니다 (계측하지 않는 실행의 시작 시간 유지).
+
+
+class _Span:
+    """Profiler.span() 컨텍스트 매니저"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler.enabled:
+            self.profiler.record(self.name, self.start, self.profiler.clock() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    선택적 계측: 구간별 호출 수/누적 시간 카운터 + Chrome trace 이벤트
+
+    사용 예:
+        PROFILER.enable()
+        ... 실행 ...
+        PROFILER.disable()
+        PROFILER.write('profile')   # profile.json(카운터), profile.trace.json(chrome://tracing, Perfetto)
+    """
+
+    def __init__(self, targets=None, module: str = None, max_events: int = 1_000_000):
+        self.clock = time.perf_counter_ns
+        self.thread_id = None           # enable() 시 threading.get_ident
+        self.targets = targets          # [(클래스 또는 None(module), 속성 이름), ...]
+        self.module = module            # None 대상이 속한 모듈 이름
+        self.max_events = max_events
+        self.enabled = False
+        self._patched = []
+        self.reset()
+
+    def reset(self):
+        """카운터와 이벤트 초기화"""
+        self.counters = {}              # 이름 -> [호출 수, 누적 ns, 최대 ns]
+        self.events = []                # (이름, 시작 ns, 구간 ns, 스레드 id)
+        self.dropped_events = 0
+        self.origin = self.clock()
+
+    def record(self, name: str, start_ns: int, duration_ns: int):
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = [0, 0, 0]
+        counter[0] += 1
+        counter[1] += duration_ns
+        if duration_ns > counter[2]:
+            counter[2] = duration_ns
+        if len(self.events) < self.max_events:
+            self.events.append((name, start_ns, duration_ns, self.thread_id()))
+        else:
+            self.dropped_events += 1
+
+    def span(self, name: str) -> _Span:
+        """임의 구간 계측: with PROFILER.span('이름'): ..."""
+        return _Span(self, name)
+
+    def _wrap(self, func, name: str):
+        from functools import wraps
+        clock = self.clock
+        record = self.record
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, clock() - start)
+        return timed
+
+    def enable(self, targets=None):
+        """대상 함수를 타이밍 래퍼로 교체"""
+        if self.enabled:
+            return
+        import threading
+        self.thread_id = threading.get_ident
+        for owner, attr in (targets or self.targets or ()):
+            if owner is None:
+                owner = sys.modules[self.module]
+            original = owner.__dict__[attr]
+            name = f"{owner.__name__}.{attr}" if isinstance(owner, type) else attr
+            if isinstance(original, (classmethod, staticmethod)):
+                wrapped = type(original)(self._wrap(original.__func__, name))
+            else:
+                wrapped = self._wrap(original, name)
+            setattr(owner, attr, wrapped)
+            self._patched.append((owner, attr, original))
+        self.enabled = True
+
+    def disable(self):
+        """원래 함수로 복원"""
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched = []
+        self.enabled = False
+
+    def summary(self) -> dict:
+        """구간별 호출 수와 시간 [ms/us]"""
+        return {name: {'calls': calls,
+                       'total_ms': total / 1e6,
+                       'mean_us': total / calls / 1e3,
+                       'max_us': peak / 1e3}
+                for name, (calls, total, peak) in
+                sorted(self.counters.items(), key=lambda item: -item[1][1])}
+
+    def write_json(self, path: str):
+        """카운터를 JSON으로 저장"""
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'counters': self.summary(), 'dropped_events': self.dropped_events},
+                      f, indent=2, ensure_ascii=False)
+
+    def write_chrome_trace(self, path: str):
+        """Chrome trace 형식(complete 이벤트)으로 저장"""
+        import json
+        import os
+        pid = os.getpid()
+        origin = self.origin
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"traceEvents":[')
+            for i, (name, start, duration, tid) in enumerate(self.events):
+                if i:
+                    f.write(',\n')
+                f.write(json.dumps({'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                                    'ts': (start - origin) / 1e3, 'dur': duration / 1e3}))
+            f.write('],"displayTimeUnit":"ms"}\n')
+
+    def write(self, prefix: str):
+        """PREFIX.json(카운터)과 PREFIX.trace.json(Chrome trace) 저장"""
+        self.write_json(prefix + '.json')
+        self.write_chrome_trace(prefix + '.trace.json')